@@ -0,0 +1,100 @@
+# @version 0.2.12
+"""
+@title Curve Registry Pool Info (Polygon)
+@license MIT
+@author Curve.Fi
+@notice Bulk getter for registry data about many pools within a single call
+@dev The registry is deployed near the contract size limit, so this is kept
+     as a separate view-only contract rather than added to the registry
+"""
+
+MAX_COINS: constant(int128) = 8
+MAX_POOLS: constant(int128) = 10
+ETH_ADDRESS: constant(address) = 0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE
+
+
+struct PoolInfo:
+    n_coins: uint256[2][MAX_POOLS]
+    coins: address[MAX_COINS][MAX_POOLS]
+    underlying_coins: address[MAX_COINS][MAX_POOLS]
+    decimals: uint256[MAX_COINS][MAX_POOLS]
+    rates: uint256[MAX_COINS][MAX_POOLS]
+    balances: uint256[MAX_COINS][MAX_POOLS]
+    admin_balances: uint256[MAX_COINS][MAX_POOLS]
+    A: uint256[MAX_POOLS]
+    fees: uint256[2][MAX_POOLS]
+    gauges: address[10][MAX_POOLS]
+
+
+interface AddressProvider:
+    def get_address(_id: uint256) -> address: view
+
+interface Registry:
+    def get_n_coins(_pool: address) -> uint256[2]: view
+    def get_coins(_pool: address) -> address[MAX_COINS]: view
+    def get_underlying_coins(_pool: address) -> address[MAX_COINS]: view
+    def get_decimals(_pool: address) -> uint256[MAX_COINS]: view
+    def get_rates(_pool: address) -> uint256[MAX_COINS]: view
+    def get_gauges(_pool: address) -> (address[10], int128[10]): view
+
+interface ERC20:
+    def balanceOf(_addr: address) -> uint256: view
+
+interface CurvePool:
+    def A() -> uint256: view
+    def fee() -> uint256: view
+    def admin_fee() -> uint256: view
+    def balances(i: uint256) -> uint256: view
+
+
+address_provider: public(AddressProvider)
+
+
+@external
+def __init__(_address_provider: address):
+    self.address_provider = AddressProvider(_address_provider)
+
+
+@view
+@external
+def get_pool_info(_pools: address[MAX_POOLS]) -> PoolInfo:
+    """
+    @notice Get the registry data of up to `MAX_POOLS` pools
+    @dev Equivalent to calling `get_n_coins`, `get_coins`, `get_underlying_coins`,
+         `get_decimals`, `get_rates`, `get_balances`, `get_admin_balances`,
+         `get_A`, `get_fees` and `get_gauges` on the registry for each pool.
+         Balances are read once and shared with the admin balances.
+    @param _pools List of pool addresses, the first zero address ends the list
+    @return Struct of the data of each pool, indexed as `_pools`
+    """
+    registry: address = self.address_provider.get_address(0)
+    info: PoolInfo = empty(PoolInfo)
+
+    for i in range(MAX_POOLS):
+        pool: address = _pools[i]
+        if pool == ZERO_ADDRESS:
+            break
+
+        n_coins: uint256[2] = Registry(registry).get_n_coins(pool)
+        coins: address[MAX_COINS] = Registry(registry).get_coins(pool)
+        info.n_coins[i] = n_coins
+        info.coins[i] = coins
+        info.underlying_coins[i] = Registry(registry).get_underlying_coins(pool)
+        info.decimals[i] = Registry(registry).get_decimals(pool)
+        info.rates[i] = Registry(registry).get_rates(pool)
+        info.gauges[i] = Registry(registry).get_gauges(pool)[0]
+
+        for j in range(MAX_COINS):
+            if j == n_coins[0]:
+                break
+            pool_balance: uint256 = CurvePool(pool).balances(j)
+            info.balances[i][j] = pool_balance
+            if coins[j] == ETH_ADDRESS:
+                info.admin_balances[i][j] = pool.balance - pool_balance
+            else:
+                info.admin_balances[i][j] = ERC20(coins[j]).balanceOf(pool) - pool_balance
+
+        info.A[i] = CurvePool(pool).A()
+        info.fees[i] = [CurvePool(pool).fee(), CurvePool(pool).admin_fee()]
+
+    return info
@@ -0,0 +1,189 @@
+# @version 0.2.12
+"""
+@title Curve StableSwap Quoter (Polygon)
+@license MIT
+@author Curve.Fi
+@notice Quote many exchanges on a pool within a single call
+@dev View-only lens over the public getters of the aave and ren pools,
+     reproducing their `get_dy` math so balances, amplification and the
+     invariant are read and computed once per call rather than once per
+     quote. Deployed separately so the pools themselves are unchanged.
+"""
+
+MAX_COINS: constant(int128) = 8
+MAX_QUOTES: constant(int128) = 100
+
+FEE_DENOMINATOR: constant(uint256) = 10 ** 10
+A_PRECISION: constant(uint256) = 100
+
+
+interface ERC20:
+    def decimals() -> uint256: view
+
+interface CurvePool:
+    def coins(i: uint256) -> address: view
+    def balances(i: uint256) -> uint256: view
+    def A_precise() -> uint256: view
+    def fee() -> uint256: view
+    def offpeg_fee_multiplier() -> uint256: view
+    def get_dy(i: int128, j: int128, dx: uint256) -> uint256: view
+
+
+@pure
+@internal
+def _dynamic_fee(xpi: uint256, xpj: uint256, _fee: uint256, _feemul: uint256) -> uint256:
+    if _feemul <= FEE_DENOMINATOR:
+        return _fee
+    else:
+        xps2: uint256 = (xpi + xpj)
+        xps2 *= xps2  # Doing just ** 2 can overflow apparently
+        return (_feemul * _fee) / (
+            (_feemul - FEE_DENOMINATOR) * 4 * xpi * xpj / xps2 + \
+            FEE_DENOMINATOR)
+
+
+@pure
+@internal
+def get_D(xp: uint256[MAX_COINS], amp: uint256, n_coins: uint256) -> uint256:
+    """
+    D invariant calculation, as `get_D` of the pool with `n_coins` coins
+    """
+    S: uint256 = 0
+    for k in range(MAX_COINS):
+        if k == n_coins:
+            break
+        S += xp[k]
+    if S == 0:
+        return 0
+
+    Dprev: uint256 = 0
+    D: uint256 = S
+    Ann: uint256 = amp * n_coins
+    for _i in range(255):
+        D_P: uint256 = D
+        for k in range(MAX_COINS):
+            if k == n_coins:
+                break
+            D_P = D_P * D / (xp[k] * n_coins + 1)  # +1 is to prevent /0
+        Dprev = D
+        D = (Ann * S / A_PRECISION + D_P * n_coins) * D / ((Ann - A_PRECISION) * D / A_PRECISION + (n_coins + 1) * D_P)
+        # Equality with the precision of 1
+        if D > Dprev:
+            if D - Dprev <= 1:
+                return D
+        else:
+            if Dprev - D <= 1:
+                return D
+    raise
+
+
+@pure
+@internal
+def get_y(
+    i: int128,
+    j: int128,
+    x: uint256,
+    xp: uint256[MAX_COINS],
+    amp: uint256,
+    D: uint256,
+    n_coins: uint256
+) -> uint256:
+    """
+    Calculate x[j] if one makes x[i] = x, as `get_y` of the pool
+    """
+    assert i != j       # dev: same coin
+    assert j >= 0       # dev: j below zero
+    assert convert(j, uint256) < n_coins  # dev: j above N_COINS
+
+    assert i >= 0
+    assert convert(i, uint256) < n_coins
+
+    n: int128 = convert(n_coins, int128)
+    Ann: uint256 = amp * n_coins
+    c: uint256 = D
+    S_: uint256 = 0
+    _x: uint256 = 0
+    y_prev: uint256 = 0
+
+    for _i in range(MAX_COINS):
+        if _i == n:
+            break
+        if _i == i:
+            _x = x
+        elif _i != j:
+            _x = xp[_i]
+        else:
+            continue
+        S_ += _x
+        c = c * D / (_x * n_coins)
+    c = c * D * A_PRECISION / (Ann * n_coins)
+    b: uint256 = S_ + D * A_PRECISION / Ann  # - D
+    y: uint256 = D
+    for _i in range(255):
+        y_prev = y
+        y = (y*y + c) / (2 * y + b - D)
+        # Equality with the precision of 1
+        if y > y_prev:
+            if y - y_prev <= 1:
+                return y
+        else:
+            if y_prev - y <= 1:
+                return y
+    raise
+
+
+@view
+@external
+def get_dy_multiple(
+    _pool: address,
+    _n_coins: uint256,
+    _i: int128[MAX_QUOTES],
+    _j: int128[MAX_QUOTES],
+    _dx: uint256[MAX_QUOTES]
+) -> uint256[MAX_QUOTES]:
+    """
+    @notice Calculate the amounts received for several exchanges on a pool
+    @dev Each quote is from the current state of the pool and equals its
+         `get_dy`, which in the aave and ren pools also equals
+         `get_dy_underlying`. The first quote is checked against the pool's
+         own `get_dy`, so a wrong `_n_coins` or an unsupported pool reverts
+         rather than returning wrong amounts. The first `_dx` of zero ends
+         the list.
+    @param _pool Address of the pool to quote
+    @param _n_coins Number of coins in the pool
+    @param _i Index values of the coins to send
+    @param _j Index values of the coins to receive
+    @param _dx Amounts of `_i` being exchanged
+    @return Amounts of `_j` received for each exchange
+    """
+    assert 2 <= _n_coins and _n_coins <= MAX_COINS  # dev: invalid n_coins
+
+    xp: uint256[MAX_COINS] = empty(uint256[MAX_COINS])
+    precisions: uint256[MAX_COINS] = empty(uint256[MAX_COINS])
+    for k in range(MAX_COINS):
+        if k == _n_coins:
+            break
+        coin: address = CurvePool(_pool).coins(k)
+        precisions[k] = 10 ** (18 - ERC20(coin).decimals())
+        xp[k] = CurvePool(_pool).balances(k) * precisions[k]
+
+    amp: uint256 = CurvePool(_pool).A_precise()
+    D: uint256 = self.get_D(xp, amp, _n_coins)
+    fee: uint256 = CurvePool(_pool).fee()
+    feemul: uint256 = CurvePool(_pool).offpeg_fee_multiplier()
+
+    result: uint256[MAX_QUOTES] = empty(uint256[MAX_QUOTES])
+    for k in range(MAX_QUOTES):
+        if _dx[k] == 0:
+            break
+        i: int128 = _i[k]
+        j: int128 = _j[k]
+        x: uint256 = xp[i] + _dx[k] * precisions[i]
+        y: uint256 = self.get_y(i, j, x, xp, amp, D, _n_coins)
+        dy: uint256 = (xp[j] - y) / precisions[j]
+        result[k] = dy - self._dynamic_fee((xp[i] + x) / 2, (xp[j] + y) / 2, fee, feemul) * dy / FEE_DENOMINATOR
+
+    if _dx[0] != 0:
+        assert result[0] == CurvePool(_pool).get_dy(_i[0], _j[0], _dx[0])  # dev: quote mismatch
+
+    return result
@@ -0,0 +1,49 @@
+# @version 0.2.12
+"""
+@notice Mock Polygon RootChain
+@dev Submits fake checkpoints, storing header blocks and emitting
+     `NewHeaderBlock` with the same layout as the real RootChain
+"""
+
+struct HeaderBlock:
+    root: bytes32
+    start: uint256
+    end: uint256
+    createdAt: uint256
+    proposer: address
+
+event NewHeaderBlock:
+    proposer: indexed(address)
+    headerBlockId: indexed(uint256)
+    reward: indexed(uint256)
+    start: uint256
+    end: uint256
+    root: bytes32
+
+
+CHECKPOINT_ID_INTERVAL: constant(uint256) = 10000
+
+headerBlocks: public(HashMap[uint256, HeaderBlock])
+currentHeaderBlock: public(uint256)
+
+
+@view
+@external
+def getLastChildBlock() -> uint256:
+    return self.headerBlocks[self.currentHeaderBlock].end
+
+
+@external
+def submitCheckpoint(_root: bytes32, _start: uint256, _end: uint256) -> uint256:
+    header_block_id: uint256 = self.currentHeaderBlock + CHECKPOINT_ID_INTERVAL
+    self.headerBlocks[header_block_id] = HeaderBlock({
+        root: _root,
+        start: _start,
+        end: _end,
+        createdAt: block.timestamp,
+        proposer: msg.sender
+    })
+    self.currentHeaderBlock = header_block_id
+
+    log NewHeaderBlock(msg.sender, header_block_id, 0, _start, _end, _root)
+    return header_block_id
@@ -0,0 +1,52 @@
+"""Benchmark serial vs batched block fetching for exit block proofs.
+
+Run with: python -m scripts.benchmarks.block_fetch
+"""
+import time
+
+from scripts.benchmarks.mock_rpc import MockRPCServer
+from scripts.rpc_batch import BatchRPC, fetch_blocks, format_block
+
+BLOCK_START = 20_000_000
+BLOCK_COUNT = 1024
+LATENCY = 0.02
+
+
+def fetch_serial(rpc: BatchRPC, block_start: int, block_end: int) -> list:
+    """The previous behaviour, one round trip per block."""
+    return [
+        format_block(rpc.request("eth_getBlockByNumber", (hex(number), False)))
+        for number in range(block_start, block_end + 1)
+    ]
+
+
+def _run(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<40} {time.perf_counter() - start:>8.2f}s")
+    return result
+
+
+def main():
+    block_end = BLOCK_START + BLOCK_COUNT - 1
+    print(f"Fetching {BLOCK_COUNT} blocks with {LATENCY * 1000:.0f}ms simulated round trip\n")
+
+    with MockRPCServer(latency=LATENCY) as server:
+        rpc = BatchRPC(server.endpoint_uri)
+        expected = _run("serial", fetch_serial, rpc, BLOCK_START, block_end)
+        blocks = _run("batched + concurrent", fetch_blocks, rpc, BLOCK_START, block_end)
+        assert blocks == expected
+
+    with MockRPCServer(latency=LATENCY, fail_rate=0.05) as server:
+        rpc = BatchRPC(server.endpoint_uri)
+        blocks = _run("batched, 5% failed sub-requests", fetch_blocks, rpc, BLOCK_START, block_end)
+        assert blocks == expected
+
+    with MockRPCServer(latency=LATENCY, batch=False) as server:
+        rpc = BatchRPC(server.endpoint_uri, batch_size=1)
+        blocks = _run("concurrent, batching unsupported", fetch_blocks, rpc, BLOCK_START, block_end)
+        assert blocks == expected
+
+
+if __name__ == "__main__":
+    main()
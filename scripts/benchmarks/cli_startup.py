@@ -0,0 +1,49 @@
+"""Benchmark the startup time of the exit scripts.
+
+Each command is run in a fresh interpreter, from the project root, until it is ready
+to take input:
+
+* brownie: what `brownie run exit` did before its first prompt, load the project,
+  generate an account, and import the exit script
+* exit: import the exit script, which no longer touches brownie on import
+* cli: `python -m scripts.exit_cli --help`
+* connect: import the exit script and open both connections, with the endpoints read
+  from brownie's network config files
+
+Run with: python -m scripts.benchmarks.cli_startup
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent.parent
+RUNS = 5
+
+COMMANDS = {
+    "brownie": [
+        "-c",
+        "from brownie import accounts, project; project.load('.'); accounts.add(); "
+        "import scripts.exit",
+    ],
+    "exit": ["-c", "import scripts.exit"],
+    "cli": ["-m", "scripts.exit_cli", "--help"],
+    "connect": ["-c", "import scripts.exit; from scripts.chains import connect; connect()"],
+}
+
+
+def main():
+    print(f"Best of {RUNS} runs, in a fresh interpreter each\n")
+    for name, args in COMMANDS.items():
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, *args], cwd=PROJECT_DIR, check=True, stdout=subprocess.DEVNULL
+            )
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<8} {min(timings):>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
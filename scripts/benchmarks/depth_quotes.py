@@ -0,0 +1,75 @@
+"""Benchmark of depth curve quoting against looping `get_dy`.
+
+Quotes 1,000 sizes of every pair of a synthetic, imbalanced three coin pool with
+the aave pool's parameters, using `PoolState.get_dy` once per size and then
+`depth_surface` with and without warm starts.
+
+Run with: python -m scripts.benchmarks.depth_quotes
+"""
+import time
+
+from scripts.stableswap.depth import depth_surface
+from scripts.stableswap.pool import PoolState
+
+N_SIZES = 1000
+
+STATE = PoolState(
+    precision_mul=(1, 10 ** 12, 10 ** 12),
+    balances=(31 * 10 ** 24, 27 * 10 ** 12, 45 * 10 ** 12),
+    fee=4000000,
+    offpeg_fee_multiplier=20000000000,
+    initial_A=20000,
+    future_A=20000,
+    initial_A_time=0,
+    future_A_time=0,
+    token_supply=100 * 10 ** 24,
+    timestamp=0,
+)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _loop_get_dy(state, amounts):
+    n_coins = state.n_coins
+    return {
+        (i, j): [state.get_dy(i, j, dx) for dx in amounts[i]]
+        for i in range(n_coins)
+        for j in range(n_coins)
+        if i != j
+    }
+
+
+def main():
+    # sizes from 0.1% to 100% of a 1M balance of each coin
+    amounts = [
+        [10 ** 6 // N_SIZES * k * 10 ** 18 // p for k in range(1, N_SIZES + 1)]
+        for p in STATE.precision_mul
+    ]
+    n_quotes = sum(len(amounts[i]) for i in range(STATE.n_coins)) * (STATE.n_coins - 1)
+
+    looped, loop_time = _timed(_loop_get_dy, STATE, amounts)
+    exact, exact_time = _timed(depth_surface, STATE, amounts)
+    warm, warm_time = _timed(depth_surface, STATE, amounts, warm_start=True)
+
+    assert all(list(exact[pair].dy) == quotes for pair, quotes in looped.items())
+    max_error = max(
+        abs(a - b) for pair, quotes in looped.items() for a, b in zip(warm[pair].dy, quotes)
+    )
+
+    print(f"{n_quotes:,} quotes\n")
+    print(f"{'method':<24} {'time':>10} {'per quote':>12}")
+    for name, elapsed in [
+        ("get_dy loop", loop_time),
+        ("depth_surface", exact_time),
+        ("depth_surface (warm)", warm_time),
+    ]:
+        print(f"{name:<24} {elapsed:>9.3f}s {elapsed / n_quotes * 10 ** 6:>10.1f}us")
+    print(f"\nwarm start max difference: {max_error} wei")
+
+
+if __name__ == "__main__":
+    main()
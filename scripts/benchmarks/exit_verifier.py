@@ -0,0 +1,101 @@
+"""Benchmark offline verification of exit payloads.
+
+Builds synthetic exit payloads, laid out as `encode_payload` does, for burns in a
+full size checkpoint and in blocks of 600 receipts, then times `verify_payload`.
+
+Run with: python -m scripts.benchmarks.exit_verifier
+"""
+import os
+import random
+import time
+
+import rlp
+from eth_utils import keccak
+
+from scripts.exit_payload import ERC20_TRANSFER_EVENT_SIG, InvalidExitPayload, verify_payload
+from scripts.merkle import MerkleTree
+from scripts.receipts_trie import BulkTrie
+
+CHECKPOINT_START = 20_000_000
+CHECKPOINT_SIZE = 2 ** 14
+RECEIPT_COUNT = 600
+PAYLOAD_COUNT = 100
+
+
+def _receipt(index):
+    # an unrelated log, then the burn (transfer to the zero address) log
+    burn_topics = [ERC20_TRANSFER_EVENT_SIG, os.urandom(32), bytes(32)]
+    logs = [[os.urandom(20), [os.urandom(32)], os.urandom(64)], [os.urandom(20), burn_topics, b""]]
+    return rlp.encode([1, 21000 * (index + 1), os.urandom(256), logs])
+
+
+def build_payloads():
+    blocks = {}
+    payloads = []
+    for _ in range(PAYLOAD_COUNT):
+        block_number = CHECKPOINT_START + random.randrange(CHECKPOINT_SIZE)
+        if block_number not in blocks:
+            receipts = {rlp.encode(i): _receipt(i) for i in range(RECEIPT_COUNT)}
+            blocks[block_number] = (os.urandom(32), BulkTrie(receipts), receipts)
+        transactions_root, receipts_trie, receipts = blocks[block_number]
+        path = rlp.encode(random.randrange(RECEIPT_COUNT))
+        payloads.append(
+            (block_number, transactions_root, receipts_trie.root_hash, receipts[path], path)
+        )
+
+    leaves = [os.urandom(32) for _ in range(CHECKPOINT_SIZE)]
+    timestamps = {}
+    for block_number, transactions_root, receipts_root, _, _ in payloads:
+        timestamps[block_number] = 1600000000 + 2 * block_number
+        leaves[block_number - CHECKPOINT_START] = keccak(
+            block_number.to_bytes(32, "big")
+            + timestamps[block_number].to_bytes(32, "big")
+            + transactions_root
+            + receipts_root
+        )
+    checkpoint = MerkleTree(leaves)
+
+    encoded = []
+    for block_number, transactions_root, receipts_root, receipt, path in payloads:
+        encoded.append(
+            rlp.encode(
+                [
+                    10000,
+                    b"".join(checkpoint.get_proof(block_number - CHECKPOINT_START)),
+                    block_number,
+                    timestamps[block_number],
+                    transactions_root,
+                    receipts_root,
+                    receipt,
+                    rlp.encode(blocks[block_number][1].get_proof(path)),
+                    b"\x00" + path,
+                    1,
+                ]
+            )
+        )
+    return checkpoint.root, encoded
+
+
+def main():
+    random.seed(0)
+    root, payloads = build_payloads()
+
+    start = time.perf_counter()
+    for payload in payloads:
+        verify_payload(payload, CHECKPOINT_START, root)
+    elapsed = time.perf_counter() - start
+    print(f"Verified {len(payloads)} payloads in {elapsed:.3f}s")
+    print(f"{elapsed / len(payloads) * 1000:.3f}ms per exit")
+
+    # a flipped byte in the block proof must be caught
+    tampered = bytearray(payloads[0])
+    tampered[20] ^= 1
+    try:
+        verify_payload(bytes(tampered), CHECKPOINT_START, root)
+        raise AssertionError("Tampered payload was accepted")
+    except InvalidExitPayload as exc:
+        print(f"Tampered payload rejected: {exc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Microbenchmark of checkpoint Merkle tree construction and proofs.
+
+Compares `scripts.merkle.MerkleTree` against the previous recursive, list based
+implementation for 2**10 through 2**20 leaves.
+
+Run with: python -m scripts.benchmarks.merkle_tree
+"""
+import math
+import os
+import time
+
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+from scripts.merkle import MerkleTree
+
+
+class LegacyMerkleTree:
+    """The previous implementation, kept here as a baseline."""
+
+    def __init__(self, leaves):
+        tree_depth = math.ceil(math.log(len(leaves), 2))
+        self.leaves = leaves + [HexBytes(0) * 32] * (2 ** tree_depth - len(leaves))
+        self.layers = [self.leaves]
+        self.create_hashes(self.leaves)
+
+    @property
+    def root(self):
+        return self.layers[-1][0]
+
+    def create_hashes(self, nodes):
+        if len(nodes) == 1:
+            return
+        tree_level = []
+        for i in range(0, len(nodes), 2):
+            left, right = nodes[i : i + 2]
+            tree_level.append(HexBytes(keccak(left + right)))
+        if len(nodes) % 2 == 1:
+            tree_level.append(nodes[-1])
+        self.layers.append(tree_level)
+        self.create_hashes(tree_level)
+
+    def get_proof(self, leaf):
+        index = self.leaves.index(leaf)
+        proof = []
+        for i in range(len(self.layers) - 1):
+            sibling_index = index + 1 if index % 2 == 0 else index - 1
+            index = index // 2
+            proof.append(self.layers[i][sibling_index])
+        return proof
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'leaves':>10} {'legacy build':>14} {'legacy proof':>14} {'build':>10} {'proof':>10}")
+    for depth in range(10, 21):
+        # an uneven leaf count exercises the padding path
+        leaves = [HexBytes(os.urandom(32)) for _ in range(2 ** depth - 3)]
+        target = len(leaves) - 1
+
+        legacy, legacy_build = _timed(LegacyMerkleTree, leaves)
+        legacy_proof, legacy_proof_time = _timed(legacy.get_proof, leaves[target])
+        tree, build = _timed(MerkleTree, leaves)
+        proof, proof_time = _timed(tree.get_proof, target)
+
+        assert tree.root == legacy.root
+        assert proof == legacy_proof
+        print(
+            f"{len(leaves):>10} {legacy_build:>13.3f}s {legacy_proof_time * 1000:>12.3f}ms "
+            f"{build:>9.3f}s {proof_time * 1000:>8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Local JSON-RPC stand-in used by the benchmarks.
+
+Serves deterministic synthetic chain data over HTTP with a configurable round trip
+latency, so the cost of serial vs batched vs concurrent fetching can be measured
+without a live node.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+
+from eth_utils import keccak
+
+
+def _word(*args) -> str:
+    return "0x" + keccak(b"".join(str(i).encode() for i in args)).hex()
+
+
+def state_sync_tx_hash(number: int, block_hash: str) -> str:
+    """Hash of the pseudo-transaction Bor appends to blocks containing state syncs."""
+    preimage = b"matic-bor-receipt-" + number.to_bytes(8, "big") + bytes.fromhex(block_hash[2:])
+    return "0x" + keccak(preimage).hex()
+
+
+class SyntheticChain:
+    """Deterministic chain data, generated on demand for any block number."""
+
+    def __init__(self, tx_count: int = 4, state_sync: bool = False):
+        """Initialize the chain.
+
+        Args:
+            tx_count: Number of regular transactions in each block
+            state_sync: If True, each block also ends with a state-sync pseudo-transaction
+        """
+        self.tx_count = tx_count
+        self.state_sync = state_sync
+        self._tx_locations = {}
+
+    def block(self, number: int) -> dict:
+        block_hash = _word("hash", number)
+        transactions = [_word("tx", number, i) for i in range(self.tx_count)]
+        if self.state_sync:
+            transactions.append(state_sync_tx_hash(number, block_hash))
+        for index, tx_hash in enumerate(transactions):
+            self._tx_locations[tx_hash] = (number, index)
+
+        return {
+            "number": hex(number),
+            "timestamp": hex(1600000000 + 2 * number),
+            "hash": block_hash,
+            "parentHash": _word("hash", number - 1),
+            "transactionsRoot": _word("txs", number),
+            "receiptsRoot": _word("receipts", number),
+            "transactions": transactions,
+        }
+
+    def receipt(self, tx_hash: str) -> dict:
+        number, index = self._tx_locations[tx_hash]
+        return {
+            "transactionHash": tx_hash,
+            "transactionIndex": hex(index),
+            "blockNumber": hex(number),
+            "cumulativeGasUsed": hex(21000 * (index + 1)),
+            "logsBloom": "0x" + "00" * 256,
+            "logs": [
+                {
+                    "address": _word("token", index)[:42],
+                    "topics": [_word("topic", number, index)],
+                    "data": _word("data", number, index),
+                }
+            ],
+            "status": "0x1",
+            "type": hex(index % 3),
+        }
+
+    def block_receipts(self, number: int) -> list:
+        return [self.receipt(tx_hash) for tx_hash in self.block(number)["transactions"]]
+
+    @property
+    def handlers(self) -> Dict[str, Callable]:
+        """JSON-RPC method handlers serving this chain."""
+        return {
+            "eth_getBlockByNumber": lambda params: self.block(int(params[0], 16)),
+            "eth_getBlockReceipts": lambda params: self.block_receipts(int(params[0], 16)),
+            "eth_getTransactionReceipt": lambda params: self.receipt(params[0]),
+        }
+
+
+class MockRPCServer:
+    """Threaded HTTP JSON-RPC server running in the background."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable] = None,
+        latency: float = 0.02,
+        fail_rate: float = 0.0,
+        batch: bool = True,
+    ):
+        """Initialize the server.
+
+        Args:
+            handlers: Mapping of method name to a callable accepting the params list,
+                by default serving a `SyntheticChain`
+            latency: Seconds of simulated round trip time added to every HTTP request
+            fail_rate: Probability that an individual call in a batch returns an error
+            batch: If False, batch payloads are rejected as a single error object
+        """
+        self.handlers = handlers or SyntheticChain().handlers
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.batch = batch
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def endpoint_uri(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _call(self, payload: dict, in_batch: bool) -> dict:
+        response = {"jsonrpc": "2.0", "id": payload.get("id")}
+        handler = self.handlers.get(payload["method"])
+        if handler is None:
+            response["error"] = {"code": -32601, "message": "Method not found"}
+        elif in_batch and random.random() < self.fail_rate:
+            response["error"] = {"code": -32000, "message": "Simulated failure"}
+        else:
+            response["result"] = handler(payload["params"])
+        return response
+
+    def _respond(self, payload):
+        with self._lock:
+            self.request_count += 1
+        time.sleep(self.latency)
+
+        if not isinstance(payload, list):
+            return self._call(payload, False)
+        if not self.batch:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "No batch"}}
+        return [self._call(item, True) for item in payload]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                body = json.dumps(server._respond(json.loads(self.rfile.read(length)))).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
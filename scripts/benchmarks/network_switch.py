@@ -0,0 +1,82 @@
+"""Benchmark hot swapping a single connection vs persistent connections to both chains.
+
+Replays the RPC traffic of one `build_calldata` run against two local stand-in nodes.
+With hot swapping, every call to a helper on the other chain disconnects, reconnects
+(handshaking with the node as brownie does) and swaps back afterwards.
+
+Run with: python -m scripts.benchmarks.network_switch
+"""
+import time
+
+from scripts.benchmarks.mock_rpc import MockRPCServer
+from scripts.rpc_batch import BatchRPC
+
+LATENCY = 0.05
+RUNS = 5
+
+# calls made by `network.connect` before the connection is usable
+HANDSHAKE = ("web3_clientVersion", "eth_chainId", "eth_blockNumber")
+
+# (chain, number of RPC calls) for each helper called by `build_calldata`
+STEPS = [
+    ("polygon", 3),  # is_burn_checkpointed -> fetch_burn_tx_data
+    ("ethereum", 1),  # is_burn_checkpointed -> getLastChildBlock
+    ("polygon", 3),  # fetch_burn_tx_data
+    ("ethereum", 18),  # fetch_block_inclusion_data, binary search over checkpoints
+    ("polygon", 1),  # build_block_proof, checkpoint leaves cached
+    ("polygon", 1),  # build_receipt_proof -> eth_getBlockReceipts
+]
+
+HANDLERS = {
+    "web3_clientVersion": lambda params: "stand-in/v0.0.0",
+    "eth_chainId": lambda params: "0x1",
+    "eth_blockNumber": lambda params: "0x1",
+    "eth_call": lambda params: "0x" + "00" * 32,
+}
+
+
+def hot_swap(servers):
+    """Single connection to ethereum, swapped to polygon and back for each polygon step."""
+
+    def connect(name):
+        rpc = BatchRPC(servers[name].endpoint_uri)
+        for method in HANDSHAKE:
+            rpc.request(method, [])
+        return rpc
+
+    rpc = connect("ethereum")
+    for name, call_count in STEPS:
+        if name != "ethereum":
+            rpc = connect(name)
+        for _ in range(call_count):
+            rpc.request("eth_call", [])
+        if name != "ethereum":
+            rpc = connect("ethereum")
+
+
+def persistent(servers):
+    """One open connection per chain, for the life of the process."""
+    rpcs = {name: BatchRPC(server.endpoint_uri) for name, server in servers.items()}
+    for name, call_count in STEPS:
+        for _ in range(call_count):
+            rpcs[name].request("eth_call", [])
+
+
+def main():
+    print(f"Replaying {RUNS} build_calldata runs with {LATENCY * 1000:.0f}ms round trip\n")
+    for func in (hot_swap, persistent):
+        servers = {
+            "ethereum": MockRPCServer(HANDLERS, latency=LATENCY),
+            "polygon": MockRPCServer(HANDLERS, latency=LATENCY),
+        }
+        with servers["ethereum"], servers["polygon"]:
+            start = time.perf_counter()
+            for _ in range(RUNS):
+                func(servers)
+            elapsed = (time.perf_counter() - start) / RUNS
+            requests = sum(i.request_count for i in servers.values()) // RUNS
+        print(f"{func.__name__:<12} {elapsed:>8.2f}s per run {requests:>6} requests per run")
+
+
+if __name__ == "__main__":
+    main()
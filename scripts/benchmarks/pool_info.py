@@ -0,0 +1,69 @@
+"""Benchmark of `PoolInfo.get_pool_info` against the registry's per-field getters.
+
+Deploys `PoolInfo` on a fork, then reads the data of every pool in the registry
+once with a call per getter per pool, and once with a single `get_pool_info` call
+per `MAX_POOLS` pools, comparing the number of calls, gas and wall time of each.
+Gas is that of `eth_estimateGas` for each call, so it includes the 21,000 base cost
+every call is charged against the node's `eth_call` gas cap.
+
+Run with: brownie run benchmarks/pool_info --network polygon-main-fork
+"""
+import time
+
+from brownie import PoolInfo, accounts, interface, web3
+
+ADDRESS_PROVIDER = "0x0000000022D53366457F9d5E68Ec105046FC4383"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+MAX_POOLS = 10
+GETTERS = (
+    "get_n_coins",
+    "get_coins",
+    "get_underlying_coins",
+    "get_decimals",
+    "get_rates",
+    "get_balances",
+    "get_admin_balances",
+    "get_A",
+    "get_fees",
+    "get_gauges",
+)
+
+
+def _run(calls):
+    gas = 0
+    start = time.perf_counter()
+    for method, args in calls:
+        method.call(*args)
+    elapsed = time.perf_counter() - start
+    for method, args in calls:
+        gas += web3.eth.estimate_gas({"to": method._address, "data": method.encode_input(*args)})
+    return gas, elapsed
+
+
+def main():
+    address_provider = interface.AddressProvider(ADDRESS_PROVIDER)
+    registry = interface.Registry(address_provider.get_address(0))
+    pool_info = PoolInfo.deploy(ADDRESS_PROVIDER, {"from": accounts[0]})
+
+    pools = [registry.pool_list(i) for i in range(registry.pool_count())]
+    batches = [pools[i : i + MAX_POOLS] for i in range(0, len(pools), MAX_POOLS)]
+    batches = [i + [ZERO_ADDRESS] * (MAX_POOLS - len(i)) for i in batches]
+
+    # returned values are the same, before timing anything
+    for batch in batches:
+        info = pool_info.get_pool_info(batch)
+        for i, pool in enumerate(i for i in batch if i != ZERO_ADDRESS):
+            assert list(info["balances"][i]) == list(registry.get_balances(pool))
+            assert list(info["admin_balances"][i]) == list(registry.get_admin_balances(pool))
+            assert list(info["rates"][i]) == list(registry.get_rates(pool))
+
+    results = [
+        ("per-field getters", [(getattr(registry, i), (p,)) for p in pools for i in GETTERS]),
+        ("get_pool_info", [(pool_info.get_pool_info, (i,)) for i in batches]),
+    ]
+
+    print(f"{len(pools)} pools\n")
+    print(f"{'method':<20} {'calls':>6} {'gas':>12} {'time':>10}")
+    for name, calls in results:
+        gas, elapsed = _run(calls)
+        print(f"{name:<20} {len(calls):>6} {gas:>12,} {elapsed:>9.3f}s")
@@ -0,0 +1,67 @@
+"""Benchmark of `StableSwapQuoter.get_dy_multiple` against one `get_dy` call per quote.
+
+Deploys `StableSwapQuoter` on a fork, then quotes every pair of coins of the deployed
+aave and ren pools at several sizes, once with a `get_dy` call per quote and once with
+a single `get_dy_multiple` call per pool, comparing the gas and wall time of each.
+Gas is that of `eth_estimateGas` for each call, so it includes the 21,000 base cost
+every call is charged against the node's `eth_call` gas cap.
+
+Run with: brownie run benchmarks/quoter_gas --network polygon-main-fork
+"""
+import itertools
+import json
+import time
+from pathlib import Path
+
+from brownie import StableSwapAave, StableSwapQuoter, StableSwapREN, accounts, web3
+
+MAX_QUOTES = 100
+POOLS_DIR = Path(__file__).parents[2].joinpath("contracts/pools")
+POOLS = [("aave", StableSwapAave), ("ren", StableSwapREN)]
+# quote sizes, as a divisor of the pool balance of the coin sent
+SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5]
+
+
+def _timed(calls):
+    start = time.perf_counter()
+    for method, args in calls:
+        method.call(*args)
+    return sum(method.estimate_gas(*args) for method, args in calls), time.perf_counter() - start
+
+
+def main():
+    quoter = StableSwapQuoter.deploy({"from": accounts[0]})
+
+    print(f"{'pool':<6} {'method':<16} {'quotes':>6} {'gas':>12} {'time':>10}")
+    for name, container in POOLS:
+        with POOLS_DIR.joinpath(f"{name}/pooldata.json").open() as fp:
+            pool_data = json.load(fp)
+        swap = container.at(pool_data["swap_address"])
+        n_coins = len(pool_data["coins"])
+        quotes = [
+            (i, j, swap.balances(i) // size)
+            for i, j in itertools.permutations(range(n_coins), 2)
+            for size in SIZES
+        ]
+        i, j, dx = (list(x) for x in zip(*quotes))
+        padding = [0] * (MAX_QUOTES - len(quotes))
+
+        # returned values are the same, before timing anything. aToken balances accrue
+        # every second, so every quote is made at the same block
+        block = web3.eth.block_number
+        result = quoter.get_dy_multiple.call(
+            swap, n_coins, i + padding, j + padding, dx + padding, block_identifier=block
+        )
+        assert list(result[: len(quotes)]) == [
+            swap.get_dy.call(*args, block_identifier=block) for args in quotes
+        ]
+
+        for method, calls in [
+            ("get_dy", [(swap.get_dy, args) for args in quotes]),
+            (
+                "get_dy_multiple",
+                [(quoter.get_dy_multiple, (swap, n_coins, i + padding, j + padding, dx + padding))],
+            ),
+        ]:
+            gas, elapsed = _timed(calls)
+            print(f"{name:<6} {method:<16} {len(quotes):>6} {gas:>12,} {elapsed:>9.3f}s")
@@ -0,0 +1,58 @@
+"""Benchmark serial vs bulk receipt retrieval for the receipts trie.
+
+Run with: python -m scripts.benchmarks.receipt_fetch
+"""
+import time
+
+from hexbytes import HexBytes
+
+from scripts.benchmarks.mock_rpc import MockRPCServer, SyntheticChain, state_sync_tx_hash
+from scripts.rpc_batch import BatchRPC, fetch_receipts, format_receipt
+
+BLOCK_NUMBER = 20_000_000
+TX_COUNT = 500
+LATENCY = 0.02
+
+
+def _run(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<40} {time.perf_counter() - start:>8.2f}s")
+    return result
+
+
+def main():
+    chain = SyntheticChain(tx_count=TX_COUNT, state_sync=True)
+    block = chain.block(BLOCK_NUMBER)
+    sync_hash = state_sync_tx_hash(BLOCK_NUMBER, block["hash"])
+    tx_hashes = [tx for tx in block["transactions"] if tx != sync_hash]
+    print(f"Fetching {len(tx_hashes)} receipts with {LATENCY * 1000:.0f}ms simulated round trip\n")
+
+    def fetch_serial(rpc):
+        return [format_receipt(rpc.request("eth_getTransactionReceipt", (tx,))) for tx in tx_hashes]
+
+    with MockRPCServer(chain.handlers, latency=LATENCY) as server:
+        expected = _run("serial", fetch_serial, BatchRPC(server.endpoint_uri))
+        rpc = BatchRPC(server.endpoint_uri)
+        receipts = _run("eth_getBlockReceipts", fetch_receipts, rpc, BLOCK_NUMBER, tx_hashes)
+        assert receipts == expected
+
+    handlers = chain.handlers
+    del handlers["eth_getBlockReceipts"]
+    with MockRPCServer(handlers, latency=LATENCY) as server:
+        rpc = BatchRPC(server.endpoint_uri)
+        receipts = _run("batched", fetch_receipts, rpc, BLOCK_NUMBER, tx_hashes)
+        assert receipts == expected
+
+    with MockRPCServer(handlers, latency=LATENCY, batch=False) as server:
+        rpc = BatchRPC(server.endpoint_uri)
+        label = "concurrent, batching unsupported"
+        receipts = _run(label, fetch_receipts, rpc, BLOCK_NUMBER, tx_hashes)
+        assert receipts == expected
+
+    assert [receipt["transactionIndex"] for receipt in expected] == list(range(TX_COUNT))
+    assert HexBytes(sync_hash) not in [receipt["transactionHash"] for receipt in expected]
+
+
+if __name__ == "__main__":
+    main()
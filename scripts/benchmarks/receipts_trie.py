@@ -0,0 +1,48 @@
+"""Benchmark building the receipts trie one insert at a time vs in bulk.
+
+Run with: python -m scripts.benchmarks.receipts_trie
+"""
+import os
+import random
+import time
+
+import rlp
+from trie import HexaryTrie
+
+from scripts.receipts_trie import BulkTrie
+
+
+def build_hexary(items):
+    receipts_trie = HexaryTrie({})
+    for key, value in items.items():
+        receipts_trie[key] = value
+    return receipts_trie
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    random.seed(0)
+    print(f"{'receipts':>10} {'HexaryTrie':>12} {'BulkTrie':>10} {'speedup':>9}")
+    for count in (100, 500, 1000, 2000):
+        # serialized receipts are a few hundred bytes to a few kilobytes
+        items = {rlp.encode(i): os.urandom(random.randint(200, 3000)) for i in range(count)}
+        target = rlp.encode(count // 2)
+
+        hexary, hexary_time = _timed(build_hexary, items)
+        bulk, bulk_time = _timed(BulkTrie, items)
+
+        assert bulk.root_hash == hexary.root_hash
+        assert rlp.encode(bulk.get_proof(target)) == rlp.encode(hexary.get_proof(target))
+        print(
+            f"{count:>10} {hexary_time:>11.3f}s {bulk_time:>9.3f}s "
+            f"{hexary_time / bulk_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of off-chain `get_best_rate` and `best_route` quotes.
+
+Builds a `RegistryIndex` with the markets of the aave and ren pools, plus a few
+synthetic pools sharing their coins, so that each pair has several pools to compare
+and `best_route` has several coins to route through. Every ordered pair of coins is
+then quoted at 100 sizes, single pool with `get_best_rate` and up to two pools with
+`best_route`, and the time per quote is compared with the 1ms target.
+
+Run with: python -m scripts.benchmarks.router_quotes
+"""
+import itertools
+import time
+
+from scripts.router import ZERO_ADDRESS, RegistryIndex, Router
+from scripts.stableswap.pool import PoolState
+
+N_SIZES = 100
+TARGET = 1e-3
+
+DAI = "0x8f3cf7ad23cd3cadbd9735aff958023239c6a063"
+USDC = "0x2791bca1f2de4661ed88a30c99a7a9449aa84174"
+USDT = "0xc2132d05d31c914a87c6611c10748aeb04b58e8f"
+AMDAI = "0x27f8d03b3a2196956ed754badc28d73be8830a6e"
+AMUSDC = "0x1a13f4ca1d028320a707d99520abfefca3998b7f"
+AMUSDT = "0x60d55f02a771d515e077c9c2403a1ef324885cec"
+WBTC = "0x1bfd67037b42cf73acf2047067bd4f2c47d9bfd6"
+RENBTC = "0xdbf31df14b66535af65aac99c32e9ea844e14501"
+AMWBTC = "0x5c2ed810328349100a66b82b78a1791b101c9d61"
+
+# (pool, coins, underlying coins, precision of each coin, balance of each coin)
+POOLS = [
+    ("0xaave", [AMDAI, AMUSDC, AMUSDT], [DAI, USDC, USDT], (1, 10 ** 12, 10 ** 12), 10 ** 7),
+    ("0xren", [AMWBTC, RENBTC], [WBTC, RENBTC], (10 ** 10, 10 ** 10), 10 ** 2),
+    ("0xdaiusdc", [DAI, USDC], [], (1, 10 ** 12), 10 ** 6),
+    ("0xusdcusdt", [USDC, USDT], [], (10 ** 12, 10 ** 12), 10 ** 6),
+    ("0xdaiusdt", [DAI, USDT], [], (1, 10 ** 12), 10 ** 5),
+    ("0xbtcusd", [USDC, WBTC], [], (10 ** 12, 10 ** 10), 10 ** 2),
+]
+
+
+def _state(precision_mul, balance):
+    # each coin is worth the same here, with 10% more of the first coin than the others
+    balances = tuple(balance * 10 ** 18 // p for p in precision_mul)
+    balances = (balances[0] * 11 // 10,) + balances[1:]
+    return PoolState(
+        precision_mul=precision_mul,
+        balances=balances,
+        fee=4000000,
+        offpeg_fee_multiplier=20000000000,
+        initial_A=20000,
+        future_A=20000,
+        initial_A_time=0,
+        future_A_time=0,
+        token_supply=sum(a * b for a, b in zip(precision_mul, balances)),
+        timestamp=0,
+    )
+
+
+def _router():
+    index = RegistryIndex()
+    states = {}
+    for pool, coins, underlying_coins, precision_mul, balance in POOLS:
+        index.add_pool(pool, coins + [ZERO_ADDRESS], underlying_coins + [ZERO_ADDRESS])
+        states[pool] = _state(precision_mul, balance)
+    return Router(index, states)
+
+
+def _timed(func, quotes):
+    start = time.perf_counter()
+    results = [func(*i) for i in quotes]
+    return results, time.perf_counter() - start
+
+
+def main():
+    router = _router()
+    decimals = {}
+    for _, coins, underlying_coins, precision_mul, _ in POOLS:
+        for coin_list in (coins, underlying_coins):
+            decimals.update(zip(coin_list, precision_mul))
+
+    # sizes from 1 to 100 units of the coin sent, over every pair sharing a market
+    quotes = [
+        (a, b, 10 ** 18 // decimals[a] * k)
+        for a, b in itertools.permutations(decimals, 2)
+        if router.index.find_pools_for_coins(a, b) or set(router.index.neighbours(a)) - {b}
+        for k in range(1, N_SIZES + 1)
+    ]
+
+    single, single_time = _timed(router.get_best_rate, quotes)
+    routes, route_time = _timed(router.best_route, quotes)
+    quoted = sum(1 for _, dy in single if dy)
+    routed = sum(1 for i in routes if i is not None)
+    two_pool = sum(1 for i in routes if i is not None and len(i.pools) == 2)
+
+    print(f"{len(quotes):,} quotes, {len(router.index.pools)} pools\n")
+    print(f"{'method':<16} {'quoted':>8} {'time':>10} {'per quote':>12}")
+    for name, count, elapsed in [
+        ("get_best_rate", quoted, single_time),
+        ("best_route", routed, route_time),
+    ]:
+        print(f"{name:<16} {count:>8,} {elapsed:>9.3f}s {elapsed / len(quotes) * 10 ** 6:>10.1f}us")
+    print(f"\n{two_pool:,} best routes go through two pools")
+    print(f"best_route per quote is {route_time / len(quotes) / TARGET:.2f}x the 1ms target")
+
+
+if __name__ == "__main__":
+    main()
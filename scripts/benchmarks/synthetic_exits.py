@@ -0,0 +1,357 @@
+"""Synthetic burns and exits, for testing the exit pipeline without mainnet access.
+
+`SyntheticExits` generates a Polygon chain with burn txs in two checkpoints, and the
+RootChain state and exit transactions on Ethereum which go with them. The expected
+exit calldata is built here independently of `scripts.exit`, with `HexaryTrie` and a
+naive Merkle tree, so replaying the exits through `scripts.exit` checks its output.
+
+Running this module serves both chains with `MockRPCServer`, runs the exit tester
+against them and records the RPC traffic to the cassette replayed by
+`tests/local/test_exit_replay.py`:
+
+    python -m scripts.benchmarks.synthetic_exits
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Tuple
+
+import rlp
+from eth_utils import keccak
+from trie import HexaryTrie
+
+from scripts.benchmarks.mock_rpc import MockRPCServer, _word, state_sync_tx_hash
+from scripts.fetch_deployment_data import PROXY_DEPLOYMENT_ADDRS as ADDRS
+from scripts.multicall import MULTICALL3
+
+CASSETTE_PATH = Path(__file__).parents[2].joinpath("tests/data/exit-synthetic.json.gz")
+
+# (header block id, first child block, last child block)
+CHECKPOINTS = [(10000, 1000, 1049), (20000, 1050, 1099)]
+# (block number, transaction index) of each burn, the first two share a block
+BURNS = [(1010, 1), (1010, 3), (1077, 2)]
+# blocks with a state-sync pseudo-transaction, which has no receipt
+STATE_SYNC_BLOCKS = {1077}
+TX_COUNT = 4
+ETHEREUM_HEAD = 15_000_000
+
+ZERO_WORD = bytes(32)
+TRANSFER_TOPIC = keccak(b"Transfer(address,address,uint256)")
+
+
+def _hex(value: bytes) -> str:
+    return "0x" + bytes(value).hex()
+
+
+def _uint(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+def _selector(signature: str) -> bytes:
+    return keccak(signature.encode())[:4]
+
+
+def _encode_bytes(value: bytes) -> bytes:
+    padded = value + bytes(-len(value) % 32)
+    return _uint(len(value)) + padded
+
+
+def merkle_root(leaves: List[bytes]) -> Tuple[bytes, List[List[bytes]]]:
+    """Root of a checkpoint Merkle tree, and the proof of each leaf.
+
+    The leaves are padded with zero words to a power of two.
+    """
+    size = 1
+    while size < len(leaves):
+        size *= 2
+    layer = leaves + [ZERO_WORD] * (size - len(leaves))
+    proofs = [[] for _ in leaves]
+    positions = list(range(len(leaves)))
+    while len(layer) > 1:
+        for i, position in enumerate(positions):
+            proofs[i].append(layer[position ^ 1])
+            positions[i] = position // 2
+        layer = [keccak(layer[i] + layer[i + 1]) for i in range(0, len(layer), 2)]
+    return layer[0], proofs
+
+
+class SyntheticExits:
+    """Polygon blocks, receipts and checkpoints, and the exits built from them."""
+
+    def __init__(self):
+        self.blocks: Dict[int, dict] = {}
+        self.receipts: Dict[str, dict] = {}
+        self.transactions: Dict[str, dict] = {}
+        self.exits: Dict[str, dict] = {}
+        self.burns: List[str] = []
+        self._receipt_tries: Dict[int, HexaryTrie] = {}
+
+        start, end = CHECKPOINTS[0][1], CHECKPOINTS[-1][2]
+        for number in range(start, end + 1):
+            self._add_block(number)
+
+        self.headers = {}
+        self.test_txs: List[Tuple[str, str]] = []
+        for header_id, start, end in CHECKPOINTS:
+            leaves = [self._leaf(self.blocks[i]) for i in range(start, end + 1)]
+            root, proofs = merkle_root(leaves)
+            self.headers[header_id] = (root, start, end)
+            for burn_tx in self.burns:
+                number = int(self.receipts[burn_tx]["blockNumber"], 16)
+                if start <= number <= end:
+                    calldata = self._calldata(header_id, proofs[number - start], burn_tx)
+                    self.test_txs.append((burn_tx, self._add_exit(burn_tx, calldata)))
+
+    @staticmethod
+    def _leaf(block: dict) -> bytes:
+        return keccak(
+            _uint(int(block["number"], 16))
+            + _uint(int(block["timestamp"], 16))
+            + bytes.fromhex(block["transactionsRoot"][2:])
+            + bytes.fromhex(block["receiptsRoot"][2:])
+        )
+
+    @staticmethod
+    def _serialize_receipt(receipt: dict) -> bytes:
+        logs = [
+            [
+                bytes.fromhex(log["address"][2:]),
+                [bytes.fromhex(topic[2:]) for topic in log["topics"]],
+                bytes.fromhex(log["data"][2:]),
+            ]
+            for log in receipt["logs"]
+        ]
+        return rlp.encode(
+            [
+                int(receipt["status"], 16),
+                int(receipt["cumulativeGasUsed"], 16),
+                bytes.fromhex(receipt["logsBloom"][2:]),
+                logs,
+            ]
+        )
+
+    def _receipt(self, number: int, index: int, tx_hash: str, block_hash: str) -> dict:
+        sender = _word("sender", number, index)[:42]
+        token = _word("token", number, index)[:42]
+        logs = [
+            {
+                "address": token,
+                "topics": [
+                    _word("topic", number, index),
+                    _hex(bytes(12) + bytes.fromhex(sender[2:])),
+                ],
+                "data": _word("data", number, index),
+            }
+        ]
+        if (number, index) in BURNS:
+            self.burns.append(tx_hash)
+            # a transfer to the zero address, after an unrelated transfer
+            for recipient in (_word("recipient", number)[:42], "0x" + "00" * 20):
+                logs.append(
+                    {
+                        "address": token,
+                        "topics": [
+                            _hex(TRANSFER_TOPIC),
+                            _hex(bytes(12) + bytes.fromhex(sender[2:])),
+                            _hex(bytes(12) + bytes.fromhex(recipient[2:])),
+                        ],
+                        "data": _hex(_uint(10 ** 18 * (index + 1))),
+                    }
+                )
+        return {
+            "blockHash": block_hash,
+            "blockNumber": hex(number),
+            "contractAddress": None,
+            "cumulativeGasUsed": hex(60000 * (index + 1)),
+            "effectiveGasPrice": hex(30 * 10 ** 9),
+            "from": sender,
+            "gasUsed": hex(60000),
+            "logs": [
+                dict(log, blockHash=block_hash, blockNumber=hex(number), logIndex=hex(i))
+                for i, log in enumerate(logs)
+            ],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "to": token,
+            "transactionHash": tx_hash,
+            "transactionIndex": hex(index),
+            "type": "0x0",
+        }
+
+    def _add_block(self, number: int) -> None:
+        block_hash = _word("hash", number)
+        tx_hashes = [_word("tx", number, i) for i in range(TX_COUNT)]
+        receipts_trie = HexaryTrie({})
+        for index, tx_hash in enumerate(tx_hashes):
+            receipt = self._receipt(number, index, tx_hash, block_hash)
+            receipts_trie[rlp.encode(index)] = self._serialize_receipt(receipt)
+            self.receipts[tx_hash] = receipt
+            self.transactions[tx_hash] = self._transaction(receipt, "0x")
+        if number in STATE_SYNC_BLOCKS:
+            tx_hashes.append(state_sync_tx_hash(number, block_hash))
+
+        self.blocks[number] = {
+            "difficulty": "0x1",
+            "extraData": "0x" + "00" * 97,
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(60000 * TX_COUNT),
+            "hash": block_hash,
+            "logsBloom": "0x" + "00" * 256,
+            "miner": "0x" + "00" * 20,
+            "mixHash": "0x" + "00" * 32,
+            "nonce": "0x" + "00" * 8,
+            "number": hex(number),
+            "parentHash": _word("hash", number - 1),
+            "receiptsRoot": _hex(receipts_trie.root_hash),
+            "sha3Uncles": _word("uncles"),
+            "size": hex(1000),
+            "stateRoot": _word("state", number),
+            "timestamp": hex(1_650_000_000 + 2 * number),
+            "totalDifficulty": hex(number),
+            "transactions": tx_hashes,
+            "transactionsRoot": _word("txs", number),
+            "uncles": [],
+        }
+        self._receipt_tries[number] = receipts_trie
+
+    @staticmethod
+    def _transaction(receipt: dict, data: str) -> dict:
+        return {
+            "blockHash": receipt["blockHash"],
+            "blockNumber": receipt["blockNumber"],
+            "from": receipt["from"],
+            "gas": hex(100000),
+            "gasPrice": hex(30 * 10 ** 9),
+            "hash": receipt["transactionHash"],
+            "input": data,
+            "nonce": "0x0",
+            "r": "0x1",
+            "s": "0x1",
+            "to": receipt["to"],
+            "transactionIndex": receipt["transactionIndex"],
+            "type": "0x0",
+            "v": "0x1b",
+            "value": "0x0",
+        }
+
+    def _calldata(self, header_id: int, block_proof: List[bytes], burn_tx: str) -> bytes:
+        receipt = self.receipts[burn_tx]
+        block = self.blocks[int(receipt["blockNumber"], 16)]
+        path = rlp.encode(int(receipt["transactionIndex"], 16))
+        receipt_proof = self._receipt_tries[int(block["number"], 16)].get_proof(path)
+        log_index = next(
+            i for i, log in enumerate(receipt["logs"]) if log["topics"][2:3] == [_hex(ZERO_WORD)]
+        )
+        return rlp.encode(
+            [
+                header_id,
+                b"".join(block_proof),
+                int(block["number"], 16),
+                int(block["timestamp"], 16),
+                bytes.fromhex(block["transactionsRoot"][2:]),
+                bytes.fromhex(block["receiptsRoot"][2:]),
+                self._serialize_receipt(receipt),
+                rlp.encode(receipt_proof),
+                b"\x00" + path,
+                log_index,
+            ]
+        )
+
+    def _add_exit(self, burn_tx: str, calldata: bytes) -> str:
+        exit_tx = _word("exit", burn_tx)
+        data = _selector("exit(bytes)") + _uint(32) + _encode_bytes(calldata)
+        receipt = {
+            "blockHash": _word("ethereum", exit_tx),
+            "blockNumber": hex(ETHEREUM_HEAD - 100),
+            "from": _word("exiter")[:42],
+            "to": ADDRS["mainnet"]["RootChainManagerProxy"].lower(),
+            "transactionHash": exit_tx,
+            "transactionIndex": "0x0",
+        }
+        self.exits[exit_tx] = self._transaction(receipt, _hex(data))
+        return exit_tx
+
+    def _root_chain_call(self, data: bytes) -> bytes:
+        selector, args = data[:4], data[4:]
+        if selector == _selector("currentHeaderBlock()"):
+            return _uint(CHECKPOINTS[-1][0])
+        if selector == _selector("getLastChildBlock()"):
+            return _uint(CHECKPOINTS[-1][2])
+        if selector == _selector("headerBlocks(uint256)"):
+            root, start, end = self.headers[int.from_bytes(args[:32], "big")]
+            return root + _uint(start) + _uint(end) + _uint(0) + bytes(32)
+        raise ValueError(f"Unknown RootChain call {_hex(selector)}")
+
+    def _aggregate3(self, data: bytes) -> bytes:
+        # aggregate3((address,bool,bytes)[]) -> (bool,bytes)[]
+        args = data[4:]
+        array = int.from_bytes(args[:32], "big")
+        count = int.from_bytes(args[array : array + 32], "big")
+        heads = args[array + 32 :]
+        results = []
+        for i in range(count):
+            call = heads[int.from_bytes(heads[32 * i : 32 * i + 32], "big") :]
+            offset = int.from_bytes(call[64:96], "big")
+            length = int.from_bytes(call[offset : offset + 32], "big")
+            results.append(self._root_chain_call(call[offset + 32 : offset + 32 + length]))
+
+        encoded = [_uint(1) + _uint(64) + _encode_bytes(i) for i in results]
+        offsets, position = [], 32 * len(encoded)
+        for item in encoded:
+            offsets.append(_uint(position))
+            position += len(item)
+        return _uint(32) + _uint(count) + b"".join(offsets) + b"".join(encoded)
+
+    def _eth_call(self, params: list) -> str:
+        to, data = params[0]["to"].lower(), bytes.fromhex(params[0]["data"][2:])
+        if to == MULTICALL3.lower():
+            return _hex(self._aggregate3(data))
+        if to == ADDRS["mainnet"]["RootChainProxy"].lower():
+            return _hex(self._root_chain_call(data))
+        raise ValueError(f"Unknown contract {to}")
+
+    @property
+    def polygon_handlers(self) -> dict:
+        """JSON-RPC method handlers serving the Polygon chain."""
+        return {
+            "eth_chainId": lambda params: hex(137),
+            "eth_getBlockByNumber": lambda params: self.blocks[int(params[0], 16)],
+            "eth_getBlockReceipts": lambda params: [
+                self.receipts[i]
+                for i in self.blocks[int(params[0], 16)]["transactions"]
+                if i in self.receipts
+            ],
+            "eth_getTransactionByHash": lambda params: self.transactions[params[0]],
+            "eth_getTransactionReceipt": lambda params: self.receipts[params[0]],
+        }
+
+    @property
+    def ethereum_handlers(self) -> dict:
+        """JSON-RPC method handlers serving the Ethereum chain."""
+        return {
+            "eth_chainId": lambda params: hex(1),
+            "eth_blockNumber": lambda params: hex(ETHEREUM_HEAD),
+            "eth_call": self._eth_call,
+            "eth_getTransactionByHash": lambda params: self.exits[params[0]],
+        }
+
+
+def main():
+    from scripts.cassette import Cassette
+    from scripts.chains import Chain, Chains
+    from scripts.exit import _run_tester
+
+    exits = SyntheticExits()
+    CASSETTE_PATH.unlink(missing_ok=True)
+    with MockRPCServer(exits.ethereum_handlers, latency=0) as ethereum, MockRPCServer(
+        exits.polygon_handlers, latency=0
+    ) as polygon, Cassette(CASSETTE_PATH, record=True) as cassette, TemporaryDirectory() as tmp:
+        chains = Chains(
+            Chain("mainnet", ethereum.endpoint_uri, False, Path(tmp), cassette),
+            Chain("polygon-main", polygon.endpoint_uri, True, Path(tmp), cassette),
+        )
+        _run_tester(chains, exits.test_txs)
+    print(f"Recorded {CASSETTE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Pools, burners and coins whose fees are burnt.
+
+Burners are listed in `contracts/burners/burndata.json`. A burner fed by a pool names
+the pool, whose swap address and coins are read from its `pooldata.json`, otherwise
+the coins it burns are listed directly.
+
+The `path` of a burner is how it converts coins to USDC, used to value its burns:
+
+* `aave`: `ABurner`, unwraps aTokens and swaps the underlying with `exchange_with_best_rate`
+* `btc`: `BTCBurner`, swaps to amWBTC, then through atricrypto3 and the aave pool
+* null: unknown, burns are never deferred
+"""
+import json
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).parent.parent
+BURN_DATA = PROJECT_DIR.joinpath("contracts/burners/burndata.json")
+
+
+class Burner(NamedTuple):
+    name: str
+    address: str
+    coins: List[str]
+    pool: Optional[str]
+    path: Optional[str] = None
+    # underlying coin of each coin, if it wraps one
+    underlying_coins: Optional[List[str]] = None
+
+
+class BurnConfig(NamedTuple):
+    admin: str
+    burners: List[Burner]
+    bridge: str
+    bridge_coin: str
+    # a burn runs once its value is at least `margin` times its gas cost
+    margin: float = 1.0
+
+    @property
+    def pools(self) -> List[str]:
+        """Swap addresses of the pools whose admin fees are burnt."""
+        return [i.pool for i in self.burners if i.pool is not None]
+
+
+def _pool_coins(pool_name: str) -> Tuple[str, List[str], List[str]]:
+    with PROJECT_DIR.joinpath(f"contracts/pools/{pool_name}/pooldata.json").open() as fp:
+        pool_data = json.load(fp)
+    coins = [i.get("wrapped_address") or i["underlying_address"] for i in pool_data["coins"]]
+    underlying_coins = [i["underlying_address"] for i in pool_data["coins"]]
+    return pool_data["swap_address"], coins, underlying_coins
+
+
+def load_burn_config(path: Path = BURN_DATA) -> BurnConfig:
+    """Load the burners, resolving the swap address and coins of each pool from its pooldata."""
+    with path.open() as fp:
+        burn_data = json.load(fp)
+
+    burners = []
+    for burner in burn_data["burners"]:
+        pool, coins, underlying_coins = None, burner.get("coins", []), None
+        if "pool" in burner:
+            pool, coins, underlying_coins = _pool_coins(burner["pool"])
+        burners.append(
+            Burner(
+                burner["name"],
+                burner["address"],
+                coins,
+                pool,
+                burner.get("path"),
+                underlying_coins,
+            )
+        )
+
+    return BurnConfig(
+        burn_data["admin"],
+        burners,
+        burn_data["bridge"]["address"],
+        burn_data["bridge"]["coin"],
+        burn_data.get("scheduler", {}).get("margin", 1.0),
+    )
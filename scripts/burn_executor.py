@@ -0,0 +1,119 @@
+"""Pre-simulated, concurrently submitted admin transactions for burning fees.
+
+Each transaction is simulated with `eth_call` before anything is sent. Calls which
+would revert, or which have nothing to move, are dropped and reported rather than
+paying gas for nothing. The remaining transactions are signed and broadcast one at a
+time in nonce order, without waiting for each to confirm, and are then awaited
+together. A transaction which fails to broadcast does not use up its nonce, so it
+never leaves a gap that would stall the transactions after it.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Optional
+
+from brownie.exceptions import VirtualMachineError
+
+GAS_LIMIT = 2000000
+MAX_WORKERS = 8
+
+CONFIRMED = "confirmed"
+REVERTED = "reverted"
+NO_OP = "skipped: nothing to move"
+WOULD_REVERT = "skipped: simulation reverted"
+DEFERRED = "deferred: below margin"
+SEND_FAILED = "failed: not broadcast"
+
+
+class Call(NamedTuple):
+    """A contract call to simulate and then send."""
+
+    label: str
+    method: Callable
+    args: tuple
+    # returns True when the call has nothing to do, checked before simulating
+    is_noop: Callable[[], bool] = lambda: False
+
+
+class CallResult(NamedTuple):
+    label: str
+    status: str
+    txid: Optional[str] = None
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BurnExecutor:
+    """Simulates, then sends and awaits together, transactions from a single account."""
+
+    def __init__(self, sender, gas_limit: int = GAS_LIMIT, max_workers: int = MAX_WORKERS):
+        """Initialize the executor.
+
+        Args:
+            sender: Brownie account sending every transaction
+            gas_limit: Gas limit of each transaction, so none has to be estimated
+            max_workers: Maximum number of calls simulated, or confirmations awaited, at once
+        """
+        self.sender = sender
+        self.gas_limit = gas_limit
+        self.max_workers = max_workers
+
+    def simulate(self, call: Call) -> Optional[CallResult]:
+        """Simulate a call, returning the result of dropping it or None if it should be sent."""
+        if call.is_noop():
+            return CallResult(call.label, NO_OP)
+        try:
+            call.method.call(*call.args, {"from": self.sender})
+        except VirtualMachineError as exc:
+            return CallResult(call.label, WOULD_REVERT, error=exc.revert_msg or str(exc))
+        return None
+
+    def execute(self, calls: List[Call]) -> List[CallResult]:
+        """Simulate `calls`, then send those which succeed and wait for all of them.
+
+        Returns:
+            The result of each call, in the order given
+        """
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            simulated = list(pool.map(self.simulate, calls))
+
+        # nodes reject nonces ahead of the account's, so broadcast strictly in order
+        nonce = self.sender.nonce
+        sent = {}
+        for index, call in enumerate(calls):
+            if simulated[index] is not None:
+                continue
+            tx_params = {
+                "from": self.sender,
+                "nonce": nonce,
+                "gas_limit": self.gas_limit,
+                "required_confs": 0,
+            }
+            try:
+                sent[index] = call.method(*call.args, tx_params)
+            except (ValueError, VirtualMachineError) as exc:
+                simulated[index] = CallResult(call.label, SEND_FAILED, error=str(exc))
+                continue
+            nonce += 1
+
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            list(pool.map(lambda tx: tx.wait(1), sent.values()))
+
+        results = []
+        for index, call in enumerate(calls):
+            result = simulated[index]
+            if result is None:
+                tx = sent[index]
+                status = CONFIRMED if tx.status == 1 else REVERTED
+                result = CallResult(call.label, status, tx.txid, tx.gas_used, tx.revert_msg)
+            results.append(result)
+        return results
+
+
+def print_report(results: List[CallResult]) -> None:
+    """Print one line per call: label, status, tx hash and gas used."""
+    for result in results:
+        line = f"{result.label:<40} {result.status:<28} {result.txid or '':<66}"
+        if result.gas_used is not None:
+            line += f" {result.gas_used:>9,}"
+        if result.error:
+            line += f" ({result.error})"
+        print(line)
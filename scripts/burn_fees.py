@@ -1,61 +1,89 @@
-from brownie import Contract, accounts, history
+import json
+from datetime import datetime
+
+from brownie import Contract, accounts, network, web3
+
+from scripts.burn_config import load_burn_config
+from scripts.burn_executor import DEFERRED, BurnExecutor, Call, CallResult, print_report
+from scripts.burn_scheduler import (
+    BurnQuoter,
+    estimate_burns,
+    gas_cost,
+    plan_burns,
+    record_observation,
+)
+from scripts.chains import Chain
+from scripts.fee_snapshot import take_snapshot
+from scripts.instrumentation import phase, rpc_middleware, write_report
 
 
 def main():
+    if rpc_middleware not in web3.middleware_onion:
+        web3.middleware_onion.add(rpc_middleware)
+
     deploy = accounts.load("curve-deploy")
-    admin = Contract("0x7EAfd3cd937628b9671d5f8B9c823f4AAc914808")
+    config = load_burn_config()
+    polygon = Chain(network.show_active(), web3.provider.endpoint_uri, poa=True)
+    executor = BurnExecutor(deploy)
+    admin = Contract(config.admin)
+    results = []
 
     # withdraw admin fees to the burners
-    swap = Contract("0x445FE580eF8d70FF569aB36e80c647af338db351")
-    swap_btc = Contract("0xC2d95EEF97Ec6C17551d45e77B590dc1F9117C67")
-    admin.execute(
-        swap,
-        swap.withdraw_admin_fees.encode_input(),
-        {"from": deploy, "required_confs": 0},
-    )
-    admin.execute(
-        swap_btc,
-        swap_btc.withdraw_admin_fees.encode_input(),
-        {"from": deploy, "required_confs": 0},
-    )
-    history.wait()
-
-    # burn am3CRV fees
-    burner = Contract("0xA237034249290De2B07988Ac64b96f22c0E76fE0")
-    for i in range(3):
-        try:
-            burner.burn(
-                swap.coins(i),
-                {"from": deploy, "gas_limit": 2000000, "required_confs": 0},
+    with phase("withdraw_admin_fees"):
+        snapshot = take_snapshot(polygon, config=config)
+        calls = []
+        for burner in snapshot.burners:
+            if burner.pool is None:
+                continue
+            swap = Contract(burner.pool)
+            calls.append(
+                Call(
+                    f"withdraw_admin_fees {burner.pool}",
+                    admin.execute,
+                    (swap, swap.withdraw_admin_fees.encode_input()),
+                    lambda balances=burner.admin_balances: not any(balances),
+                )
             )
-        except Exception:
-            pass
-
-    # burn renBTC fees
-    burner = Contract("0x5109Abc063164d49C148A7AE970F631FEBbDa4FA")
-    for i in range(2):
-        try:
-            burner.burn(
-                swap_btc.coins(i),
-                {"from": deploy, "gas_limit": 2000000, "required_confs": 0},
-            )
-        except Exception:
-            pass
+        results += executor.execute(calls)
 
-    # burn tricrypto3
-    burner = Contract("0x43450Feccf936FbA3143e03F35D3Cc608D5fE1d2")
-    burner.burn(
-        "0xdAD97F7713Ae9437fa9249920eC8507e5FbB23d3",
-        {'from': deploy, 'gas_limit': 2000000, 'required_confs': 0}
-    )
+    # value each burn, deferring those not yet worth their gas
+    with phase("schedule"):
+        snapshot = take_snapshot(polygon, deploy.address, config)
+        quoter = BurnQuoter(polygon)
+        gas_price, matic_price = polygon.w3.eth.gas_price, quoter.matic_price()
+        estimates = estimate_burns(quoter, snapshot, deploy.address)
+        run, deferred = plan_burns(estimates, gas_price, matic_price, config.margin)
+        to_run = {i.label for i in run}
+        for i in deferred:
+            cost = gas_cost(i.gas, gas_price, matic_price)
+            error = f"${i.value:,.2f} < {config.margin}x ${cost:,.2f} gas"
+            results.append(CallResult(i.label, DEFERRED, error=error))
 
-    history.wait()
+    # burn the fees of every coin worth burning
+    with phase("burn"):
+        calls = []
+        for burner in snapshot.burners:
+            burner_contract = Contract(burner.burner)
+            for coin in burner.coins:
+                label = f"burn {burner.name} {coin}"
+                if label in to_run:
+                    calls.append(Call(label, burner_contract.burn, (coin,)))
+        results += executor.execute(calls)
+        record_observation(estimates, to_run, gas_price, matic_price)
 
     # send USDC over the bridge
-    usdc = Contract("0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174")
-    bridge = Contract("0x4473243A61b5193670D1324872368d015081822f")
-    amount = usdc.balanceOf(bridge)
-    tx = admin.execute(bridge, bridge.withdraw.encode_input(usdc), {"from": deploy})
+    with phase("bridge"):
+        amount = take_snapshot(polygon, config=config).bridge_balance
+        bridge = Contract(config.bridge)
+        tx = admin.execute(
+            bridge, bridge.withdraw.encode_input(config.bridge_coin), {"from": deploy}
+        )
+
+    print_report(results)
+    fp = f"burn_fees-txs-{datetime.now().isoformat()}.json"
+    with open(fp, "w") as f:
+        json.dump([i._asdict() for i in results], f, indent=2)
 
     print(f"Burning phase 1 complete!\nAmount: {amount/1e6:,.2f} USDC\nBridge txid: {tx.txid}")
     print("\nUse `brownie run exit --network mainnet` to claim on ETH once the checkpoint is added")
+    print(f"Instrumentation report written to {write_report('burn_fees')}")
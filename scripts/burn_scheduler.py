@@ -0,0 +1,287 @@
+"""Only burn fees once they are worth more than the gas it costs to burn them.
+
+The USDC each burn would send to the receiver is quoted along the burner's path,
+using the same pools the burner swaps through:
+
+* `ABurner`: aTokens unwrap 1:1, the underlying is quoted with `get_best_rate`
+* `BTCBurner`: `get_best_rate` to amWBTC, then `get_dy` on atricrypto3 and
+  `calc_withdraw_one_coin` on the aave pool
+
+The gas cost is the estimated gas of the burn at the current gas price, valued in
+USDC at the price of the Chainlink MATIC / USD feed, as none of the pools trade MATIC.
+A burn runs when its value is at least `margin` times its cost, otherwise it is
+deferred and its fees keep accumulating until a later run.
+
+Each run can be recorded as a line of JSON. `backtest` replays a recorded series to
+compare margins, run with:
+
+    python -m scripts.burn_scheduler <series.jsonl> [--margin 0 1 1.5 2]
+"""
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from eth_utils import to_checksum_address
+
+from scripts.burn_config import Burner
+from scripts.chains import Chain
+from scripts.fee_snapshot import FeeSnapshot
+from scripts.leaf_cache import CACHE_DIR
+
+ADDRESS_PROVIDER = "0x0000000022D53366457F9d5E68Ec105046FC4383"
+# `AddressProvider` id of the registry exchange contract
+REGISTRY_SWAPS_ID = 2
+
+AMWBTC = "0x5c2ed810328349100A66B82b78a1791B101C9D61"
+# Chainlink MATIC / USD price feed
+MATIC_USD_FEED = "0xAB594600376Ec9fD91F8e885dADF0CE036862dE0"
+ATRICRYPTO3 = "0x92215849c439E1f8612b6646060B4E3E5ef822cC"
+SS_AAVE = "0x445FE580eF8d70FF569aB36e80c647af338db351"
+USDC = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+
+USDC_PRECISION = 10 ** 6
+
+# gas assumed for a burn which could not be estimated
+DEFAULT_BURN_GAS = 2000000
+
+SERIES_PATH = CACHE_DIR.joinpath("burn-series.jsonl")
+
+
+class BurnEstimate(NamedTuple):
+    label: str
+    # USDC sent to the receiver, infinite if the burner path can't be quoted
+    value: float
+    gas: int
+
+
+def gas_cost(gas: int, gas_price: int, matic_price: float) -> float:
+    """USDC cost of `gas` at `gas_price` wei, given the USDC price of MATIC."""
+    return gas * gas_price / 10 ** 18 * matic_price
+
+
+def plan_burns(
+    estimates: Iterable[BurnEstimate], gas_price: int, matic_price: float, margin: float
+) -> Tuple[List[BurnEstimate], List[BurnEstimate]]:
+    """Split burns into those worth running now and those to defer.
+
+    Returns:
+        (burns to run, burns to defer)
+    """
+    run, deferred = [], []
+    for estimate in estimates:
+        cost = gas_cost(estimate.gas, gas_price, matic_price)
+        (run if estimate.value >= margin * cost else deferred).append(estimate)
+    return run, deferred
+
+
+class BurnQuoter:
+    """Values burns, and the gas to run them, with view calls on Polygon."""
+
+    def __init__(self, polygon: Chain):
+        """Initialize the quoter.
+
+        Args:
+            polygon: Connection to the chain the burners are deployed on
+        """
+        self.polygon = polygon
+        self._swaps = None
+
+    @property
+    def swaps(self):
+        """The registry exchange contract, looked up on first use."""
+        if self._swaps is None:
+            address_provider = self.polygon.contract("AddressProvider", ADDRESS_PROVIDER)
+            address = address_provider.functions.get_address(REGISTRY_SWAPS_ID).call()
+            self._swaps = self.polygon.contract("Swaps", address)
+        return self._swaps
+
+    def best_rate(self, coin: str, to: str, amount: int) -> int:
+        return self.swaps.functions.get_best_rate(
+            to_checksum_address(coin), to_checksum_address(to), amount
+        ).call()[1]
+
+    def matic_price(self) -> float:
+        """USDC price of one MATIC, taken to be its USD price from the Chainlink feed.
+
+        Raises:
+            ValueError: If the feed does not give a positive price
+        """
+        feed = self.polygon.contract("ChainlinkAggregator", MATIC_USD_FEED)
+        answer = feed.functions.latestRoundData().call()[1]
+        if answer <= 0:
+            raise ValueError(f"Invalid MATIC price from {MATIC_USD_FEED}: {answer}")
+        return answer / 10 ** feed.functions.decimals().call()
+
+    def value(self, burner: Burner, index: int, amount: int) -> float:
+        """USDC sent to the receiver when `burner` burns `amount` of its `index`th coin."""
+        if amount == 0:
+            return 0.0
+        coin = burner.coins[index]
+
+        if burner.path == "aave":
+            underlying = burner.underlying_coins[index]
+            if underlying.lower() != USDC.lower():
+                amount = self.best_rate(underlying, USDC, amount)
+        elif burner.path == "btc":
+            if coin.lower() != AMWBTC.lower():
+                amount = self.best_rate(coin, AMWBTC, amount)
+            atricrypto3 = self.polygon.contract("CryptoSwap", ATRICRYPTO3)
+            amount = atricrypto3.functions.get_dy(1, 0, amount).call()
+            aave_pool = self.polygon.contract("StableSwap", SS_AAVE)
+            amount = aave_pool.functions.calc_withdraw_one_coin(amount, 1).call()
+        else:
+            return math.inf
+
+        return amount / USDC_PRECISION
+
+    def gas(self, burner: Burner, coin: str, sender: str) -> int:
+        """Estimated gas of burning `coin`, or `DEFAULT_BURN_GAS` if it can't be estimated."""
+        contract = self.polygon.contract("Burner", burner.address)
+        try:
+            return contract.functions.burn(to_checksum_address(coin)).estimateGas({"from": sender})
+        except ValueError:
+            return DEFAULT_BURN_GAS
+
+
+def estimate_burns(quoter: BurnQuoter, snapshot: FeeSnapshot, sender: str) -> List[BurnEstimate]:
+    """Estimate the value and gas of burning each coin with a balance in `snapshot`.
+
+    Args:
+        quoter: Quoter for the chain the snapshot was taken on
+        snapshot: Balances to burn, including those of `sender`
+        sender: Account calling `burn`
+    """
+    estimates = []
+    for burner in snapshot.burners:
+        for index, coin in enumerate(burner.coins):
+            amount = burner.to_burn(index)
+            if amount == 0:
+                continue
+            estimates.append(
+                BurnEstimate(
+                    f"burn {burner.name} {coin}",
+                    quoter.value(burner, index, amount),
+                    quoter.gas(burner, coin, sender),
+                )
+            )
+    return estimates
+
+
+def record_observation(
+    estimates: List[BurnEstimate],
+    burnt: Iterable[str],
+    gas_price: int,
+    matic_price: float,
+    path: Path = SERIES_PATH,
+) -> None:
+    """Append one run of the scheduler to a series, for use with `backtest`.
+
+    Args:
+        estimates: Burns which had a balance to burn
+        burnt: Labels of the burns which were run
+        gas_price: Gas price, in wei
+        matic_price: USDC price of one MATIC
+        path: JSON lines file to append to
+    """
+    burnt = set(burnt)
+    burns = {
+        i.label: {"value": None if math.isinf(i.value) else i.value, "gas": i.gas}
+        for i in estimates
+    }
+    for label in burns:
+        burns[label]["burnt"] = label in burnt
+    observation = {
+        "timestamp": int(time.time()),
+        "gas_price": gas_price,
+        "matic_price": matic_price,
+        "burns": burns,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as fp:
+        fp.write(json.dumps(observation, sort_keys=True) + "\n")
+
+
+def load_series(path: Path) -> List[dict]:
+    """Load a series written by `record_observation`."""
+    with Path(path).open() as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+class BacktestResult(NamedTuple):
+    margin: float
+    burns: int
+    value: float
+    gas_cost: float
+    # value left unburnt at the end of the series
+    pending: float
+
+    @property
+    def net(self) -> float:
+        return self.value - self.gas_cost
+
+
+def backtest(series: List[dict], margin: float) -> BacktestResult:
+    """Replay a recorded series, burning with `margin` instead of the recorded decisions.
+
+    The fees accrued by each burn between two observations are the difference in its
+    recorded value, or its whole value after a recorded burn. Burns which could not be
+    valued are skipped.
+    """
+    accrued_by: Dict[str, float] = {}
+    last_seen: Dict[str, Tuple[float, bool]] = {}
+    pending: Dict[str, float] = {}
+    gas: Dict[str, int] = {}
+    burns, value, cost = 0, 0.0, 0.0
+
+    for observation in series:
+        for label, burn in observation["burns"].items():
+            if burn["value"] is None:
+                continue
+            previous_value, was_burnt = last_seen.get(label, (0.0, True))
+            accrued_by[label] = max(burn["value"] - (0.0 if was_burnt else previous_value), 0.0)
+            last_seen[label] = (burn["value"], burn["burnt"])
+            gas[label] = burn["gas"]
+
+        estimates = []
+        for label, accrued in accrued_by.items():
+            pending[label] = pending.get(label, 0.0) + accrued
+            if pending[label] > 0:
+                estimates.append(BurnEstimate(label, pending[label], gas[label]))
+        accrued_by.clear()
+
+        run, _ = plan_burns(estimates, observation["gas_price"], observation["matic_price"], margin)
+        for estimate in run:
+            burns += 1
+            value += estimate.value
+            cost += gas_cost(estimate.gas, observation["gas_price"], observation["matic_price"])
+            pending[estimate.label] = 0.0
+
+    return BacktestResult(margin, burns, value, cost, sum(pending.values()))
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m scripts.burn_scheduler", description="Backtest burn margins."
+    )
+    parser.add_argument("series", help="JSON lines series written by `record_observation`")
+    parser.add_argument(
+        "--margin", type=float, nargs="+", default=[0, 1, 1.5, 2], help="margins to compare"
+    )
+    args = parser.parse_args(argv)
+
+    series = load_series(args.series)
+    print(f"{len(series)} observations\n")
+    print(f"{'margin':>8} {'burns':>6} {'value':>12} {'gas cost':>12} {'net':>12} {'pending':>12}")
+    for margin in args.margin:
+        result = backtest(series, margin)
+        print(
+            f"{result.margin:>8.2f} {result.burns:>6} {result.value:>12,.2f} "
+            f"{result.gas_cost:>12,.2f} {result.net:>12,.2f} {result.pending:>12,.2f}"
+        )
+
+
+if __name__ == "__main__":
+    cli()
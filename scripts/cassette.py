@@ -0,0 +1,141 @@
+"""Record and replay JSON-RPC traffic.
+
+A cassette holds every JSON-RPC call made during one run, keyed by network id and by
+method and params, in a gzipped JSON file. When recording, calls go to the network
+and their responses are saved. When replaying, responses are served from the
+cassette and nothing touches the network. Identical calls replay their recorded
+responses in order. Calls which were never recorded raise `CassetteMiss`.
+
+Both the web3 connection (`CassetteProvider`) and batched requests (`BatchRPC`) of a
+`Chain` go through the cassette. Batches are recorded call by call, so replay does
+not depend on how calls were grouped into batches.
+"""
+import gzip
+import json
+import threading
+from collections import defaultdict
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from web3.providers.base import JSONBaseProvider
+
+
+class CassetteMiss(Exception):
+    """Raised when replaying a call which is not in the cassette."""
+
+
+class Cassette:
+    """Recorded JSON-RPC responses, keyed by network id and call."""
+
+    def __init__(self, path: Path, record: bool):
+        """Open a cassette.
+
+        Args:
+            path: Location of the gzipped cassette file
+            record: If True make calls over the network and save them, otherwise
+                replay the existing cassette
+        """
+        self.path = Path(path)
+        self.record = record
+        self._lock = threading.Lock()
+        self._positions: Dict[tuple, int] = defaultdict(int)
+        self.interactions: Dict[str, Dict[str, List[Any]]] = defaultdict(dict)
+
+        if not record:
+            with gzip.open(self.path, "rt") as fp:
+                self.interactions.update(json.load(fp)["interactions"])
+
+    @classmethod
+    def open(cls, path: Path) -> "Cassette":
+        """Replay the cassette at `path` if it exists, otherwise record it."""
+        return cls(path, record=not Path(path).exists())
+
+    def save(self) -> None:
+        """Write the recorded calls, only required when recording."""
+        if not self.record:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "wt") as fp:
+            json.dump({"version": 1, "interactions": self.interactions}, fp, sort_keys=True)
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.save()
+
+    @staticmethod
+    def _key(call: dict) -> str:
+        return json.dumps([call["method"], call.get("params", [])], sort_keys=True)
+
+    def _play(self, network_id: str, call: dict) -> dict:
+        key = self._key(call)
+        responses = self.interactions[network_id].get(key)
+        if not responses:
+            raise CassetteMiss(f"{network_id}: {key} was not recorded")
+
+        with self._lock:
+            position = self._positions[(network_id, key)]
+            self._positions[(network_id, key)] += 1
+        # repeated calls replay in recorded order, then keep returning the last response
+        response = dict(responses[min(position, len(responses) - 1)])
+        response["id"] = call.get("id")
+        return response
+
+    def _store(self, network_id: str, call: dict, response: dict) -> None:
+        response = {k: v for k, v in response.items() if k != "id"}
+        with self._lock:
+            self.interactions[network_id].setdefault(self._key(call), []).append(response)
+
+    def post(self, network_id: str, payload: Any, send: Callable[[Any], Any]) -> Any:
+        """Make a single or batch JSON-RPC request through the cassette.
+
+        Args:
+            network_id: Brownie network id of the endpoint, used to namespace calls
+            payload: JSON-RPC request object, or list of request objects
+            send: Makes the request over the network, used when recording
+        """
+        if not self.record:
+            if isinstance(payload, list):
+                return [self._play(network_id, call) for call in payload]
+            return self._play(network_id, payload)
+
+        response = send(payload)
+        if isinstance(payload, list) and isinstance(response, list):
+            by_id = {i.get("id"): i for i in response}
+            for call in payload:
+                if call["id"] in by_id:
+                    self._store(network_id, call, by_id[call["id"]])
+        elif not isinstance(payload, list):
+            self._store(network_id, payload, response)
+        return response
+
+    def track(self, network_id: str) -> Callable[[Any, Callable[[Any], Any]], Any]:
+        """Return `post` bound to a network id, as accepted by `BatchRPC`."""
+        return partial(self.post, network_id)
+
+
+class CassetteProvider(JSONBaseProvider):
+    """Web3 provider recording to, or replaying from, a cassette."""
+
+    def __init__(self, cassette: Cassette, network_id: str, provider: JSONBaseProvider):
+        """Initialize the provider.
+
+        Args:
+            cassette: Cassette to record to or replay from
+            network_id: Brownie network id of the endpoint, used to namespace calls
+            provider: Provider used to make the calls when recording
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.post = cassette.track(network_id)
+        self.provider = provider
+
+    def make_request(self, method, params):
+        call = {"jsonrpc": "2.0", "id": 0, "method": method, "params": params}
+        return self.post(call, lambda _: self.provider.make_request(method, params))
+
+    def isConnected(self) -> bool:
+        return not self.cassette.record or self.provider.isConnected()
@@ -0,0 +1,148 @@
+"""Persistent connections to Ethereum and Polygon.
+
+Building an exit reads from both chains several times. Rather than tearing down and
+rebuilding brownie's single active connection on every switch, the proof builders are
+handed a `Chain` for each side, and both stay open for the life of the process.
+"""
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, NamedTuple, Tuple
+
+import yaml
+from web3 import Web3
+from web3.contract import Contract
+from web3.middleware import geth_poa_middleware
+
+from scripts.cassette import Cassette, CassetteProvider
+from scripts.instrumentation import rpc_middleware
+from scripts.leaf_cache import CACHE_DIR
+from scripts.rpc_batch import BatchRPC
+
+INTERFACES_DIR = Path(__file__).parent.parent.joinpath("interfaces")
+
+# brownie network configs, in order of precedence: the project's, then brownie's own
+NETWORK_CONFIG_PATHS = (
+    Path(__file__).parent.parent.joinpath("network-config.yaml"),
+    Path.home().joinpath(".brownie/network-config.yaml"),
+)
+
+# brownie network ids for each (environment, is_mainnet) pair
+NETWORK_IDS = {
+    ("ethereum", True): "mainnet",
+    ("ethereum", False): "goerli",
+    ("polygon", True): "polygon-main",
+    ("polygon", False): "polygon-testnet",
+}
+
+
+class Chain:
+    """A web3 connection to one chain, plus a batch RPC client for the same endpoint."""
+
+    def __init__(
+        self,
+        network_id: str,
+        endpoint_uri: str,
+        poa: bool = False,
+        cache_dir: Path = CACHE_DIR,
+        cassette: Cassette = None,
+    ):
+        """Open the connection.
+
+        Args:
+            network_id: Brownie network id, e.g. 'mainnet' or 'polygon-main'
+            endpoint_uri: HTTP(S) URI of the JSON-RPC endpoint
+            poa: If True, inject the POA middleware required to read Polygon blocks
+            cache_dir: Directory of the persistent caches of data read from this chain
+            cassette: If given, every request is recorded to or replayed from it
+        """
+        self.network_id = network_id
+        self.endpoint_uri = endpoint_uri
+        self.cache_dir = cache_dir
+
+        provider = Web3.HTTPProvider(endpoint_uri)
+        if cassette is not None:
+            provider = CassetteProvider(cassette, network_id, provider)
+        self.w3 = Web3(provider)
+        if poa:
+            self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        self.w3.middleware_onion.add(rpc_middleware)
+        self.rpc = BatchRPC(endpoint_uri, cassette=cassette and cassette.track(network_id))
+        self._contracts: Dict[Tuple[str, str], Contract] = {}
+
+    def contract(self, name: str, address: str) -> Contract:
+        """Return a web3 contract for `name` from the project interfaces.
+
+        Contracts are built on first use and reused for the life of the connection.
+        """
+        key = (name, address)
+        if key not in self._contracts:
+            self._contracts[key] = self.w3.eth.contract(address=address, abi=load_abi(name))
+        return self._contracts[key]
+
+    def __repr__(self) -> str:
+        return f"<Chain '{self.network_id}'>"
+
+
+class Chains(NamedTuple):
+    ethereum: Chain
+    polygon: Chain
+
+
+@lru_cache(maxsize=None)
+def load_abi(name: str) -> list:
+    """Load an ABI from the project `interfaces` folder."""
+    with INTERFACES_DIR.joinpath(f"{name}.json").open() as fp:
+        return json.load(fp)
+
+
+@lru_cache(maxsize=None)
+def _network_hosts(path: Path) -> Dict[str, str]:
+    """Read the host of each network in a brownie network config file."""
+    if not path.exists():
+        return {}
+    with path.open() as fp:
+        config = yaml.safe_load(fp) or {}
+
+    networks = [i for group in config.get("live", []) for i in group.get("networks", [])]
+    networks += config.get("development", [])
+    return {i["id"]: i["host"] for i in networks if "host" in i}
+
+
+def get_endpoint_uri(network_id: str) -> str:
+    """Get the RPC endpoint for a brownie network id.
+
+    The `<NETWORK_ID>_RPC_URI` environment variable takes precedence, e.g.
+    `POLYGON_MAIN_RPC_URI`. Otherwise the host is read from brownie's network config
+    files, which are parsed directly so that connecting never loads brownie.
+    """
+    env_var = network_id.upper().replace("-", "_") + "_RPC_URI"
+    if env_var in os.environ:
+        return os.environ[env_var]
+
+    for path in NETWORK_CONFIG_PATHS:
+        hosts = _network_hosts(path)
+        if network_id in hosts:
+            return os.path.expandvars(hosts[network_id])
+
+    raise KeyError(f"No host for network '{network_id}', set {env_var} or add it to brownie")
+
+
+@lru_cache(maxsize=None)
+def connect(
+    is_mainnet: bool = True, cache_dir: Path = CACHE_DIR, cassette: Cassette = None
+) -> Chains:
+    """Open (once per process) connections to Ethereum and Polygon.
+
+    Args:
+        is_mainnet: If True connect to the mainnets, otherwise to the testnets
+        cache_dir: Directory of the persistent caches of chain data
+        cassette: If given, every request is recorded to or replayed from it
+    """
+    ethereum_id = NETWORK_IDS[("ethereum", is_mainnet)]
+    polygon_id = NETWORK_IDS[("polygon", is_mainnet)]
+    return Chains(
+        ethereum=Chain(ethereum_id, get_endpoint_uri(ethereum_id), False, cache_dir, cassette),
+        polygon=Chain(polygon_id, get_endpoint_uri(polygon_id), True, cache_dir, cassette),
+    )
@@ -0,0 +1,152 @@
+"""Persistent index of the checkpoints submitted to RootChain.
+
+Every checkpoint is a header block covering an inclusive range of Polygon blocks.
+Header blocks are only ever appended, so the index is synced incrementally from the
+last id it holds, and looking up the checkpoint including a child block becomes a
+local bisect rather than a binary search of `RootChain.headerBlocks` over RPC.
+"""
+import bisect
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from hexbytes import HexBytes
+from tqdm import tqdm
+
+from scripts.chains import Chain
+from scripts.fetch_deployment_data import PROXY_DEPLOYMENT_ADDRS as ADDRS
+from scripts.leaf_cache import CACHE_DIR
+from scripts.multicall import multicall
+
+# header block ids are spaced by this, the ids in between are used for deposits
+CHECKPOINT_ID_INTERVAL = 10000
+
+# only checkpoints this many blocks deep are indexed, so a reorg can't invalidate them
+CONFIRMATIONS = 12
+
+
+class CheckpointIndex:
+    """SQLite backed index of header block id -> (start, end, root)."""
+
+    def __init__(self, path: Path):
+        """Open (or create) a checkpoint index.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path.as_posix(), check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS headers "
+                "(id INTEGER PRIMARY KEY, start INTEGER NOT NULL, end INTEGER NOT NULL, "
+                "root BLOB NOT NULL)"
+            )
+        self._headers = self.db.execute(
+            "SELECT id, start, end, root FROM headers ORDER BY id"
+        ).fetchall()
+        self._starts = [start for _, start, _, _ in self._headers]
+        self._sync_lock = threading.Lock()
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_network(cls, network_id: str, cache_dir: Path = CACHE_DIR) -> "CheckpointIndex":
+        """Open the index for a network, e.g. 'mainnet'.
+
+        The index is opened and loaded once per process for each network and cache
+        directory, later calls return the same index.
+        """
+        return cls(cache_dir.joinpath(f"{network_id}-checkpoints.sqlite"))
+
+    @property
+    def last_header_id(self) -> int:
+        """Id of the last indexed header block, 0 if the index is empty."""
+        return self._headers[-1][0] if self._headers else 0
+
+    @property
+    def last_child_block(self) -> int:
+        """Last Polygon block included in an indexed checkpoint."""
+        return self._headers[-1][2] if self._headers else 0
+
+    def find(self, child_block_number: int) -> Optional[Tuple[int, int, int]]:
+        """Find the indexed checkpoint including a Polygon block.
+
+        Returns:
+            (start, end, header block id) of the checkpoint, or None if the block is
+            not included in an indexed checkpoint
+        """
+        position = bisect.bisect_right(self._starts, child_block_number) - 1
+        if position < 0:
+            return None
+        header_id, start, end, _ = self._headers[position]
+        if child_block_number > end:
+            return None
+        return start, end, header_id
+
+    def get(self, header_id: int) -> Optional[Tuple[int, int, HexBytes]]:
+        """Return (start, end, block Merkle root) of an indexed header block, or None."""
+        row = self.db.execute(
+            "SELECT start, end, root FROM headers WHERE id = ?", (header_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        start, end, root = row
+        return start, end, HexBytes(root)
+
+    def put(self, headers: List[Tuple[int, int, int, bytes]]) -> None:
+        """Append (id, start, end, root) header blocks, following the last indexed id."""
+        headers = sorted(headers)
+        assert not headers or headers[0][0] > self.last_header_id, "Headers already indexed"
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO headers VALUES (?, ?, ?, ?)",
+                ((i, start, end, bytes(root)) for i, start, end, root in headers),
+            )
+        self._headers.extend(headers)
+        self._starts.extend(start for _, start, _, _ in headers)
+
+    def sync(self, ethereum: Chain, batch_size: int = 500) -> int:
+        """Index the confirmed header blocks submitted since the last sync.
+
+        Args:
+            ethereum: Connection to the chain the checkpoints are submitted to
+            batch_size: Maximum number of header blocks fetched per `eth_call`
+
+        Returns:
+            The number of newly indexed header blocks
+        """
+        # the index is shared between threads, and a sync must start from the last
+        # header block indexed by any earlier one
+        with self._sync_lock:
+            return self._sync(ethereum, batch_size)
+
+    def _sync(self, ethereum: Chain, batch_size: int) -> int:
+        root_chain_proxy_addr = ADDRS[ethereum.network_id]["RootChainProxy"]
+        root_chain = ethereum.contract("RootChain", root_chain_proxy_addr)
+        block_identifier = ethereum.w3.eth.block_number - CONFIRMATIONS
+
+        current_header_id = root_chain.functions.currentHeaderBlock().call(
+            block_identifier=block_identifier
+        )
+        header_ids = list(
+            range(
+                self.last_header_id + CHECKPOINT_ID_INTERVAL,
+                current_header_id + 1,
+                CHECKPOINT_ID_INTERVAL,
+            )
+        )
+
+        for i in tqdm(
+            range(0, len(header_ids), batch_size),
+            desc="Syncing checkpoints",
+            disable=len(header_ids) <= batch_size,
+        ):
+            batch = header_ids[i : i + batch_size]
+            calls = [(root_chain, "headerBlocks", (header_id,)) for header_id in batch]
+            results = multicall(ethereum, calls, batch_size, block_identifier)
+            # (root, start, end, createdAt, proposer)
+            self.put([(header_id, r[1], r[2], r[0]) for header_id, r in zip(batch, results)])
+
+        return len(header_ids)
@@ -0,0 +1,109 @@
+"""Watch RootChain checkpoints for any number of pending burns.
+
+Each burn's Polygon block number is read once, when it is added. Checkpoint progress
+is then followed through `NewHeaderBlock` logs, one `eth_getLogs` per poll however
+many burns are pending, and a callback fires for each burn as it becomes provable.
+"""
+import time
+from typing import Callable, Dict, List
+
+from scripts.chains import Chain
+from scripts.checkpoint_index import CONFIRMATIONS
+from scripts.fetch_deployment_data import PROXY_DEPLOYMENT_ADDRS as ADDRS
+
+# maximum block range of a single `eth_getLogs` request
+MAX_LOG_RANGE = 2000
+
+
+class CheckpointWatcher:
+    """Track pending burns until the checkpoint including them is submitted."""
+
+    def __init__(
+        self,
+        ethereum: Chain,
+        polygon: Chain = None,
+        callback: Callable[[str, int], None] = None,
+        root_chain_address: str = None,
+        confirmations: int = CONFIRMATIONS,
+    ):
+        """Start watching from the current (confirmed) Ethereum block.
+
+        Args:
+            ethereum: Connection to the chain the checkpoints are submitted to
+            polygon: Connection to the chain the burns are made on, only required
+                when burns are added without their block number
+            callback: Called with (burn tx hash, child block number) as each burn
+                becomes provable
+            root_chain_address: RootChain address, defaults to the deployed proxy
+            confirmations: Number of blocks a checkpoint must be buried under
+        """
+        if root_chain_address is None:
+            root_chain_address = ADDRS[ethereum.network_id]["RootChainProxy"]
+
+        self.ethereum = ethereum
+        self.polygon = polygon
+        self.callback = callback
+        self.confirmations = confirmations
+        self.root_chain = ethereum.contract("RootChain", root_chain_address)
+        self.pending: Dict[str, int] = {}
+
+        self.last_block = self._confirmed_block()
+        self.last_child_block = self.root_chain.functions.getLastChildBlock().call(
+            block_identifier=self.last_block
+        )
+
+    def _confirmed_block(self) -> int:
+        return max(self.ethereum.w3.eth.block_number - self.confirmations, 0)
+
+    def add(self, burn_tx_id: str, child_block_number: int = None) -> bool:
+        """Start tracking a burn.
+
+        Args:
+            burn_tx_id: Matic burn tx hash
+            child_block_number: Polygon block the burn was included in, fetched
+                if not given
+
+        Returns:
+            True if the burn was already provable, in which case the callback fires
+            immediately and the burn is not tracked
+        """
+        if child_block_number is None:
+            receipt = self.polygon.w3.eth.get_transaction_receipt(burn_tx_id)
+            child_block_number = receipt["blockNumber"]
+
+        self.pending[burn_tx_id] = child_block_number
+        return burn_tx_id in self._release()
+
+    def _release(self) -> List[str]:
+        released = [k for k, v in self.pending.items() if v <= self.last_child_block]
+        for burn_tx_id in released:
+            child_block_number = self.pending.pop(burn_tx_id)
+            if self.callback is not None:
+                self.callback(burn_tx_id, child_block_number)
+        return released
+
+    def poll(self) -> List[str]:
+        """Read checkpoints submitted since the last poll.
+
+        Returns:
+            The burns which became provable, in the order their callbacks fired
+        """
+        to_block = self._confirmed_block()
+        while self.last_block < to_block:
+            from_block = self.last_block + 1
+            end_block = min(to_block, self.last_block + MAX_LOG_RANGE)
+            logs = self.root_chain.events.NewHeaderBlock.getLogs(
+                fromBlock=from_block, toBlock=end_block
+            )
+            for log in logs:
+                self.last_child_block = max(self.last_child_block, log["args"]["end"])
+            self.last_block = end_block
+
+        return self._release()
+
+    def run(self, poll_interval: float = 15) -> None:
+        """Poll until every tracked burn has become provable."""
+        while self.pending:
+            self.poll()
+            if self.pending:
+                time.sleep(poll_interval)
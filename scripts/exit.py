@@ -21,23 +21,59 @@ Steps for successful withdrawl:
    `brownie run exit exit`
    - Do this in fork mode first ofcourse
 
+Both chains are read from directly over persistent connections (see `scripts.chains`),
+the RPC endpoints can be set with `MAINNET_RPC_URI` and `POLYGON_MAIN_RPC_URI`.
+
+Several burn txs can be exited in one run with `withdraw_assets_on_ethereum`, which
+builds each checkpoint merkle tree and receipts trie only once.
+
+Checking, building and watching exits does not need brownie, and starts faster from
+`python -m scripts.exit_cli` (see `--help`).
+
+The progress of each exit is kept in a job store (see `scripts.exit_jobs`), so running
+a failed withdrawal again resumes from the last completed stage. Calldata is verified
+before it is stored, and a burn whose calldata fails verification starts over.
+
 To test run: brownie run exit tester --network mainnet
+
+To test offline, record the RPC traffic of one run to a cassette and replay it after:
+    brownie run exit tester cassettes/exit-tester.json.gz --network development
+The first run records (and needs RPC access), later runs replay without the network.
 """
-import math
+import asyncio
+import json
 from datetime import datetime
-from functools import wraps
-from typing import List, Tuple
+from functools import lru_cache, partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Tuple
 
 import rlp
-from brownie import Contract, RootForwarder, accounts, chain, network, web3
-from brownie.project import get_loaded_projects
 from eth_utils import keccak
 from hexbytes import HexBytes
-from tqdm import tqdm, trange
-from trie import HexaryTrie
 from web3.types import BlockData, TxReceipt
 
+from scripts.cassette import Cassette
+from scripts.chains import Chain, Chains, connect, load_abi
+from scripts.checkpoint_index import CheckpointIndex
+from scripts.checkpoint_watcher import CheckpointWatcher
+from scripts.exit_jobs import (
+    BURNED,
+    CALLDATA_READY,
+    CHECKPOINTED,
+    EXIT_SENT,
+    FORWARDED,
+    INCLUSION_RESOLVED,
+    PROOFS_BUILT,
+    ExitJobs,
+)
+from scripts.exit_payload import InvalidExitPayload, burn_log_index, decode_payload, verify_payload
 from scripts.fetch_deployment_data import PROXY_DEPLOYMENT_ADDRS as ADDRS
+from scripts.instrumentation import phase, record_cache, write_report
+from scripts.leaf_cache import LeafCache
+from scripts.merkle import checkpoint_tree
+from scripts.receipts_trie import BulkTrie
+from scripts.rpc_batch import fetch_blocks, fetch_receipts
 
 PreparedLogs = List[Tuple[bytes, List[bytes], bytes]]
 PreparedReceipt = Tuple[bytes, int, bytes, PreparedLogs]
@@ -45,195 +81,125 @@ PreparedReceipt = Tuple[bytes, int, bytes, PreparedLogs]
 ADDRS["mainnet-fork"] = ADDRS["mainnet"]
 
 # MUST SET VARIABLES BEFORE BURNING ON MATIC
-MSG_SENDER = accounts.add()
 MATIC_ERC20_ASSET_ADDR = ""
 BURN_AMOUNT = 0
 
 # BURN TX HASH
 MATIC_BURN_TX_ID = ""
 
+# blocking stages run at once by the async exit pipeline
+MAX_CONCURRENT_STAGES = 4
+
+ROOT_FORWARDER = "0x4473243A61b5193670D1324872368d015081822f"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+# brownie contracts by (network id, name, address), see `brownie_contract`
+_brownie_contracts: Dict[Tuple[str, str, str], object] = {}
+
 
 def keccak256(value):
     """Thin wrapper around keccak function."""
     return HexBytes(keccak(value))
 
 
-def burn_asset_on_matic(asset=MATIC_ERC20_ASSET_ADDR, amount=BURN_AMOUNT, sender=MSG_SENDER):
-    """Burn an ERC20 asset on Matic Network"""
-    abi = get_loaded_projects()[0].interface.ChildERC20.abi
-    asset = Contract.from_abi("ChildERC20", asset, abi)
-
-    tx = asset.withdraw(amount, {"from": sender})
-    print("Burn transaction has been sent.")
-    print(f"Visit https://explorer-mainnet.maticvigil.com/tx/{tx.txid} for confirmation")
-
+@lru_cache(maxsize=None)
+def default_sender():
+    """Generate (once per process) the account used when no sender is given."""
+    from brownie import accounts
 
-def hot_swap_network(environment_name):
-    """Decorator for hot swapping the network connection.
+    return accounts.add()
 
-    There is probably a nicer way to do this but I'm lazy and this works.
-    This basically hot swaps to the network we want and then back to the
-    original network, useful for helper functions.
 
-    Since we are swapping between Ethereum and Matic in this script
-    it's neccessary to terminate the RPC and reconnect since Matic
-    uses POA ... that sounds about right I really don't know but it works :)
+def brownie_contract(name: str, address: str):
+    """Return a brownie contract for `name` from the project interfaces.
 
-    Args:
-        environment_name: A valid environment name found in `brownie networks list`
-            e.g. 'ethereum', 'polygon'
+    Contracts are built once per active network, and do not require the project to
+    be loaded.
     """
+    from brownie import Contract, network
 
-    def inner(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            initial_network_id = network.show_active()
-            is_mainnet = "main" in initial_network_id
-
-            if environment_name == "ethereum":
-                swap_network_id = "mainnet" if is_mainnet else "goerli"
-            elif environment_name == "polygon":
-                swap_network_id = "polygon-main" if is_mainnet else "polygon-testnet"
+    key = (network.show_active(), name, address)
+    if key not in _brownie_contracts:
+        _brownie_contracts[key] = Contract.from_abi(name, address, load_abi(name))
+    return _brownie_contracts[key]
 
-            if initial_network_id == swap_network_id:
-                return func(*args, **kwargs)
 
-            network.disconnect()
-            network.connect(swap_network_id)
+def root_chain(ethereum: Chain):
+    """Return the RootChain proxy contract of a chain."""
+    return ethereum.contract("RootChain", ADDRS[ethereum.network_id]["RootChainProxy"])
 
-            result = func(*args, **kwargs)
 
-            network.disconnect()
-            network.connect(initial_network_id)
+def root_chain_manager(ethereum: Chain):
+    """Return the RootChainManager proxy contract of a chain."""
+    return ethereum.contract(
+        "RootChainManager", ADDRS[ethereum.network_id]["RootChainManagerProxy"]
+    )
 
-            return result
 
-        return wrapper
+def burn_asset_on_matic(asset=MATIC_ERC20_ASSET_ADDR, amount=BURN_AMOUNT, sender=None):
+    """Burn an ERC20 asset on Matic Network"""
+    asset = brownie_contract("ChildERC20", asset)
 
-    return inner
+    tx = asset.withdraw(amount, {"from": sender or default_sender()})
+    print("Burn transaction has been sent.")
+    print(f"Visit https://explorer-mainnet.maticvigil.com/tx/{tx.txid} for confirmation")
 
 
-class MerkleTree:
-    """This is my poor but successful lvl 2 copy paste of a merkle tree."""
+def get_chains() -> Chains:
+    """Get persistent Ethereum and Polygon connections matching the active network."""
+    from brownie import network
 
-    def __init__(self, leaves: bytes):
-        """Initialize and recursively build the Merkle tree.
+    return connect("main" in network.show_active())
 
-        This is only used for building the block proof.
 
-        Args:
-            leaves: Serialized blocks
-        """
-        assert len(leaves) >= 1, "Atleast 1 leaf is needed"
-        tree_depth = math.ceil(math.log(len(leaves), 2))
-        assert tree_depth <= 20, "Depth must be 20 layers or less"
-
-        self.leaves = leaves + [HexBytes(0) * 32] * (2 ** tree_depth - len(leaves))
-        self.layers = [self.leaves]
-        self.create_hashes(self.leaves)
-
-    @property
-    def root(self) -> bytes:
-        """Get the tree root."""
-        return self.layers[-1][0]
-
-    def create_hashes(self, nodes: List[bytes]) -> None:
-        """Recursively build the layers of the tree."""
-        if len(nodes) == 1:
-            return
-
-        tree_level = []
-        for i in range(0, len(nodes), 2):
-            left, right = nodes[i : i + 2]
-            new_node = keccak256(left + right)
-            tree_level.append(new_node)
-
-        if len(nodes) % 2 == 1:
-            tree_level.append(nodes[-1])
-
-        self.layers.append(tree_level)
-        self.create_hashes(tree_level)
-
-    def get_proof(self, leaf: bytes) -> List[bytes]:
-        """Generate a proof for a leaf."""
-        index = self.leaves.index(leaf)
-
-        proof = []
-        sibling_index = None
-        for i in trange(len(self.layers) - 1, desc="Building merkle proof"):
-            if index % 2 == 0:
-                sibling_index = index + 1
-            else:
-                sibling_index = index - 1
-            index = index // 2
-            sibling_node = self.layers[i][sibling_index]
-            proof.append(sibling_node)
-
-        return proof
-
-
-@hot_swap_network("polygon")
-def fetch_burn_tx_data(burn_tx_id: str = MATIC_BURN_TX_ID):
+def fetch_burn_tx_data(burn_tx_id: str, polygon: Chain):
     """Fetch burn tx data."""
-    tx = web3.eth.get_transaction(burn_tx_id)
-    tx_receipt = web3.eth.get_transaction_receipt(burn_tx_id)
-    tx_block = chain[tx["blockNumber"]]
+    with phase("burn_tx_fetch"):
+        tx = polygon.w3.eth.get_transaction(burn_tx_id)
+        tx_receipt = polygon.w3.eth.get_transaction_receipt(burn_tx_id)
+        tx_block = polygon.w3.eth.get_block(tx["blockNumber"])
 
     return tx, tx_receipt, tx_block
 
 
-@hot_swap_network("ethereum")
-def is_burn_checkpointed(burn_tx_id: str = MATIC_BURN_TX_ID, silent: bool = False) -> bool:
+def is_burn_checkpointed(
+    burn_tx_id: str = MATIC_BURN_TX_ID, silent: bool = False, chains: Chains = None
+) -> bool:
     """Check a burn tx has been checkpointed on Ethereum mainnet."""
-    _, _, burn_tx_block = fetch_burn_tx_data(burn_tx_id)
-    root_chain_proxy_addr = ADDRS[network.show_active()]["RootChainProxy"]
-    abi = get_loaded_projects()[0].interface.RootChain.abi
-    root_chain = Contract.from_abi("RootChain", root_chain_proxy_addr, abi)
+    chains = chains or get_chains()
+    _, _, burn_tx_block = fetch_burn_tx_data(burn_tx_id, chains.polygon)
+    is_checkpointed = is_block_checkpointed(burn_tx_block["number"], chains.ethereum)
 
-    is_checkpointed = root_chain.getLastChildBlock() >= burn_tx_block["number"]
     if not silent:
         print(f"Has Burn TX been Checkpointed? {is_checkpointed}")
     return is_checkpointed
 
 
-@hot_swap_network("ethereum")
-def fetch_block_inclusion_data(child_block_number: int) -> dict:
-    """Fetch burn tx checkpoint block inclusion data.
-
-    Args:
-        child_block_number: The block number of the burn tx was included in on
-            the matic network
-    """
-    CHECKPOINT_ID_INTERVAL = 10000
+def is_block_checkpointed(child_block_number: int, ethereum: Chain) -> bool:
+    """Check a Polygon block has been checkpointed on Ethereum."""
+    # blocks covered by the local checkpoint index need no RPC call
+    checkpoint_index = CheckpointIndex.for_network(ethereum.network_id, ethereum.cache_dir)
+    if checkpoint_index.last_child_block >= child_block_number:
+        return True
 
-    root_chain_proxy_addr = ADDRS[network.show_active()]["RootChainProxy"]
-    abi = get_loaded_projects()[0].interface.RootChain.abi
-    root_chain = Contract.from_abi("RootChain", root_chain_proxy_addr, abi)
+    return root_chain(ethereum).functions.getLastChildBlock().call() >= child_block_number
 
-    start = 1
-    end = root_chain.currentHeaderBlock() // CHECKPOINT_ID_INTERVAL
 
-    header_block_number = None
-    while start <= end:
-        if start == end:
-            header_block_number = start
+def fetch_block_inclusion_data(child_block_number: int, ethereum: Chain) -> tuple:
+    """Fetch burn tx checkpoint block inclusion data.
 
-        middle = (start + end) // 2
-        header_block = root_chain.headerBlocks(middle * CHECKPOINT_ID_INTERVAL)
-        header_start = header_block["start"]
-        header_end = header_block["end"]
+    The checkpoint is looked up in the local checkpoint index, which is only synced
+    when the block is beyond the last indexed checkpoint.
 
-        if header_start <= child_block_number <= header_end:
-            header_block_number = middle
-            break
-        elif header_start > child_block_number:
-            # child block was checkpointed after
-            end = middle - 1
-        elif header_end < child_block_number:
-            # child block was checkpointed before
-            start = middle + 1
+    Args:
+        child_block_number: The block number of the burn tx was included in on
+            the matic network
+        ethereum: Connection to the chain the checkpoints are submitted to
 
-    return header_start, header_end, header_block_number * CHECKPOINT_ID_INTERVAL
+    Returns:
+        (start, end, header block id) of the checkpoint including the block
+    """
+    return fetch_block_inclusion_data_batch([child_block_number], ethereum)[child_block_number]
 
 
 def prepare_receipt(receipt: TxReceipt) -> PreparedReceipt:
@@ -286,61 +252,82 @@ def serialize_block(block: dict) -> bytes:
     return keccak256(block_number + timestamp + txs_root + receipts_root)
 
 
-@hot_swap_network("polygon")
-def build_block_proof(block_start: int, block_end: int, burn_tx_block_number: int) -> List[bytes]:
-    """Build a merkle proof for the burn tx block."""
+def fetch_checkpoint_leaves(block_start: int, block_end: int, polygon: Chain) -> List[bytes]:
+    """Fetch the serialized blocks of a checkpoint."""
 
-    checkpoint_blocks = (
-        chain[block_number]
-        for block_number in trange(
-            block_start, block_end + 1, desc="Serializing blocks", unit="block"
-        )
-    )
-    serialized_blocks = list(map(serialize_block, checkpoint_blocks))
+    with phase("block_serialization"):
+        # checkpointed blocks are final, so leaves are only ever computed once
+        leaf_cache = LeafCache.for_network(polygon.network_id, polygon.cache_dir)
+        missing_ranges = leaf_cache.missing_ranges(block_start, block_end)
+        misses = sum(end - start + 1 for start, end in missing_ranges)
+        record_cache(hits=block_end - block_start + 1 - misses, misses=misses)
+
+        for start, end in missing_ranges:
+            checkpoint_blocks = fetch_blocks(polygon.rpc, start, end, desc="Fetching blocks")
+            leaf_cache.put_range(start, list(map(serialize_block, checkpoint_blocks)))
 
-    burn_tx_serialized_block = serialized_blocks[burn_tx_block_number - block_start]
-    merkle_tree = MerkleTree(serialized_blocks)
+        return leaf_cache.get_range(block_start, block_end)
 
-    return merkle_tree.get_proof(burn_tx_serialized_block)
+
+def build_block_proof(
+    block_start: int, block_end: int, burn_tx_block_number: int, polygon: Chain
+) -> List[bytes]:
+    """Build a merkle proof for the burn tx block."""
+    merkle_tree = checkpoint_tree(
+        block_start, block_end, lambda: fetch_checkpoint_leaves(block_start, block_end, polygon)
+    )
+    return merkle_tree.get_proof(burn_tx_block_number - block_start)
 
 
-@hot_swap_network("polygon")
-def build_receipt_proof(burn_tx_receipt: TxReceipt, burn_tx_block: BlockData) -> List[bytes]:
-    """Build the burn_tx_receipt proof."""
+def build_receipts_trie(burn_tx_block: BlockData, polygon: Chain) -> BulkTrie:
+    """Build the receipts trie of the burn tx block."""
     state_sync_tx_hash = keccak256(
         b"matic-bor-receipt-" + burn_tx_block["number"].to_bytes(8, "big") + burn_tx_block["hash"]
     )
-    receipts_trie = HexaryTrie({})
-    receipts = (
-        web3.eth.get_transaction_receipt(tx)
-        for tx in tqdm(burn_tx_block["transactions"], desc="Building receipts trie", unit="receipt")
-        if tx != state_sync_tx_hash
-    )
-    for tx_receipt in receipts:
-        path = rlp.encode(tx_receipt["transactionIndex"])
-        receipts_trie[path] = serialize_receipt(tx_receipt)
+    tx_hashes = [tx for tx in burn_tx_block["transactions"] if tx != state_sync_tx_hash]
+    with phase("receipt_fetch"):
+        receipts = fetch_receipts(
+            polygon.rpc, burn_tx_block["number"], tx_hashes, desc="Fetching receipts"
+        )
 
-    key = rlp.encode(burn_tx_receipt["transactionIndex"])
-    print("Building merkle proof")
-    proof = receipts_trie.get_proof(key)
+    with phase("trie_build"):
+        receipts_trie = BulkTrie(
+            {rlp.encode(i["transactionIndex"]): serialize_receipt(i) for i in receipts}
+        )
 
     assert (
         receipts_trie.root_hash == burn_tx_block["receiptsRoot"]
     ), "Receipts trie root is incorrect"
 
+    return receipts_trie
+
+
+def build_receipt_proof(
+    burn_tx_receipt: TxReceipt,
+    burn_tx_block: BlockData,
+    polygon: Chain,
+    receipts_trie: BulkTrie = None,
+) -> List[bytes]:
+    """Build the burn_tx_receipt proof.
+
+    Args:
+        burn_tx_receipt: Receipt of the burn tx
+        burn_tx_block: Block the burn tx was included in
+        polygon: Connection to the chain the burn tx was made on
+        receipts_trie: Receipts trie of `burn_tx_block`, built if not given
+    """
+    if receipts_trie is None:
+        receipts_trie = build_receipts_trie(burn_tx_block, polygon)
+
+    key = rlp.encode(burn_tx_receipt["transactionIndex"])
+    proof = receipts_trie.get_proof(key)
+
     return key, proof
 
 
 def find_log_index(burn_tx_receipt: TxReceipt) -> int:
     """Retrieve the index of the burn event log."""
-    ERC20_TRANSFER_EVENT_SIG = keccak256(b"Transfer(address,address,uint256)")
-    for idx, log in enumerate(burn_tx_receipt["logs"]):
-        topics = log["topics"]
-        if topics[0] == ERC20_TRANSFER_EVENT_SIG and topics[2] == HexBytes(0) * 32:
-            return idx
-
-    # this should not be reached
-    raise Exception("Transfer Log Event Not Found in Burn Tx Receipt")
+    return burn_log_index([list(map(HexBytes, log["topics"])) for log in burn_tx_receipt["logs"]])
 
 
 def encode_payload(
@@ -356,30 +343,60 @@ def encode_payload(
     log_index: int,
 ) -> bytes:
     """RLP encode the data required to form the calldata for exiting."""
-    payload = [
-        header_block_number,
-        b"".join(block_proof),
-        block_number,
-        timestamp,
-        transactions_root,
-        receipts_root,
-        serialize_receipt(burn_tx_receipt),
-        rlp.encode(receipt_proof),
-        HexBytes(0) + path,
-        log_index,
-    ]
-    return rlp.encode(payload)
-
+    with phase("encoding"):
+        payload = [
+            header_block_number,
+            b"".join(block_proof),
+            block_number,
+            timestamp,
+            transactions_root,
+            receipts_root,
+            serialize_receipt(burn_tx_receipt),
+            rlp.encode(receipt_proof),
+            HexBytes(0) + path,
+            log_index,
+        ]
+        return rlp.encode(payload)
+
+
+def build_calldata(
+    burn_tx_id: str = MATIC_BURN_TX_ID, chains: Chains = None, jobs: ExitJobs = None
+) -> bytes:
+    """Generate the calldata required for withdrawing ERC20 asset on Ethereum.
 
-def build_calldata(burn_tx_id: str = MATIC_BURN_TX_ID) -> bytes:
-    """Generate the calldata required for withdrawing ERC20 asset on Ethereum."""
-    assert is_burn_checkpointed(burn_tx_id)
+    Args:
+        burn_tx_id: Matic burn tx hash
+        chains: Ethereum and Polygon connections, defaults to those of the active network
+        jobs: Store recording each completed stage, so a failed build resumes from the
+            last one. By default nothing is kept once the calldata is returned.
 
-    burn_tx, burn_tx_receipt, burn_tx_block = fetch_burn_tx_data(burn_tx_id)
-    log_index = find_log_index(burn_tx_receipt)
-    start, end, header_block_number = fetch_block_inclusion_data(burn_tx_block["number"])
-    block_proof = build_block_proof(start, end, burn_tx_block["number"])
-    path, receipt_proof = build_receipt_proof(burn_tx_receipt, burn_tx_block)
+    Raises:
+        InvalidExitPayload: If the calldata fails verification, the job is reset first
+    """
+    chains = chains or get_chains()
+    jobs = jobs or ExitJobs()
+    if jobs.reached(burn_tx_id, CALLDATA_READY):
+        return jobs.result(burn_tx_id, CALLDATA_READY)
+
+    if not jobs.reached(burn_tx_id, BURNED):
+        _, burn_tx_receipt, burn_tx_block = fetch_burn_tx_data(burn_tx_id, chains.polygon)
+        jobs.advance(burn_tx_id, BURNED, (burn_tx_receipt, burn_tx_block))
+    burn_tx_receipt, burn_tx_block = jobs.result(burn_tx_id, BURNED)
+
+    if not jobs.reached(burn_tx_id, CHECKPOINTED):
+        assert is_block_checkpointed(burn_tx_block["number"], chains.ethereum)
+        jobs.advance(burn_tx_id, CHECKPOINTED)
+
+    if not jobs.reached(burn_tx_id, INCLUSION_RESOLVED):
+        inclusion_data = fetch_block_inclusion_data(burn_tx_block["number"], chains.ethereum)
+        jobs.advance(burn_tx_id, INCLUSION_RESOLVED, inclusion_data)
+    start, end, header_block_number = jobs.result(burn_tx_id, INCLUSION_RESOLVED)
+
+    if not jobs.reached(burn_tx_id, PROOFS_BUILT):
+        block_proof = build_block_proof(start, end, burn_tx_block["number"], chains.polygon)
+        path, receipt_proof = build_receipt_proof(burn_tx_receipt, burn_tx_block, chains.polygon)
+        jobs.advance(burn_tx_id, PROOFS_BUILT, (block_proof, path, receipt_proof))
+    block_proof, path, receipt_proof = jobs.result(burn_tx_id, PROOFS_BUILT)
 
     calldata = encode_payload(
         header_block_number,
@@ -391,29 +408,350 @@ def build_calldata(burn_tx_id: str = MATIC_BURN_TX_ID) -> bytes:
         burn_tx_receipt,
         receipt_proof,
         path,
-        log_index,
+        find_log_index(burn_tx_receipt),
+    )
+    _verify_or_reset(burn_tx_id, calldata, chains.ethereum, jobs)
+    jobs.advance(burn_tx_id, CALLDATA_READY, calldata)
+    return calldata
+
+
+def _verify_or_reset(burn_tx_id: str, calldata: bytes, ethereum: Chain, jobs: ExitJobs) -> None:
+    # calldata is only stored once verified, and proofs which fail verification are
+    # dropped rather than read back by every later run
+    try:
+        verify_calldata(calldata, ethereum)
+    except InvalidExitPayload:
+        jobs.reset(burn_tx_id)
+        raise
+
+
+def fetch_block_inclusion_data_batch(
+    child_block_numbers: List[int], ethereum: Chain
+) -> Dict[int, tuple]:
+    """Fetch checkpoint inclusion data for many child blocks.
+
+    The checkpoint index is synced at most once, however many blocks are looked up.
+    """
+    with phase("inclusion_search"):
+        checkpoint_index = CheckpointIndex.for_network(ethereum.network_id, ethereum.cache_dir)
+        if max(child_block_numbers) > checkpoint_index.last_child_block:
+            record_cache(misses=len(child_block_numbers))
+            checkpoint_index.sync(ethereum)
+        else:
+            record_cache(hits=len(child_block_numbers))
+
+        inclusion_data = {i: checkpoint_index.find(i) for i in child_block_numbers}
+    not_checkpointed = [k for k, v in inclusion_data.items() if v is None]
+    assert not not_checkpointed, f"Blocks have not been checkpointed: {not_checkpointed}"
+
+    return inclusion_data
+
+
+def build_calldata_batch(
+    burn_tx_ids: List[str], chains: Chains = None, jobs: ExitJobs = None
+) -> Dict[str, bytes]:
+    """Generate the exit calldata for many burn txs at once.
+
+    Burns are grouped by checkpoint and by child block, so that each checkpoint
+    Merkle tree and each receipts trie is only built once.
+
+    Args:
+        burn_tx_ids: Matic burn tx hashes
+        chains: Ethereum and Polygon connections, defaults to those of the active network
+        jobs: Store recording the fetched burn txs and the calldata of each burn, so
+            a failed batch resumes with the burns that are not ready yet
+
+    Returns:
+        Mapping of burn tx hash to calldata
+
+    Raises:
+        InvalidExitPayload: If the calldata of a burn fails verification, its job is
+            reset first
+    """
+    chains = chains or get_chains()
+    jobs = jobs or ExitJobs()
+    calldata = {
+        i: jobs.result(i, CALLDATA_READY) for i in burn_tx_ids if jobs.reached(i, CALLDATA_READY)
+    }
+    pending = [i for i in burn_tx_ids if i not in calldata]
+    if not pending:
+        return calldata
+
+    for burn_tx_id in pending:
+        if not jobs.reached(burn_tx_id, BURNED):
+            _, burn_tx_receipt, burn_tx_block = fetch_burn_tx_data(burn_tx_id, chains.polygon)
+            jobs.advance(burn_tx_id, BURNED, (burn_tx_receipt, burn_tx_block))
+    burn_txs_data = [jobs.result(i, BURNED) for i in pending]
+    burn_tx_blocks = [burn_tx_block for _, burn_tx_block in burn_txs_data]
+
+    inclusion_data = fetch_block_inclusion_data_batch(
+        [i["number"] for i in burn_tx_blocks], chains.ethereum
+    )
+    # burns are ordered by checkpoint so each Merkle tree is built and used in turn
+    burn_txs_data = sorted(
+        zip(pending, burn_txs_data), key=lambda i: inclusion_data[i[1][1]["number"]]
     )
+
+    receipts_tries = {}
+    for block in burn_tx_blocks:
+        if block["number"] not in receipts_tries:
+            receipts_tries[block["number"]] = build_receipts_trie(block, chains.polygon)
+
+    for burn_tx_id, (burn_tx_receipt, burn_tx_block) in burn_txs_data:
+        start, end, header_block_number = inclusion_data[burn_tx_block["number"]]
+        block_proof = build_block_proof(start, end, burn_tx_block["number"], chains.polygon)
+        path, receipt_proof = build_receipt_proof(
+            burn_tx_receipt,
+            burn_tx_block,
+            chains.polygon,
+            receipts_tries[burn_tx_block["number"]],
+        )
+
+        calldata[burn_tx_id] = encode_payload(
+            header_block_number,
+            block_proof,
+            burn_tx_block["number"],
+            burn_tx_block["timestamp"],
+            burn_tx_block["transactionsRoot"],
+            burn_tx_block["receiptsRoot"],
+            burn_tx_receipt,
+            receipt_proof,
+            path,
+            find_log_index(burn_tx_receipt),
+        )
+        _verify_or_reset(burn_tx_id, calldata[burn_tx_id], chains.ethereum, jobs)
+        jobs.advance(burn_tx_id, CALLDATA_READY, calldata[burn_tx_id])
+
+    return {burn_tx_id: calldata[burn_tx_id] for burn_tx_id in burn_tx_ids}
+
+
+def verify_calldata(calldata: bytes, ethereum: Chain) -> None:
+    """Verify exit calldata offline, against the checkpoint in the local index.
+
+    Raises:
+        InvalidExitPayload: If the exit would be rejected by `RootChainManager.exit`
+    """
+    header_block_id = decode_payload(calldata).header_block_id
+    checkpoint = CheckpointIndex.for_network(ethereum.network_id, ethereum.cache_dir).get(
+        header_block_id
+    )
+    assert checkpoint is not None, f"Checkpoint {header_block_id} is not indexed"
+    checkpoint_start, _, checkpoint_root = checkpoint
+    verify_payload(calldata, checkpoint_start, checkpoint_root)
+
+
+async def build_calldata_batch_async(
+    burn_tx_ids: List[str], chains: Chains = None, max_concurrency: int = MAX_CONCURRENT_STAGES
+) -> Dict[str, bytes]:
+    """Generate the exit calldata for many burn txs, overlapping independent stages.
+
+    Once the burn blocks are known, the receipts tries are built (Polygon receipts)
+    while the checkpoints are looked up (Ethereum) and their Merkle trees built
+    (Polygon block ranges). The calldata is identical to that of `build_calldata`.
+
+    Args:
+        burn_tx_ids: Matic burn tx hashes
+        chains: Ethereum and Polygon connections, defaults to those of the active network
+        max_concurrency: Maximum number of blocking stages running at once
+
+    Returns:
+        Mapping of burn tx hash to calldata, each verified like that of `build_calldata`
+
+    Raises:
+        InvalidExitPayload: If the calldata of a burn fails verification
+    """
+    chains = chains or get_chains()
+    polygon = chains.polygon
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(func, *args):
+        async with semaphore:
+            return await loop.run_in_executor(None, func, *args)
+
+    def fetch_burn(burn_tx_id):
+        with phase("burn_tx_fetch"):
+            burn_tx_receipt = polygon.w3.eth.get_transaction_receipt(burn_tx_id)
+            burn_tx_block = polygon.w3.eth.get_block(burn_tx_receipt["blockNumber"])
+        return burn_tx_receipt, burn_tx_block
+
+    async def fetch_checkpoint_trees():
+        inclusion_data = await run(fetch_block_inclusion_data_batch, list(blocks), chains.ethereum)
+        checkpoints = list(set(inclusion_data.values()))
+        trees = await asyncio.gather(
+            *(
+                run(
+                    checkpoint_tree,
+                    start,
+                    end,
+                    partial(fetch_checkpoint_leaves, start, end, polygon),
+                )
+                for start, end, _ in checkpoints
+            )
+        )
+        return inclusion_data, dict(zip(checkpoints, trees))
+
+    async def build_receipts_tries():
+        tries = await asyncio.gather(
+            *(run(build_receipts_trie, block, polygon) for block in blocks.values())
+        )
+        return dict(zip(blocks, tries))
+
+    burns = dict(zip(burn_tx_ids, await asyncio.gather(*(run(fetch_burn, i) for i in burn_tx_ids))))
+    blocks = {burn_tx_block["number"]: burn_tx_block for _, burn_tx_block in burns.values()}
+
+    (inclusion_data, trees), receipts_tries = await asyncio.gather(
+        fetch_checkpoint_trees(), build_receipts_tries()
+    )
+
+    calldata = {}
+    for burn_tx_id, (burn_tx_receipt, burn_tx_block) in burns.items():
+        checkpoint = inclusion_data[burn_tx_block["number"]]
+        start, _, header_block_number = checkpoint
+        block_proof = trees[checkpoint].get_proof(burn_tx_block["number"] - start)
+        path, receipt_proof = build_receipt_proof(
+            burn_tx_receipt, burn_tx_block, polygon, receipts_tries[burn_tx_block["number"]]
+        )
+
+        calldata[burn_tx_id] = encode_payload(
+            header_block_number,
+            block_proof,
+            burn_tx_block["number"],
+            burn_tx_block["timestamp"],
+            burn_tx_block["transactionsRoot"],
+            burn_tx_block["receiptsRoot"],
+            burn_tx_receipt,
+            receipt_proof,
+            path,
+            find_log_index(burn_tx_receipt),
+        )
+
+    await asyncio.gather(*(run(verify_calldata, i, chains.ethereum) for i in calldata.values()))
     return calldata
 
 
-def withdraw_asset_on_ethereum(burn_tx_id: str = MATIC_BURN_TX_ID, sender=MSG_SENDER):
-    print("Building Calldata")
-    calldata = build_calldata(burn_tx_id)
-    fp = f"withdraw-calldata-{datetime.now().isoformat()}.txt"
-    with open(fp, "w") as f:
-        f.write(calldata.hex())
+async def build_calldata_async(burn_tx_id: str, chains: Chains = None) -> bytes:
+    """Async `build_calldata`, with the block and receipt proofs built concurrently."""
+    return (await build_calldata_batch_async([burn_tx_id], chains))[burn_tx_id]
+
+
+def get_exit_jobs(chains: Chains) -> ExitJobs:
+    """Open the exit job store of the active network.
+
+    Jobs are kept per brownie network, so exits sent on a fork are not mistaken for
+    exits sent on mainnet.
+    """
+    from brownie import network
+
+    return ExitJobs.for_network(network.show_active(), chains.ethereum.cache_dir)
+
+
+def forward_usdc(sender) -> str:
+    """Transfer the USDC out of the root receiver, returning the tx hash."""
+    from brownie import RootForwarder
+
+    root_receiver = RootForwarder.at(ROOT_FORWARDER)
+    tx = root_receiver.transfer(USDC, {"from": sender, "priority_fee": "2 gwei"})
+    return tx.txid
+
+
+def withdraw_asset_on_ethereum(burn_tx_id: str = MATIC_BURN_TX_ID, sender=None):
+    """Exit a burn tx, resuming from the last stage completed by an earlier run."""
+    sender = sender or default_sender()
+    chains = get_chains()
+    jobs = get_exit_jobs(chains)
+
+    if not jobs.reached(burn_tx_id, EXIT_SENT):
+        print("Building Calldata")
+        calldata = build_calldata(burn_tx_id, chains, jobs)
+        fp = f"withdraw-calldata-{datetime.now().isoformat()}.txt"
+        with open(fp, "w") as f:
+            f.write(calldata.hex())
+        print(f"Instrumentation report written to {write_report('exit')}")
 
-    root_chain_mgr_proxy_addr = ADDRS[network.show_active()]["RootChainManagerProxy"]
-    abi = get_loaded_projects()[0].interface.RootChainManager.abi
-    root_chain_mgr = Contract.from_abi("RootChainManager", root_chain_mgr_proxy_addr, abi)
+        root_chain_mgr = brownie_contract(
+            "RootChainManager", ADDRS[chains.ethereum.network_id]["RootChainManagerProxy"]
+        )
+
+        print("Calling Exit Function on Root Chain Manager")
+        tx = root_chain_mgr.exit(calldata, {"from": sender, "priority_fee": "2 gwei"})
+        jobs.advance(burn_tx_id, EXIT_SENT, tx.txid)
+
+    if not jobs.reached(burn_tx_id, FORWARDED):
+        jobs.advance(burn_tx_id, FORWARDED, forward_usdc(sender))
+
+
+def withdraw_assets_on_ethereum(burn_tx_ids: List[str], sender=None):
+    """Exit many burn txs, forwarding the USDC once they have all been withdrawn.
+
+    Burns whose exit was already sent by an earlier run are not exited again.
+    """
+    sender = sender or default_sender()
+    chains = get_chains()
+    jobs = get_exit_jobs(chains)
+    to_exit = [i for i in burn_tx_ids if not jobs.reached(i, EXIT_SENT)]
+
+    if to_exit:
+        print(f"Building Calldata for {len(to_exit)} burn txs")
+        calldata = build_calldata_batch(to_exit, chains, jobs)
+        fp = f"withdraw-calldata-{datetime.now().isoformat()}.json"
+        with open(fp, "w") as f:
+            json.dump({k: v.hex() for k, v in calldata.items()}, f, indent=2)
+        print(f"Instrumentation report written to {write_report('exit')}")
+
+        root_chain_mgr = brownie_contract(
+            "RootChainManager", ADDRS[chains.ethereum.network_id]["RootChainManagerProxy"]
+        )
+
+        for burn_tx_id, data in calldata.items():
+            print(f"Calling Exit Function on Root Chain Manager for {burn_tx_id}")
+            tx = root_chain_mgr.exit(data, {"from": sender, "priority_fee": "2 gwei"})
+            jobs.advance(burn_tx_id, EXIT_SENT, tx.txid)
+
+    to_forward = [i for i in burn_tx_ids if not jobs.reached(i, FORWARDED)]
+    if to_forward:
+        forward_tx_id = forward_usdc(sender)
+        for burn_tx_id in to_forward:
+            jobs.advance(burn_tx_id, FORWARDED, forward_tx_id)
 
-    print("Calling Exit Function on Root Chain Manager")
-    root_chain_mgr.exit(calldata, {"from": sender, "priority_fee": "2 gwei"})
 
-    # transfer USDC out of the root receiver
-    usdc = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
-    root_receiver = RootForwarder.at("0x4473243A61b5193670D1324872368d015081822f")
-    root_receiver.transfer(usdc, {"from": sender, "priority_fee": "2 gwei"})
+def watch_burns(
+    burn_tx_ids: List[str],
+    write_calldata: bool = False,
+    chains: Chains = None,
+    jobs: ExitJobs = None,
+):
+    """Wait for burn txs to be checkpointed, optionally writing their calldata when provable.
+
+    Args:
+        burn_tx_ids: Matic burn tx hashes
+        write_calldata: If True build and write the calldata of each checkpointed burn
+        chains: Ethereum and Polygon connections, defaults to those of the active network
+        jobs: Store the calldata is recorded in, defaults to that of the active network
+    """
+    chains = chains or get_chains()
+    jobs = jobs or get_exit_jobs(chains)
+
+    def on_checkpointed(burn_tx_id: str, child_block_number: int):
+        print(f"Tx {burn_tx_id} has been checkpointed (child block {child_block_number})")
+        if write_calldata:
+            calldata = build_calldata(burn_tx_id, chains, jobs)
+            with open(f"withdraw-calldata-{burn_tx_id}.txt", "w") as f:
+                f.write(calldata.hex())
+
+    watcher = CheckpointWatcher(chains.ethereum, chains.polygon, on_checkpointed)
+    for burn_tx_id in burn_tx_ids:
+        watcher.add(burn_tx_id)
+    watcher.run()
+
+
+def choose_sender():
+    """Ask whether to load an account, generating one otherwise."""
+    from brownie import accounts
+
+    if input("Do you want to load an account? [y/N] ") == "y":
+        return accounts.load(input("Account name: "))
+    return default_sender()
 
 
 def main():
@@ -423,7 +761,8 @@ def main():
 Choose an option:
 (1) Burn an asset on Matic
 (2) Withdraw an asset on Ethereum
-(3) Check burn tx checkpoint
+(3) Wait for burn txs to be checkpointed
+(4) Withdraw several assets on Ethereum
 Choice: """
     )
     try:
@@ -434,59 +773,99 @@ Choice: """
     if route == 1:
         asset = input("Input token to burn on matic: ")
         amount = int(input("Input amount of token to burn: "))
-        sender = (
-            accounts.load(input("Account name: "))
-            if input("Do you want to load an account? [y/N] ") == "y"
-            else MSG_SENDER
-        )
+        sender = choose_sender()
         burn_asset_on_matic(asset, amount, sender)
     elif route == 2:
         burn_tx_hash = input("Input matic burn tx hash: ")
-        sender = (
-            accounts.load(input("Account name: "))
-            if input("Do you want to load an account? [y/N] ") == "y"
-            else MSG_SENDER
-        )
+        sender = choose_sender()
         withdraw_asset_on_ethereum(burn_tx_hash, sender)
     elif route == 3:
-        burn_tx_hash = input("Enter burn tx hash: ")
-        bar_fmt = "Blocks Mined: {n} blocks - Time Elapsed: {elapsed}"
-        for block in tqdm(chain.new_blocks(1), bar_format=bar_fmt):
-            if is_burn_checkpointed(burn_tx_hash, True):
-                print(f"Tx {burn_tx_hash} has been checkpointed in block {block['number']}")
-                break
+        burn_tx_hashes = input("Enter comma-separated burn tx hashes: ")
+        burn_tx_hashes = [i.strip() for i in burn_tx_hashes.split(",") if i.strip()]
+        write_calldata = input("Write the calldata once checkpointed? [y/N] ") == "y"
+        watch_burns(burn_tx_hashes, write_calldata)
+    elif route == 4:
+        burn_tx_hashes = input("Input comma-separated matic burn tx hashes: ")
+        burn_tx_hashes = [i.strip() for i in burn_tx_hashes.split(",") if i.strip()]
+        sender = choose_sender()
+        withdraw_assets_on_ethereum(burn_tx_hashes, sender)
 
 
-def test_calldata(burn_tx: str, exit_tx: str):
-    print(f"Testing Burn TX: {burn_tx}")
+def encode_exit_input(calldata: bytes, ethereum: Chain) -> HexBytes:
+    """Encode the input of a `RootChainManager.exit` call."""
+    return HexBytes(root_chain_manager(ethereum).encodeABI(fn_name="exit", args=[calldata]))
+
 
-    root_chain_mgr_proxy_addr = ADDRS[network.show_active()]["RootChainManagerProxy"]
-    abi = get_loaded_projects()[0].interface.RootChainManager.abi
-    root_chain_mgr = Contract.from_abi("RootChainManager", root_chain_mgr_proxy_addr, abi)
+def test_calldata(burn_tx: str, exit_tx: str, chains: Chains):
+    print(f"Testing Burn TX: {burn_tx}")
 
-    calldata = HexBytes(root_chain_mgr.exit.encode_input(build_calldata(burn_tx)))
-    input_data = HexBytes(web3.eth.get_transaction(exit_tx)["input"])
+    calldata = encode_exit_input(build_calldata(burn_tx, chains), chains.ethereum)
+    input_data = HexBytes(chains.ethereum.w3.eth.get_transaction(exit_tx)["input"])
 
     assert calldata == input_data
     print("Test passed")
 
 
-def tester():
-    # (burn_tx, exit_tx)
-    test_txs = [
-        (
-            "0x4486e398e0f2ca4d00bec85edbb9aff94e7085fa2b5ef18319989d9d8e37152f",
-            "0x6fe5d2638e7bdbf598c215c6d20b6bf2cad58479460091c0f2330506c14762bf",
-        ),
-        (
-            "0xbcaafea9bed5c31dc2472a015afca6463a5de14730a3a6ab4501475c0594cfc4",
-            "0x1afcfe324fcfa0fbf54182524e74fc57ff8ddff58367529af519adbaccc13f7a",
-        ),
-        (
-            "0x7d17b4cfbab16739bf00cead6ffec306f7420ec5c91de4ac1d485b7de9efaf49",
-            "0xfed6fc9558d45b0672fe9ff23d341d028d99f71a318feabf925f0d1b67eea503",
-        ),
-    ]
+def test_calldata_batch(test_txs: List[Tuple[str, str]], chains: Chains):
+    print(f"Testing {len(test_txs)} Burn TXs as a batch")
+
+    calldata = build_calldata_batch([burn_tx for burn_tx, _ in test_txs], chains)
+    for burn_tx, exit_tx in test_txs:
+        input_data = HexBytes(chains.ethereum.w3.eth.get_transaction(exit_tx)["input"])
+        assert encode_exit_input(calldata[burn_tx], chains.ethereum) == input_data
+    print("Test passed")
+
+
+def test_calldata_async(test_txs: List[Tuple[str, str]], chains: Chains):
+    print(f"Testing {len(test_txs)} Burn TXs with the async pipeline")
+
+    burn_txs = [burn_tx for burn_tx, _ in test_txs]
+    calldata = asyncio.run(build_calldata_batch_async(burn_txs, chains))
+    for burn_tx, exit_tx in test_txs:
+        input_data = HexBytes(chains.ethereum.w3.eth.get_transaction(exit_tx)["input"])
+        assert encode_exit_input(calldata[burn_tx], chains.ethereum) == input_data
+        assert calldata[burn_tx] == build_calldata(burn_tx, chains)
+    print("Test passed")
+
+
+def tester(cassette_path: str = None):
+    """Check the calldata of historical mainnet exits.
+
+    Args:
+        cassette_path: If given, RPC traffic is replayed from this cassette, or recorded
+            to it if it does not exist yet. Caches start empty, so that a replay makes
+            exactly the requests which were recorded.
+    """
+    if cassette_path is None:
+        _run_tester(connect(is_mainnet=True))
+        return
+
+    with Cassette.open(cassette_path) as cassette, TemporaryDirectory() as cache_dir:
+        print(f"{'Recording' if cassette.record else 'Replaying'} RPC cassette {cassette_path}")
+        _run_tester(connect(True, Path(cache_dir), cassette))
+
+
+# (burn_tx, exit_tx) of historical mainnet exits
+TEST_TXS = [
+    (
+        "0x4486e398e0f2ca4d00bec85edbb9aff94e7085fa2b5ef18319989d9d8e37152f",
+        "0x6fe5d2638e7bdbf598c215c6d20b6bf2cad58479460091c0f2330506c14762bf",
+    ),
+    (
+        "0xbcaafea9bed5c31dc2472a015afca6463a5de14730a3a6ab4501475c0594cfc4",
+        "0x1afcfe324fcfa0fbf54182524e74fc57ff8ddff58367529af519adbaccc13f7a",
+    ),
+    (
+        "0x7d17b4cfbab16739bf00cead6ffec306f7420ec5c91de4ac1d485b7de9efaf49",
+        "0xfed6fc9558d45b0672fe9ff23d341d028d99f71a318feabf925f0d1b67eea503",
+    ),
+]
+
+
+def _run_tester(chains: Chains, test_txs: List[Tuple[str, str]] = TEST_TXS):
     for burn_tx, exit_tx in test_txs:
-        test_calldata(burn_tx, exit_tx)
+        test_calldata(burn_tx, exit_tx, chains)
+    test_calldata_batch(test_txs, chains)
+    test_calldata_async(test_txs, chains)
     print("All works as expected.")
+    print(f"Instrumentation report written to {write_report('exit-tester')}")
@@ -0,0 +1,103 @@
+"""Command line interface for the read-only parts of an exit.
+
+`brownie run exit` loads the whole project and connects brownie before anything
+happens, which is only needed to send transactions. These commands talk to both
+chains directly (see `scripts.chains`) and start without brownie:
+
+    python -m scripts.exit_cli checkpointed <burn tx>...
+    python -m scripts.exit_cli calldata <burn tx>... [-o calldata.json]
+    python -m scripts.exit_cli watch <burn tx>... [--write-calldata]
+    python -m scripts.exit_cli jobs
+
+Calldata is recorded in the exit job store of the Ethereum network, so a later
+`withdraw_asset_on_ethereum` on that network only has to send the exit.
+"""
+import argparse
+import json
+from typing import List
+
+from scripts.cassette import Cassette
+from scripts.chains import Chains, connect
+from scripts.exit import build_calldata_batch, is_burn_checkpointed, verify_calldata, watch_burns
+from scripts.exit_jobs import ExitJobs
+
+
+def _chains(args: argparse.Namespace) -> Chains:
+    return connect(not args.testnet, cassette=args.cassette)
+
+
+def _jobs(chains: Chains) -> ExitJobs:
+    return ExitJobs.for_network(chains.ethereum.network_id, chains.ethereum.cache_dir)
+
+
+def checkpointed(args: argparse.Namespace) -> None:
+    chains = _chains(args)
+    for burn_tx_id in args.burn_tx_ids:
+        print(f"{burn_tx_id}: {is_burn_checkpointed(burn_tx_id, True, chains)}")
+
+
+def calldata(args: argparse.Namespace) -> None:
+    chains = _chains(args)
+    result = build_calldata_batch(args.burn_tx_ids, chains, _jobs(chains))
+    for data in result.values():
+        verify_calldata(data, chains.ethereum)
+
+    output = json.dumps({k: v.hex() for k, v in result.items()}, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w") as fp:
+            fp.write(output)
+
+
+def watch(args: argparse.Namespace) -> None:
+    chains = _chains(args)
+    watch_burns(args.burn_tx_ids, args.write_calldata, chains, _jobs(chains))
+
+
+def jobs(args: argparse.Namespace) -> None:
+    # only reads the local store, no connection is opened
+    network_id = "goerli" if args.testnet else "mainnet"
+    for burn_tx_id, stage in ExitJobs.for_network(network_id).jobs():
+        print(f"{burn_tx_id} {stage}")
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scripts.exit_cli", description=__doc__)
+    parser.add_argument("--testnet", action="store_true", help="use goerli and mumbai")
+    parser.add_argument("--cassette", help="record RPC traffic to, or replay it from, this file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("checkpointed", help="check burn txs have been checkpointed")
+    command.add_argument("burn_tx_ids", nargs="+")
+    command.set_defaults(func=checkpointed)
+
+    command = commands.add_parser("calldata", help="build and verify the exit calldata")
+    command.add_argument("burn_tx_ids", nargs="+")
+    command.add_argument("-o", "--output", help="write the calldata JSON here")
+    command.set_defaults(func=calldata)
+
+    command = commands.add_parser("watch", help="wait for burn txs to be checkpointed")
+    command.add_argument("burn_tx_ids", nargs="+")
+    command.add_argument("--write-calldata", action="store_true")
+    command.set_defaults(func=watch)
+
+    command = commands.add_parser("jobs", help="list the exit jobs and their last stage")
+    command.set_defaults(func=jobs)
+
+    return parser.parse_args(argv)
+
+
+def cli(argv: List[str] = None) -> None:
+    args = parse_args(argv)
+    if args.cassette is None:
+        args.func(args)
+        return
+
+    with Cassette.open(args.cassette) as cassette:
+        args.cassette = cassette
+        args.func(args)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,139 @@
+"""Persistent state of exit jobs, so an interrupted exit resumes where it stopped.
+
+Each burn tx moves through the stages in `STAGES`. When a stage finishes, its result
+(e.g. the checkpoint inclusion data, or the proofs) is stored alongside the new state
+in a single transaction. After a crash, completed stages are read back instead of
+being fetched and computed again, and the exit and forwarding txs are never sent
+twice for a burn which already recorded them.
+
+Results are pickled, the store must only be shared with trusted processes.
+"""
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from scripts.leaf_cache import CACHE_DIR
+
+BURNED = "burned"
+CHECKPOINTED = "checkpointed"
+INCLUSION_RESOLVED = "inclusion_resolved"
+PROOFS_BUILT = "proofs_built"
+CALLDATA_READY = "calldata_ready"
+EXIT_SENT = "exit_sent"
+FORWARDED = "forwarded"
+
+# stages of an exit, in the order they are completed
+STAGES = (
+    BURNED,
+    CHECKPOINTED,
+    INCLUSION_RESOLVED,
+    PROOFS_BUILT,
+    CALLDATA_READY,
+    EXIT_SENT,
+    FORWARDED,
+)
+
+
+class ExitJobs:
+    """SQLite backed mapping of burn tx -> last completed stage and stage results."""
+
+    def __init__(self, path: Path = None):
+        """Open (or create) an exit job store.
+
+        Args:
+            path: Location of the SQLite database file, if not given the store is
+                kept in memory and lasts only as long as this object
+        """
+        if path is None:
+            self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(path.as_posix(), check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs "
+                "(burn_tx_id TEXT PRIMARY KEY, stage TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results (burn_tx_id TEXT NOT NULL, "
+                "stage TEXT NOT NULL, result BLOB NOT NULL, PRIMARY KEY (burn_tx_id, stage))"
+            )
+
+    @classmethod
+    def for_network(cls, network_id: str, cache_dir: Path = CACHE_DIR) -> "ExitJobs":
+        """Open the store of exits made on a network, e.g. 'mainnet'."""
+        return cls(cache_dir.joinpath(f"{network_id}-exit-jobs.sqlite"))
+
+    @staticmethod
+    def _key(burn_tx_id: str) -> str:
+        return burn_tx_id.lower()
+
+    def stage(self, burn_tx_id: str) -> Optional[str]:
+        """Return the last completed stage of a burn tx, or None if it is unknown."""
+        row = self.db.execute(
+            "SELECT stage FROM jobs WHERE burn_tx_id = ?", (self._key(burn_tx_id),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def reached(self, burn_tx_id: str, stage: str) -> bool:
+        """Check if a burn tx has completed `stage`."""
+        current = self.stage(burn_tx_id)
+        return current is not None and STAGES.index(current) >= STAGES.index(stage)
+
+    def result(self, burn_tx_id: str, stage: str) -> Any:
+        """Return the result stored when a burn tx completed `stage`, or None."""
+        row = self.db.execute(
+            "SELECT result FROM results WHERE burn_tx_id = ? AND stage = ?",
+            (self._key(burn_tx_id), stage),
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def advance(self, burn_tx_id: str, stage: str, result: Any = None) -> None:
+        """Record that a burn tx has completed `stage`.
+
+        Stages may be skipped, e.g. when a batch goes straight to the calldata, but a
+        job never moves back to an earlier stage.
+
+        Args:
+            burn_tx_id: Matic burn tx hash
+            stage: The completed stage, one of `STAGES`
+            result: Value to return from `result` for this stage, if any
+        """
+        current = self.stage(burn_tx_id)
+        assert current is None or STAGES.index(stage) > STAGES.index(
+            current
+        ), f"{burn_tx_id} has already completed {current}"
+
+        key = self._key(burn_tx_id)
+        with self.db:
+            if result is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (key, stage, pickle.dumps(result)),
+                )
+            self.db.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)", (key, stage, time.time())
+            )
+
+    def reset(self, burn_tx_id: str) -> None:
+        """Forget a burn tx and all its stage results, so it is built again from scratch.
+
+        Used when the stored results turn out to be wrong, e.g. proofs that fail to
+        verify, which would otherwise be read back on every later run.
+        """
+        key = self._key(burn_tx_id)
+        with self.db:
+            self.db.execute("DELETE FROM results WHERE burn_tx_id = ?", (key,))
+            self.db.execute("DELETE FROM jobs WHERE burn_tx_id = ?", (key,))
+
+    def jobs(self, stage: str = None) -> List[Tuple[str, str]]:
+        """Return (burn tx id, last completed stage) of all jobs, or only of those at `stage`."""
+        if stage is None:
+            return self.db.execute(
+                "SELECT burn_tx_id, stage FROM jobs ORDER BY updated_at"
+            ).fetchall()
+        return self.db.execute(
+            "SELECT burn_tx_id, stage FROM jobs WHERE stage = ? ORDER BY updated_at", (stage,)
+        ).fetchall()
@@ -0,0 +1,130 @@
+"""Decode and verify exit payloads before they are submitted.
+
+`RootChainManager.exit` reverts if any part of the payload built by `encode_payload`
+is wrong, after the transaction has already cost gas. `verify_payload` repeats the
+checks made on chain, in pure Python and without RPC:
+
+* the block proof leads from the burn block to the checkpoint root
+* the receipt proof leads from `receiptsRoot` to the burn receipt
+* the log index points at the burn (ERC20 transfer to the zero address) event
+"""
+from typing import List, NamedTuple, Sequence
+
+import rlp
+from eth_hash.auto import keccak
+from eth_utils import big_endian_to_int
+from hexbytes import HexBytes
+
+from scripts.merkle import proof_root
+from scripts.receipts_trie import verify_proof
+
+ERC20_TRANSFER_EVENT_SIG = keccak(b"Transfer(address,address,uint256)")
+
+
+class InvalidExitPayload(Exception):
+    """Raised when an exit payload would be rejected by `RootChainManager.exit`."""
+
+
+class ExitPayload(NamedTuple):
+    header_block_id: int
+    block_proof: List[bytes]
+    block_number: int
+    timestamp: int
+    transactions_root: bytes
+    receipts_root: bytes
+    receipt: bytes
+    receipt_proof: List[list]
+    path: bytes
+    log_index: int
+
+
+def burn_log_index(logs_topics: Sequence[Sequence[bytes]]) -> int:
+    """Return the index of the burn event, given the topics of each log in a receipt."""
+    for idx, topics in enumerate(logs_topics):
+        if topics[0] == ERC20_TRANSFER_EVENT_SIG and topics[2] == HexBytes(0) * 32:
+            return idx
+
+    # this should not be reached
+    raise Exception("Transfer Log Event Not Found in Burn Tx Receipt")
+
+
+def decode_payload(payload: bytes) -> ExitPayload:
+    """Decode a payload built by `encode_payload`."""
+    try:
+        fields = rlp.decode(bytes(payload))
+        assert len(fields) == 10
+        assert len(fields[1]) % 32 == 0
+        return ExitPayload(
+            header_block_id=big_endian_to_int(fields[0]),
+            block_proof=[fields[1][i : i + 32] for i in range(0, len(fields[1]), 32)],
+            block_number=big_endian_to_int(fields[2]),
+            timestamp=big_endian_to_int(fields[3]),
+            transactions_root=fields[4],
+            receipts_root=fields[5],
+            receipt=fields[6],
+            receipt_proof=rlp.decode(fields[7]),
+            # the path is prefixed with a zero byte by `encode_payload`
+            path=fields[8][1:],
+            log_index=big_endian_to_int(fields[9]),
+        )
+    except (rlp.DecodingError, AssertionError, TypeError, IndexError) as exc:
+        raise InvalidExitPayload(f"Malformed payload: {exc!r}") from exc
+
+
+def decode_receipt_logs(receipt: bytes) -> List[list]:
+    """Decode the (address, topics, data) logs of a receipt serialized by `serialize_receipt`."""
+    if receipt[0] >= 0xC0:
+        decoded = rlp.decode(receipt)
+    else:
+        # EIP-2718 typed receipt, possibly wrapped as an RLP string
+        typed = rlp.decode(receipt) if receipt[0] >= 0x80 else receipt
+        decoded = rlp.decode(typed[1:])
+    return decoded[3]
+
+
+def verify_payload(payload: bytes, checkpoint_start: int, checkpoint_root: bytes) -> ExitPayload:
+    """Verify an exit payload against the checkpoint including the burn block.
+
+    Args:
+        payload: Payload built by `encode_payload`
+        checkpoint_start: First child block of the checkpoint `header_block_id`
+        checkpoint_root: Block Merkle root of the checkpoint `header_block_id`
+
+    Returns:
+        The decoded payload
+
+    Raises:
+        InvalidExitPayload: If any of the proofs fail
+    """
+    exit_payload = decode_payload(payload)
+
+    leaf = keccak(
+        exit_payload.block_number.to_bytes(32, "big")
+        + exit_payload.timestamp.to_bytes(32, "big")
+        + exit_payload.transactions_root
+        + exit_payload.receipts_root
+    )
+    index = exit_payload.block_number - checkpoint_start
+    if index < 0 or index >= 2 ** len(exit_payload.block_proof):
+        raise InvalidExitPayload("Burn block is outside of the checkpoint")
+    if proof_root(leaf, index, exit_payload.block_proof) != HexBytes(checkpoint_root):
+        raise InvalidExitPayload("Block proof does not lead to the checkpoint root")
+
+    try:
+        value = verify_proof(
+            exit_payload.receipts_root, exit_payload.path, exit_payload.receipt_proof
+        )
+    except ValueError as exc:
+        raise InvalidExitPayload(f"Invalid receipt proof: {exc}") from exc
+    if value != exit_payload.receipt:
+        raise InvalidExitPayload("Receipt proof does not lead to the burn receipt")
+
+    logs = decode_receipt_logs(exit_payload.receipt)
+    try:
+        log_index = burn_log_index([topics for _, topics, _ in logs])
+    except Exception as exc:
+        raise InvalidExitPayload(str(exc)) from exc
+    if log_index != exit_payload.log_index:
+        raise InvalidExitPayload(f"Log index {exit_payload.log_index} is not the burn event")
+
+    return exit_payload
@@ -0,0 +1,104 @@
+"""Snapshot of the fees waiting to be burnt, read in a single `eth_call`.
+
+For every configured burner this collects the coins and `admin_balances` of its
+pool, and the balance of each coin held by the burner (and optionally by the account
+calling `burn`), along with the USDC balance of the bridge. Every read is aggregated
+into one Multicall3 call, so all values are from the same block.
+
+Balances are uint256 and can overflow fixed width arrays, so they are kept as tuples
+of Python ints, one per coin in the order of the burner's coins.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+from scripts.burn_config import BurnConfig, load_burn_config
+from scripts.chains import Chain
+from scripts.multicall import MULTICALL3, multicall
+
+
+class BurnerSnapshot(NamedTuple):
+    name: str
+    burner: str
+    pool: Optional[str]
+    coins: Tuple[str, ...]
+    # empty for burners which are not fed by a pool
+    admin_balances: Tuple[int, ...]
+    burner_balances: Tuple[int, ...]
+    # empty unless a holder was given
+    holder_balances: Tuple[int, ...]
+
+    def to_burn(self, i: int) -> int:
+        """Amount of the `i`th coin a call to `burn` would move."""
+        return self.burner_balances[i] + (self.holder_balances[i] if self.holder_balances else 0)
+
+
+class FeeSnapshot(NamedTuple):
+    block_number: int
+    burners: Tuple[BurnerSnapshot, ...]
+    bridge_balance: int
+
+    def burner(self, name: str) -> BurnerSnapshot:
+        """Return the snapshot of the burner named `name` in the burn config."""
+        return next(i for i in self.burners if i.name == name)
+
+
+def take_snapshot(polygon: Chain, holder: str = None, config: BurnConfig = None) -> FeeSnapshot:
+    """Read the fees waiting to be burnt in one `eth_call`.
+
+    Args:
+        polygon: Connection to the chain the pools and burners are deployed on
+        holder: Account calling `burn`, whose coin balances are also burnt
+        config: Burners to snapshot, by default those of `contracts/burners/burndata.json`
+
+    Returns:
+        The snapshot, as of the latest block
+    """
+    config = config or load_burn_config()
+
+    calls: List[tuple] = [(polygon.contract("Multicall3", MULTICALL3), "getBlockNumber", ())]
+    for burner in config.burners:
+        if burner.pool is not None:
+            swap = polygon.contract("StableSwap", burner.pool)
+            calls += [(swap, "coins", (i,)) for i in range(len(burner.coins))]
+            calls += [(swap, "admin_balances", (i,)) for i in range(len(burner.coins))]
+        for coin in burner.coins:
+            # only `balanceOf` is used, which every coin shares with BridgeToken
+            token = polygon.contract("BridgeToken", coin)
+            calls.append((token, "balanceOf", (burner.address,)))
+            if holder is not None:
+                calls.append((token, "balanceOf", (holder,)))
+    bridge_coin = polygon.contract("BridgeToken", config.bridge_coin)
+    calls.append((bridge_coin, "balanceOf", (config.bridge,)))
+
+    results = iter(multicall(polygon, calls, batch_size=len(calls)))
+    block_number = next(results)
+
+    burners = []
+    for burner in config.burners:
+        n_coins = len(burner.coins)
+        coins, admin_balances = tuple(burner.coins), ()
+        if burner.pool is not None:
+            coins = tuple(next(results) for _ in range(n_coins))
+            admin_balances = tuple(next(results) for _ in range(n_coins))
+            assert [i.lower() for i in coins] == [
+                i.lower() for i in burner.coins
+            ], f"Coins of {burner.pool} do not match its pooldata"
+
+        balances = [next(results) for _ in range(n_coins * (1 if holder is None else 2))]
+        if holder is None:
+            burner_balances, holder_balances = tuple(balances), ()
+        else:
+            burner_balances, holder_balances = tuple(balances[::2]), tuple(balances[1::2])
+
+        burners.append(
+            BurnerSnapshot(
+                burner.name,
+                burner.address,
+                burner.pool,
+                coins,
+                admin_balances,
+                burner_balances,
+                holder_balances,
+            )
+        )
+
+    return FeeSnapshot(block_number, tuple(burners), next(results))
@@ -1,12 +1,30 @@
-"""Fetch Matic Network contract deployment data."""
+"""Fetch Matic Network contract deployment data.
+
+Deployment data rarely changes, so it is cached on disk with the `ETag` and
+`Last-Modified` headers it was served with. Within `DEFAULT_TTL` of the last fetch
+the cached copy is used without touching the network. Once stale it is revalidated
+with a conditional request, which only downloads the data again if it changed. Each
+(network, version) is also memoized in process, and parsed only when first read.
+"""
 import json
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import requests
 
+from scripts.leaf_cache import CACHE_DIR
+
 # Endpoint for retrieving matic data
 DATA_URI = "https://static.matic.network/network/{network}/{version}/index.json"
 
+# seconds a fetched copy is used before it is revalidated
+DEFAULT_TTL = 24 * 60 * 60
+
+# seconds to wait on the endpoint, a stale copy is used if it can't be reached
+REQUEST_TIMEOUT = 10
+
 
 # Hard coded values for permanent proxy addresses
 PROXY_DEPLOYMENT_ADDRS = {
@@ -21,26 +39,151 @@ PROXY_DEPLOYMENT_ADDRS = {
 }
 
 
-def fetch_deployment_data(network: str, version: str, force_fetch: bool = True) -> dict:
+class DeploymentData:
+    """Deployment data as served by the endpoint, parsed on first access."""
+
+    def __init__(self, body: bytes, fetched_at: float, etag: str = None, last_modified: str = None):
+        """Initialize the data.
+
+        Args:
+            body: Raw JSON response body
+            fetched_at: Unix time the body was last fetched or revalidated
+            etag: `ETag` header the body was served with
+            last_modified: `Last-Modified` header the body was served with
+        """
+        self.body = body
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self._data: Optional[dict] = None
+
+    @property
+    def data(self) -> dict:
+        """The parsed deployment data."""
+        if self._data is None:
+            self._data = json.loads(self.body)
+        return self._data
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Check the data was fetched or revalidated within the last `ttl` seconds."""
+        return time.time() - self.fetched_at < ttl
+
+
+class DeploymentDataLoader:
+    """Loads deployment data, from memory, the disk cache, or the endpoint."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, uri: str = DATA_URI):
+        """Initialize the loader.
+
+        Args:
+            cache_dir: Directory the fetched data and its headers are cached in
+            uri: Endpoint, formatted with the network and version
+        """
+        self.cache_dir = cache_dir
+        self.uri = uri
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple[str, str], DeploymentData] = {}
+
+    def _paths(self, network: str, version: str) -> Tuple[Path, Path]:
+        name = f"{network}-{version}-deployment"
+        return self.cache_dir.joinpath(f"{name}.json"), self.cache_dir.joinpath(f"{name}.meta.json")
+
+    def _read_cache(self, network: str, version: str) -> Optional[DeploymentData]:
+        body_path, meta_path = self._paths(network, version)
+        try:
+            with meta_path.open() as fp:
+                meta = json.load(fp)
+            return DeploymentData(body_path.read_bytes(), **meta)
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def _write_cache(self, network: str, version: str, deployment: DeploymentData) -> None:
+        body_path, meta_path = self._paths(network, version)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        body_path.write_bytes(deployment.body)
+        meta = {
+            "fetched_at": deployment.fetched_at,
+            "etag": deployment.etag,
+            "last_modified": deployment.last_modified,
+        }
+        # the metadata is written last, so it never describes a partially written body
+        with meta_path.open("w") as fp:
+            json.dump(meta, fp)
+
+    def _fetch(
+        self, network: str, version: str, cached: Optional[DeploymentData]
+    ) -> DeploymentData:
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            response = requests.get(
+                self.uri.format(network=network, version=version),
+                headers=headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException:
+            if cached is None:
+                raise
+            print("Could not revalidate matic deployment data, using the cached copy")
+            return cached
+
+        if response.status_code == 304:
+            deployment = DeploymentData(cached.body, time.time(), cached.etag, cached.last_modified)
+        else:
+            deployment = DeploymentData(
+                response.content,
+                time.time(),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        self._write_cache(network, version, deployment)
+        return deployment
+
+    def load(self, network: str, version: str, ttl: float = DEFAULT_TTL) -> DeploymentData:
+        """Load deployment data, only making a request if the cached copy is stale.
+
+        Args:
+            network: The network name of interest, e.g. 'mainnet' or 'testnet'
+            version: The network version of interest e.g. 'v1' or 'mumbai'
+            ttl: Seconds since the last fetch within which no request is made, 0
+                always revalidates
+        """
+        key = (network, version)
+        with self._lock:
+            deployment = self._memo.get(key) or self._read_cache(network, version)
+            if deployment is None or not deployment.is_fresh(ttl):
+                deployment = self._fetch(network, version, deployment)
+            self._memo[key] = deployment
+        return deployment
+
+
+loader = DeploymentDataLoader()
+
+
+def load_deployment_data(network: str, version: str, ttl: float = DEFAULT_TTL) -> dict:
+    """Load matic deployment data, from the cache if it was fetched within `ttl` seconds."""
+    return loader.load(network, version, ttl).data
+
+
+def fetch_deployment_data(network: str, version: str, force_fetch: bool = False) -> dict:
     """Fetch matic deployment data with the side effect of writing to disk.
 
     Args:
         network: The network name of interest, e.g. 'mainnet' or 'testnet'
         version: The network version of interest e.g. 'v1' or 'mumbai'
+        force_fetch: If True revalidate the data and rewrite the file, even if the
+            cached copy is fresh
     """
     path = Path(__file__).parent.parent.joinpath(f"{network}-{version}.json")
-
-    if not force_fetch and path.exists():
-        try:
-            with path.open() as fp:
-                return json.load(fp)
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-
-    print("Fetching matic deployment data...")
-
-    URL = DATA_URI.format(network=network, version=version)
-    data = requests.get(URL).json()
+    data = load_deployment_data(network, version, 0 if force_fetch else DEFAULT_TTL)
+    if path.exists() and not force_fetch:
+        return data
 
     with path.open("w") as fp:
         json.dump(data, fp, sort_keys=True, indent=2)
@@ -50,4 +193,4 @@ def fetch_deployment_data(network: str, version: str, force_fetch: bool = True)
 
 
 def main():
-    return fetch_deployment_data("mainnet", "v1")
+    return fetch_deployment_data("mainnet", "v1", force_fetch=True)
@@ -0,0 +1,192 @@
+"""Per-phase timing, RPC and cache instrumentation for the exit and burn scripts.
+
+Code is split into named phases with `phase`. For each phase we record the wall time,
+the JSON-RPC calls and HTTP requests made, the bytes sent and received, and cache
+hits and misses. RPC usage and cache lookups are attributed to the innermost phase
+active in the calling thread. Worker threads join their caller's phase with
+`within`. Wall time is inclusive of nested phases, and concurrent phases overlap.
+
+The report is written as JSON, and optionally in the Prometheus text format for the
+node_exporter textfile collector.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator
+
+# records made outside of any phase
+NO_PHASE = "other"
+
+# environment variable holding the path to write the Prometheus text report to
+PROMETHEUS_FILE_ENV_VAR = "INSTRUMENTATION_PROMETHEUS_FILE"
+
+# statistic -> (prometheus metric, description)
+METRICS = {
+    "runs": ("curve_phase_runs_total", "Number of times the phase was entered"),
+    "wall_time": ("curve_phase_wall_seconds_total", "Wall time spent in the phase"),
+    "rpc_calls": ("curve_phase_rpc_calls_total", "JSON-RPC calls, counting each in a batch"),
+    "http_requests": ("curve_phase_http_requests_total", "HTTP requests to RPC endpoints"),
+    "bytes_sent": ("curve_phase_rpc_sent_bytes_total", "Bytes of JSON-RPC requests sent"),
+    "bytes_received": ("curve_phase_rpc_received_bytes_total", "Bytes of JSON-RPC responses"),
+    "cache_hits": ("curve_phase_cache_hits_total", "Lookups answered from a local cache"),
+    "cache_misses": ("curve_phase_cache_misses_total", "Lookups fetched or computed instead"),
+}
+
+
+class Instrumentation:
+    """Thread-safe accumulator of per-phase statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started_at = datetime.now()
+        self.stats: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current_phase(self) -> str:
+        """Return the innermost phase active in this thread."""
+        stack = self._stack()
+        return stack[-1] if stack else NO_PHASE
+
+    def _add(self, phase_name: str, **values: float) -> None:
+        with self._lock:
+            stats = self.stats[phase_name]
+            for key, value in values.items():
+                stats[key] += value
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase, attributing records made within it in this thread to `name`."""
+        stack = self._stack()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._add(name, runs=1, wall_time=time.perf_counter() - start)
+
+    @contextmanager
+    def within(self, name: str) -> Iterator[None]:
+        """Attribute records made in this thread to `name`, without timing it."""
+        stack = self._stack()
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def record_rpc(self, calls: int, bytes_sent: int, bytes_received: int) -> None:
+        """Record one HTTP request carrying `calls` JSON-RPC calls."""
+        self._add(
+            self.current_phase(),
+            rpc_calls=calls,
+            http_requests=1,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+        )
+
+    def record_cache(self, hits: int = 0, misses: int = 0) -> None:
+        """Record cache lookups."""
+        self._add(self.current_phase(), cache_hits=hits, cache_misses=misses)
+
+    def reset(self) -> None:
+        """Discard all statistics recorded so far."""
+        with self._lock:
+            self.stats.clear()
+            self.started_at = datetime.now()
+
+    def report(self, name: str) -> Dict[str, Any]:
+        """Return the statistics of each phase, and their totals, as a JSON-able dict."""
+        with self._lock:
+            phases = {k: dict(v) for k, v in sorted(self.stats.items())}
+        totals = {key: sum(i[key] for i in phases.values()) for key in METRICS}
+        # phases nest, so the summed wall time would double count
+        del totals["wall_time"]
+        return {
+            "name": name,
+            "started_at": self.started_at.isoformat(),
+            "phases": phases,
+            "totals": totals,
+        }
+
+    def to_prometheus(self, name: str) -> str:
+        """Format the per-phase statistics in the Prometheus text exposition format."""
+        phases = self.report(name)["phases"]
+        lines = []
+        for key, (metric, description) in METRICS.items():
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for phase_name, stats in phases.items():
+                labels = f'script="{name}",phase="{phase_name}"'
+                lines.append(f"{metric}{{{labels}}} {stats[key]}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, name: str, path: str = None) -> str:
+        """Write the JSON report, and the Prometheus report if configured.
+
+        Args:
+            name: Name of the instrumented script, e.g. 'exit'
+            path: JSON report path, by default `<name>-report-<timestamp>.json`
+
+        Returns:
+            The path of the JSON report
+        """
+        path = path or f"{name}-report-{datetime.now().isoformat()}.json"
+        with open(path, "w") as fp:
+            json.dump(self.report(name), fp, indent=2)
+
+        prometheus_path = os.environ.get(PROMETHEUS_FILE_ENV_VAR)
+        if prometheus_path:
+            # write then rename, so the collector never reads a partial file
+            with open(f"{prometheus_path}.tmp", "w") as fp:
+                fp.write(self.to_prometheus(name))
+            os.replace(f"{prometheus_path}.tmp", prometheus_path)
+
+        return path
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if hasattr(value, "items"):
+        return dict(value)
+    return str(value)
+
+
+def rpc_middleware(make_request: Callable, w3) -> Callable:
+    """Web3 middleware recording each request in the default instrumentation.
+
+    Provider bodies are not exposed to middlewares, so sizes are measured on the JSON
+    encoding of the params and the response.
+    """
+
+    def middleware(method, params):
+        response = make_request(method, params)
+        request = {"jsonrpc": "2.0", "method": method, "params": params, "id": 0}
+        instrumentation.record_rpc(
+            1,
+            len(json.dumps(request, default=_json_default)),
+            len(json.dumps(response, default=_json_default)),
+        )
+        return response
+
+    return middleware
+
+
+instrumentation = Instrumentation()
+
+phase = instrumentation.phase
+current_phase = instrumentation.current_phase
+within = instrumentation.within
+record_rpc = instrumentation.record_rpc
+record_cache = instrumentation.record_cache
+write_report = instrumentation.write_report
@@ -0,0 +1,94 @@
+"""Persistent store of serialized checkpoint leaves.
+
+Each leaf is the 32 byte `serialize_block` hash of a Polygon block. Blocks included
+in a checkpoint are final, so once a leaf has been computed it never needs to be
+fetched or hashed again. Leaves are kept in SQLite keyed by block number, alongside a
+table of the contiguous block ranges which are present.
+"""
+import sqlite3
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from hexbytes import HexBytes
+
+CACHE_DIR = Path(__file__).parent.parent.joinpath("cache")
+
+
+class LeafCache:
+    """SQLite backed mapping of block number -> serialized block leaf."""
+
+    def __init__(self, path: Path):
+        """Open (or create) a leaf cache.
+
+        Args:
+            path: Location of the SQLite database file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path.as_posix(), check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS leaves "
+                "(number INTEGER PRIMARY KEY, leaf BLOB NOT NULL)"
+            )
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS ranges "
+                "(start INTEGER PRIMARY KEY, end INTEGER NOT NULL)"
+            )
+
+    @classmethod
+    def for_network(cls, network_id: str, cache_dir: Path = CACHE_DIR) -> "LeafCache":
+        """Open the cache for a network, e.g. 'polygon-main'."""
+        return cls(cache_dir.joinpath(f"{network_id}-leaves.sqlite"))
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Return the inclusive block ranges present in the cache."""
+        return self.db.execute("SELECT start, end FROM ranges ORDER BY start").fetchall()
+
+    def missing_ranges(self, block_start: int, block_end: int) -> List[Tuple[int, int]]:
+        """Return the inclusive sub-ranges of `block_start..block_end` not yet cached."""
+        present = self.db.execute(
+            "SELECT start, end FROM ranges WHERE start <= ? AND end >= ? ORDER BY start",
+            (block_end, block_start),
+        ).fetchall()
+
+        missing = []
+        cursor = block_start
+        for start, end in present:
+            if start > cursor:
+                missing.append((cursor, start - 1))
+            cursor = max(cursor, end + 1)
+        if cursor <= block_end:
+            missing.append((cursor, block_end))
+        return missing
+
+    def put_range(self, block_start: int, leaves: Sequence[bytes]) -> None:
+        """Store the leaves of a contiguous block range starting at `block_start`."""
+        if not leaves:
+            return
+        block_end = block_start + len(leaves) - 1
+
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO leaves VALUES (?, ?)",
+                ((block_start + i, bytes(leaf)) for i, leaf in enumerate(leaves)),
+            )
+            # merge the new range with any overlapping or adjacent ranges
+            touching = self.db.execute(
+                "SELECT start, end FROM ranges WHERE start <= ? AND end >= ?",
+                (block_end + 1, block_start - 1),
+            ).fetchall()
+            merged_start = min([block_start] + [start for start, _ in touching])
+            merged_end = max([block_end] + [end for _, end in touching])
+            self.db.executemany(
+                "DELETE FROM ranges WHERE start = ?", [(start,) for start, _ in touching]
+            )
+            self.db.execute("INSERT INTO ranges VALUES (?, ?)", (merged_start, merged_end))
+
+    def get_range(self, block_start: int, block_end: int) -> List[HexBytes]:
+        """Return the leaves for an inclusive block range, ordered by block number."""
+        assert not self.missing_ranges(block_start, block_end), "Range is not fully cached"
+        rows = self.db.execute(
+            "SELECT leaf FROM leaves WHERE number BETWEEN ? AND ? ORDER BY number",
+            (block_start, block_end),
+        )
+        return [HexBytes(leaf) for (leaf,) in rows]
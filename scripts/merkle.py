@@ -0,0 +1,110 @@
+"""Binary Merkle tree used for checkpoint block proofs."""
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Sequence, Tuple
+
+from eth_hash.auto import keccak
+from hexbytes import HexBytes
+
+from scripts.instrumentation import phase, record_cache
+
+# number of built checkpoint trees kept in memory
+MAX_CACHED_TREES = 8
+
+_checkpoint_trees: "OrderedDict[Tuple[int, int], MerkleTree]" = OrderedDict()
+# trees are built from executor threads by the async exit pipeline
+_checkpoint_trees_lock = threading.Lock()
+
+
+class MerkleTree:
+    """Merkle tree with each layer stored in a single contiguous buffer.
+
+    The leaves are padded with zero bytes up to the next power of two. Subtrees made
+    entirely of padding hash to a known value per layer, so they are never rehashed.
+    """
+
+    def __init__(self, leaves: Sequence[bytes]):
+        """Initialize and iteratively build the Merkle tree.
+
+        This is only used for building the block proof.
+
+        Args:
+            leaves: Serialized blocks
+        """
+        assert len(leaves) >= 1, "Atleast 1 leaf is needed"
+        tree_depth = (len(leaves) - 1).bit_length()
+        assert tree_depth <= 20, "Depth must be 20 layers or less"
+
+        self.leaf_count = len(leaves)
+        layer = bytearray(b"".join(leaves))
+        self.layers = [layer]
+
+        padding = bytes(32)
+        for _ in range(tree_depth):
+            if len(layer) % 64:
+                # odd number of nodes, the sibling is the root of an all padding subtree
+                layer += padding
+            layer = bytearray(b"".join(keccak(layer[i : i + 64]) for i in range(0, len(layer), 64)))
+            self.layers.append(layer)
+            padding = keccak(padding + padding)
+
+    @property
+    def root(self) -> bytes:
+        """Get the tree root."""
+        return HexBytes(self.layers[-1][:32])
+
+    def get_proof(self, index: int) -> List[bytes]:
+        """Generate a proof for the leaf at `index`."""
+        assert 0 <= index < self.leaf_count, "Leaf index out of range"
+
+        proof = []
+        for layer in self.layers[:-1]:
+            sibling_index = index ^ 1
+            proof.append(HexBytes(layer[sibling_index * 32 : sibling_index * 32 + 32]))
+            index //= 2
+
+        return proof
+
+
+def proof_root(leaf: bytes, index: int, proof: Sequence[bytes]) -> bytes:
+    """Compute the root a `get_proof` proof leads to from the leaf at `index`."""
+    node = bytes(leaf)
+    for sibling in proof:
+        node = keccak(node + sibling) if index % 2 == 0 else keccak(sibling + node)
+        index //= 2
+    return HexBytes(node)
+
+
+def checkpoint_tree(
+    block_start: int, block_end: int, build_leaves: Callable[[], Sequence[bytes]]
+) -> MerkleTree:
+    """Return the Merkle tree for a checkpoint, building it at most once.
+
+    Several burns in the same checkpoint share a tree, so built trees are kept in a
+    small in-memory LRU cache keyed by the checkpoint block range.
+
+    Args:
+        block_start: First child block in the checkpoint
+        block_end: Last child block in the checkpoint
+        build_leaves: Called on a cache miss to get the serialized checkpoint blocks
+    """
+    key = (block_start, block_end)
+    with _checkpoint_trees_lock:
+        tree = _checkpoint_trees.get(key)
+        if tree is not None:
+            _checkpoint_trees.move_to_end(key)
+    if tree is not None:
+        record_cache(hits=1)
+        return tree
+
+    record_cache(misses=1)
+    # fetching the leaves is timed by its own phases, only hashing counts here
+    leaves = build_leaves()
+    with phase("merkle_build"):
+        tree = MerkleTree(leaves)
+
+    with _checkpoint_trees_lock:
+        _checkpoint_trees[key] = tree
+        if len(_checkpoint_trees) > MAX_CACHED_TREES:
+            _checkpoint_trees.popitem(last=False)
+    return tree
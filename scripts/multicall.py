@@ -0,0 +1,47 @@
+"""Batch many contract reads into a single `eth_call` with Multicall3."""
+from typing import Any, List, Sequence, Tuple, Union
+
+from eth_utils.abi import collapse_if_tuple
+
+from scripts.chains import Chain
+
+# deployed at the same address on Ethereum, Polygon and their testnets
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+
+def multicall(
+    chain: Chain,
+    calls: Sequence[Tuple[Any, str, Sequence]],
+    batch_size: int = 500,
+    block_identifier: Union[int, str] = "latest",
+) -> List[Any]:
+    """Call many view functions, `batch_size` calls per `eth_call`.
+
+    Args:
+        chain: Connection to the chain the contracts are deployed on
+        calls: (web3 contract, function name, args) of each call
+        batch_size: Maximum number of calls aggregated in one `eth_call`
+        block_identifier: Block to call at, the same block is used for every batch
+
+    Returns:
+        The return values of each call in order, decoded as `ContractFunction.call` does
+    """
+    multicall3 = chain.contract("Multicall3", MULTICALL3)
+
+    results = []
+    for i in range(0, len(calls), batch_size):
+        batch = calls[i : i + batch_size]
+        call_data = [
+            (contract.address, False, contract.encodeABI(fn_name=fn_name, args=args))
+            for contract, fn_name, args in batch
+        ]
+        return_data = multicall3.functions.aggregate3(call_data).call(
+            block_identifier=block_identifier
+        )
+        for (contract, fn_name, _), (_, data) in zip(batch, return_data):
+            abi = contract.get_function_by_name(fn_name).abi
+            output_types = [collapse_if_tuple(output) for output in abi["outputs"]]
+            decoded = chain.w3.codec.decode_abi(output_types, data)
+            results.append(decoded[0] if len(decoded) == 1 else decoded)
+
+    return results
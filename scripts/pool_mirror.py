@@ -0,0 +1,282 @@
+"""Local mirror of StableSwap pool state, kept current from the pools' logs.
+
+The state of each pool is read once with a multicall, then every pool event is
+applied to it exactly as the contract changes its storage, so quoting the mirror is
+as fresh as the last `eth_getLogs` rather than requiring a call per view function.
+
+Events do not capture everything:
+
+* aToken balances accrue interest without any pool event
+* `donate_admin_fees` and `_claim_rewards` emit nothing
+* `_A` during a ramp depends on the timestamp of the block an exchange is in
+
+so the mirror is reconciled against a fresh multicall every `reconcile_interval`
+blocks, and immediately after any event whose outcome it failed to reproduce.
+
+Every block with events gets its own version of the state. The last
+`rollback_depth` blocks of versions are kept, and when the hash of the newest
+version no longer matches the chain, versions are dropped until one does.
+"""
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+
+from scripts.chains import Chain
+from scripts.stableswap.invariant import (
+    FEE_DENOMINATOR,
+    Revert,
+    add,
+    div,
+    dynamic_fee,
+    get_y,
+    mul,
+    normalize,
+    sub,
+)
+from scripts.stableswap.pool import PoolInfo, PoolState, pool_info
+from scripts.stableswap.snapshot import take_pool_snapshots
+
+POOLS = ("aave", "ren")
+
+# maximum block range of a single `eth_getLogs` request
+MAX_LOG_RANGE = 2000
+RECONCILE_INTERVAL = 300
+# deeper than any reorg seen on Polygon PoS
+ROLLBACK_DEPTH = 128
+
+
+class StateVersion(NamedTuple):
+    block_number: int
+    block_hash: HexBytes
+    states: Dict[str, PoolState]
+
+
+def _exchange(state: PoolState, i: int, j: int, dx: int) -> Tuple[int, int]:
+    """Amount received, and admin fee accrued in coin `j`, by `_exchange`."""
+    xp = normalize(state.balances, state.precision_mul)
+    precisions = state.precision_mul
+    x = add(xp[i], mul(dx, precisions[i]))
+    y = get_y(i, j, x, xp, state.A_precise())
+    dy = sub(xp[j], y)
+    dy_fee = div(
+        mul(
+            dy,
+            dynamic_fee(
+                div(add(xp[i], x), 2),
+                div(add(xp[j], y), 2),
+                state.fee,
+                state.offpeg_fee_multiplier,
+            ),
+        ),
+        FEE_DENOMINATOR,
+    )
+    dy_admin_fee = div(mul(dy_fee, state.admin_fee), FEE_DENOMINATOR)
+    return div(sub(dy, dy_fee), precisions[j]), div(dy_admin_fee, precisions[j])
+
+
+def apply_event(state: PoolState, event: str, args: dict) -> Tuple[PoolState, bool]:
+    """Apply one pool event to `state`.
+
+    Returns:
+        The new state, and False if the event could not be reproduced exactly, in
+        which case the state is a best effort and should be reconciled
+    """
+    balances = list(state.balances)
+    exact = True
+
+    if event in ("TokenExchange", "TokenExchangeUnderlying"):
+        i, j = args["sold_id"], args["bought_id"]
+        try:
+            dy, admin_fee = _exchange(state, i, j, args["tokens_sold"])
+            exact = dy == args["tokens_bought"]
+        except Revert:
+            admin_fee, exact = 0, False
+        balances[i] += args["tokens_sold"]
+        balances[j] -= args["tokens_bought"] + admin_fee
+
+    elif event in ("AddLiquidity", "RemoveLiquidity", "RemoveLiquidityImbalance"):
+        sign = 1 if event == "AddLiquidity" else -1
+        for i, (amount, fee) in enumerate(zip(args["token_amounts"], args["fees"])):
+            admin_fee = fee * state.admin_fee // FEE_DENOMINATOR
+            balances[i] += sign * amount - admin_fee
+        state = state._replace(token_supply=args["token_supply"])
+
+    elif event == "RemoveLiquidityOne":
+        # the coin withdrawn is not logged, find the one which pays out this amount
+        token_amount, coin_amount = args["token_amount"], args["coin_amount"]
+        matches = []
+        for i in range(state.n_coins):
+            try:
+                if state.calc_withdraw_one_coin(token_amount, i) == coin_amount:
+                    matches.append(i)
+            except Revert:
+                pass
+        if len(matches) == 1:
+            balances[matches[0]] -= coin_amount
+        else:
+            exact = False
+        state = state._replace(token_supply=state.token_supply - token_amount)
+
+    elif event == "RampA":
+        state = state._replace(
+            initial_A=args["old_A"],
+            future_A=args["new_A"],
+            initial_A_time=args["initial_time"],
+            future_A_time=args["future_time"],
+        )
+
+    elif event == "StopRampA":
+        state = state._replace(
+            initial_A=args["A"],
+            future_A=args["A"],
+            initial_A_time=args["t"],
+            future_A_time=args["t"],
+        )
+
+    elif event == "NewFee":
+        state = state._replace(
+            fee=args["fee"],
+            admin_fee=args["admin_fee"],
+            offpeg_fee_multiplier=args["offpeg_fee_multiplier"],
+        )
+
+    if min(balances) < 0:
+        balances, exact = [max(i, 0) for i in balances], False
+    return state._replace(balances=tuple(balances)), exact
+
+
+class PoolMirror:
+    """Block-versioned state of StableSwap pools, updated from their logs."""
+
+    def __init__(
+        self,
+        polygon: Chain,
+        pools: Iterable[Union[str, PoolInfo]] = POOLS,
+        reconcile_interval: int = RECONCILE_INTERVAL,
+        rollback_depth: int = ROLLBACK_DEPTH,
+    ):
+        """Read the state of each pool as of the latest block.
+
+        Args:
+            polygon: Connection to the chain the pools are deployed on
+            pools: Names of pools in `contracts/pools`, or their deployments
+            reconcile_interval: Number of blocks after which the state is re-read
+            rollback_depth: Number of blocks of versions kept to roll back reorgs
+        """
+        self.polygon = polygon
+        self.pools = [pool_info(i) if isinstance(i, str) else i for i in pools]
+        self.reconcile_interval = reconcile_interval
+        self.rollback_depth = rollback_depth
+
+        # pool name and event of each (address, topic)
+        self._topics: Dict[Tuple[str, HexBytes], Tuple[str, object]] = {}
+        for pool in self.pools:
+            contract = polygon.contract(f"StableSwap{pool.n_coins}Events", pool.swap)
+            for abi in (i for i in contract.abi if i["type"] == "event"):
+                topic = HexBytes(event_abi_to_log_topic(abi))
+                self._topics[(pool.swap.lower(), topic)] = (
+                    pool.name,
+                    contract.events[abi["name"]](),
+                )
+
+        self.versions: List[StateVersion] = []
+        self.last_reconciled = 0
+        self.reconcile(polygon.w3.eth.block_number)
+
+    @property
+    def last_block(self) -> int:
+        """Number of the last block ingested."""
+        return self.versions[-1].block_number
+
+    def state(self, pool: str, block_number: Optional[int] = None) -> PoolState:
+        """State of `pool` after `block_number`, by default after the last ingested block.
+
+        The timestamp of each state is that of the last block polled before it, call
+        `_replace(timestamp=...)` to quote a ramping `A` at another time.
+        """
+        if block_number is None:
+            return self.versions[-1].states[pool]
+        if block_number < self.versions[0].block_number:
+            raise ValueError(f"Block {block_number} is older than the rollback buffer")
+        version = next(i for i in reversed(self.versions) if i.block_number <= block_number)
+        return version.states[pool]
+
+    def reconcile(self, block_number: int) -> None:
+        """Replace the mirrored state with the state read at `block_number`."""
+        states = take_pool_snapshots(self.polygon, self.pools, block_identifier=block_number)
+        block_hash = self.polygon.w3.eth.get_block(block_number)["hash"]
+        self._push(StateVersion(block_number, HexBytes(block_hash), states))
+        self.last_reconciled = block_number
+
+    def _push(self, version: StateVersion) -> None:
+        if self.versions and self.versions[-1].block_number == version.block_number:
+            self.versions[-1] = version
+        else:
+            self.versions.append(version)
+        # keep the newest version older than the buffer, as the state at its start
+        min_block = version.block_number - self.rollback_depth
+        while len(self.versions) > 1 and self.versions[1].block_number <= min_block:
+            self.versions.pop(0)
+
+    def _rollback(self) -> None:
+        get_block = self.polygon.w3.eth.get_block
+        while self.versions:
+            version = self.versions[-1]
+            if HexBytes(get_block(version.block_number)["hash"]) == version.block_hash:
+                return
+            self.versions.pop()
+
+    def poll(self) -> int:
+        """Ingest the logs of every block since the last poll.
+
+        Returns:
+            The number of pool events applied
+        """
+        self._rollback()
+        head = self.polygon.w3.eth.get_block("latest")
+        if not self.versions:
+            # reorged deeper than the buffer
+            self.reconcile(head["number"])
+            return 0
+
+        states = dict(self.versions[-1].states)
+        stale = False
+        applied = 0
+        from_block = self.last_block + 1
+        while from_block <= head["number"]:
+            to_block = min(head["number"], from_block + MAX_LOG_RANGE - 1)
+            logs = self.polygon.w3.eth.get_logs(
+                {
+                    "address": [i.swap for i in self.pools],
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                }
+            )
+            for log in logs:
+                key = (log["address"].lower(), HexBytes(log["topics"][0]))
+                if key not in self._topics:
+                    continue
+                name, event = self._topics[key]
+                decoded = event.processLog(log)
+                states[name], exact = apply_event(states[name], decoded["event"], decoded["args"])
+                stale |= not exact
+                applied += 1
+                self._push(
+                    StateVersion(log["blockNumber"], HexBytes(log["blockHash"]), dict(states))
+                )
+            from_block = to_block + 1
+
+        if stale or head["number"] - self.last_reconciled >= self.reconcile_interval:
+            self.reconcile(head["number"])
+        else:
+            states = {k: v._replace(timestamp=head["timestamp"]) for k, v in states.items()}
+            self._push(StateVersion(head["number"], HexBytes(head["hash"]), states))
+        return applied
+
+    def run(self, poll_interval: float = 2) -> None:
+        """Poll forever."""
+        while True:
+            self.poll()
+            time.sleep(poll_interval)
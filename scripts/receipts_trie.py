@@ -0,0 +1,168 @@
+"""Bulk built Merkle-Patricia tries, used for the receipts trie of a block.
+
+Inserting receipts into a `trie.HexaryTrie` one at a time rehashes every node on the
+path of each key and writes short-lived intermediate nodes. All the keys are known up
+front, so `BulkTrie` sorts them and builds the trie bottom up in a single pass,
+encoding and hashing each node exactly once. Roots and proofs are identical to those
+of `HexaryTrie`.
+"""
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+
+import rlp
+from eth_hash.auto import keccak
+
+BLANK_NODE = b""
+
+# a child is referenced by its hash, or embedded when its encoding is under 32 bytes
+NodeRef = Union[bytes, list]
+
+
+def _nibbles(key: bytes) -> bytes:
+    return bytes(nibble for byte in key for nibble in (byte >> 4, byte & 15))
+
+
+def _hex_prefix(nibbles: bytes, is_leaf: bool) -> bytes:
+    flag = 2 if is_leaf else 0
+    if len(nibbles) % 2:
+        nibbles = bytes([flag + 1]) + nibbles
+    else:
+        nibbles = bytes([flag, 0]) + nibbles
+    return bytes(nibbles[i] << 4 | nibbles[i + 1] for i in range(0, len(nibbles), 2))
+
+
+def _decode_hex_prefix(encoded: bytes) -> Tuple[bytes, bool]:
+    nibbles = _nibbles(encoded)
+    # the first nibble holds the flags, and a second padding nibble for even paths
+    is_leaf = nibbles[0] >= 2
+    return (nibbles[1:] if nibbles[0] % 2 else nibbles[2:]), is_leaf
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+class BulkTrie:
+    """Immutable Merkle-Patricia trie built from all of its items at once."""
+
+    def __init__(self, items: Mapping[bytes, bytes]):
+        """Build the trie.
+
+        Args:
+            items: Mapping of key to (non-empty) value, e.g. rlp encoded transaction
+                index to serialized receipt
+        """
+        self.db: Dict[bytes, list] = {}
+        sorted_items = sorted((_nibbles(k), bytes(v)) for k, v in items.items())
+
+        if sorted_items:
+            root = self._build(sorted_items, 0, len(sorted_items), 0)
+            if not isinstance(root, bytes):
+                # the root is always referenced by hash, however short its encoding
+                root = self._store_hashed(root, rlp.encode(root))
+        else:
+            root = self._store_hashed(BLANK_NODE, rlp.encode(BLANK_NODE))
+        self.root_hash = root
+
+    def _store_hashed(self, node: list, encoded: bytes) -> bytes:
+        node_hash = keccak(encoded)
+        self.db[node_hash] = node
+        return node_hash
+
+    def _store(self, node: list) -> NodeRef:
+        encoded = rlp.encode(node)
+        if len(encoded) < 32:
+            return node
+        return self._store_hashed(node, encoded)
+
+    def _build(self, items: List[Tuple[bytes, bytes]], lo: int, hi: int, depth: int) -> NodeRef:
+        # `items[lo:hi]` are sorted and share their first `depth` nibbles
+        if hi - lo == 1:
+            key, value = items[lo]
+            return self._store([_hex_prefix(key[depth:], True), value])
+
+        first, last = items[lo][0], items[hi - 1][0]
+        prefix_length = _common_prefix_length(first[depth:], last[depth:])
+        if prefix_length:
+            child = self._build(items, lo, hi, depth + prefix_length)
+            return self._store([_hex_prefix(first[depth : depth + prefix_length], False), child])
+
+        branch = [BLANK_NODE] * 17
+        if len(first) == depth:
+            # a key ending here sorts first, and is stored as the branch value
+            branch[16] = items[lo][1]
+            lo += 1
+        while lo < hi:
+            nibble = items[lo][0][depth]
+            end = lo + 1
+            while end < hi and items[end][0][depth] == nibble:
+                end += 1
+            branch[nibble] = self._build(items, lo, end, depth + 1)
+            lo = end
+        return self._store(branch)
+
+    def _node(self, ref: NodeRef) -> list:
+        return self.db[ref] if isinstance(ref, bytes) and ref != BLANK_NODE else ref
+
+    def get_proof(self, key: bytes) -> Tuple[list, ...]:
+        """Return the nodes on the path to `key`, as `HexaryTrie.get_proof` does."""
+        nibbles = _nibbles(key)
+        proof = []
+        node = self.db[self.root_hash]
+        while node != BLANK_NODE:
+            proof.append(node)
+            if len(node) == 17:
+                if not nibbles:
+                    break
+                node, nibbles = self._node(node[nibbles[0]]), nibbles[1:]
+                continue
+
+            path, is_leaf = _decode_hex_prefix(node[0])
+            if is_leaf or nibbles[: len(path)] != path:
+                break
+            node, nibbles = self._node(node[1]), nibbles[len(path) :]
+
+        return tuple(proof)
+
+
+def verify_proof(root_hash: bytes, key: bytes, proof: Sequence[list]) -> bytes:
+    """Verify a Merkle-Patricia proof, as returned by `get_proof`, against a root.
+
+    Returns:
+        The value stored at `key`
+
+    Raises:
+        ValueError: If the proof is invalid, or does not prove a value for `key`
+    """
+    nibbles = _nibbles(key)
+    expected: NodeRef = bytes(root_hash)
+    for node in proof:
+        if isinstance(expected, bytes):
+            if len(expected) != 32 or keccak(rlp.encode(node)) != expected:
+                raise ValueError("Proof node does not match its reference")
+        elif node != expected:
+            raise ValueError("Embedded proof node does not match its parent")
+
+        if len(node) == 17:
+            if not nibbles:
+                if not node[16]:
+                    raise ValueError("Proof branch holds no value for the key")
+                return node[16]
+            expected, nibbles = node[nibbles[0]], nibbles[1:]
+        elif len(node) == 2:
+            path, is_leaf = _decode_hex_prefix(node[0])
+            if is_leaf:
+                if path != nibbles:
+                    raise ValueError("Proof leaf is for a different key")
+                return node[1]
+            if nibbles[: len(path)] != path:
+                raise ValueError("Proof extension diverges from the key")
+            expected, nibbles = node[1], nibbles[len(path) :]
+        else:
+            raise ValueError("Malformed proof node")
+
+    raise ValueError("Proof ends before reaching the key")
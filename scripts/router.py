@@ -0,0 +1,250 @@
+"""Off-chain router, quoting what `Swaps.get_best_rate` would return without calling it.
+
+`RegistryIndex` keeps the markets of the registry locally: the pools listed for each
+pair of coins, in the order `find_pool_for_coins` returns them, and the coins of each
+pool to resolve `get_coin_indices`. It is built from one multicall over `pool_list`
+and kept current from `PoolAdded` and `PoolRemoved` logs. Only blocks `confirmations`
+deep are read, so a reorg never has to be undone: registry changes are rare admin
+actions, and applying one a few minutes late costs nothing. Pools which were removed
+reorder their markets, so after removals the order of pools with equal quotes, and
+so the pool `get_best_rate` picks among them, may differ from the registry.
+
+`Router` quotes each pool with the off-chain model of `scripts.stableswap`, from
+states given to it, e.g. those of a `PoolMirror`. Pools without a state, such as
+crypto pools which the model does not cover, are skipped, as are pools whose quote
+would revert, where `get_best_rate` itself would revert. Besides the single pool
+rate of `get_best_rate`, `best_route` also considers two pool routes through any
+coin the two coins share a market with.
+"""
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from scripts.chains import Chain
+from scripts.multicall import multicall
+from scripts.pool_mirror import MAX_LOG_RANGE, ROLLBACK_DEPTH, PoolMirror
+from scripts.stableswap import PoolState, Revert
+
+ADDRESS_PROVIDER = "0x0000000022D53366457F9d5E68Ec105046FC4383"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def _pair(coin_a: str, coin_b: str) -> Tuple[str, str]:
+    return tuple(sorted((coin_a.lower(), coin_b.lower())))
+
+
+class PoolCoins(NamedTuple):
+    coins: Tuple[str, ...]
+    # empty for pools registered without underlying coins
+    underlying_coins: Tuple[str, ...]
+
+
+class Route(NamedTuple):
+    # coins from the coin sent to the coin received
+    coins: Tuple[str, ...]
+    # pool exchanging each consecutive pair of coins
+    pools: Tuple[str, ...]
+    amount_out: int
+
+
+class RegistryIndex:
+    """Local copy of the registry's markets, updated from its logs."""
+
+    def __init__(
+        self, polygon: Chain = None, registry: str = None, confirmations: int = ROLLBACK_DEPTH
+    ):
+        """Initialize an empty index, see `from_registry` to read a deployed registry.
+
+        Args:
+            polygon: Connection to the chain the registry is deployed on
+            registry: Registry address, by default the one in the address provider
+            confirmations: Number of blocks a registry change must be buried under
+                before it is applied
+        """
+        self.polygon = polygon
+        self.confirmations = confirmations
+        self.registry = None
+        if polygon is not None:
+            if registry is None:
+                address_provider = polygon.contract("AddressProvider", ADDRESS_PROVIDER)
+                registry = address_provider.functions.get_address(0).call()
+            self.registry = polygon.contract("Registry", registry)
+
+        self.pools: Dict[str, PoolCoins] = {}
+        self.markets: Dict[Tuple[str, str], List[str]] = {}
+        self.last_block = 0
+
+    @classmethod
+    def from_registry(
+        cls, polygon: Chain, registry: str = None, confirmations: int = ROLLBACK_DEPTH
+    ) -> "RegistryIndex":
+        """Read every pool in the registry, as of the latest confirmed block."""
+        index = cls(polygon, registry, confirmations)
+        index.last_block = index._confirmed_block()
+        pool_count = index.registry.functions.pool_count().call(block_identifier=index.last_block)
+        pool_list = multicall(
+            polygon,
+            [(index.registry, "pool_list", (i,)) for i in range(pool_count)],
+            block_identifier=index.last_block,
+        )
+        index._read_pools(pool_list, index.last_block)
+        return index
+
+    def _confirmed_block(self) -> int:
+        return max(self.polygon.w3.eth.block_number - self.confirmations, 0)
+
+    def _read_pools(self, pools: List[str], block_number: int) -> None:
+        calls = []
+        for pool in pools:
+            calls += [
+                (self.registry, name, (pool,)) for name in ("get_coins", "get_underlying_coins")
+            ]
+        results = iter(multicall(self.polygon, calls, block_identifier=block_number))
+        for pool in pools:
+            self.add_pool(pool, next(results), next(results))
+
+    def add_pool(self, pool: str, coins: Iterable[str], underlying_coins: Iterable[str]) -> None:
+        """Add a pool to the markets of its coins, as `add_pool` on the registry."""
+        pool = pool.lower()
+        coins, underlying_coins = (
+            tuple(i.lower() for i in coin_list if i != ZERO_ADDRESS)
+            for coin_list in (coins, underlying_coins)
+        )
+        self.pools[pool] = PoolCoins(coins, underlying_coins)
+        # wrapped markets are registered first, then underlying ones
+        for coin_list in (coins, underlying_coins):
+            for i, coin_a in enumerate(coin_list):
+                for coin_b in coin_list[i + 1 :]:
+                    market = self.markets.setdefault(_pair(coin_a, coin_b), [])
+                    if pool not in market:
+                        market.append(pool)
+
+    def remove_pool(self, pool: str) -> None:
+        """Remove a pool from the markets of its coins, as `remove_pool` on the registry."""
+        pool = pool.lower()
+        for pair, market in list(self.markets.items()):
+            if pool in market:
+                # the last pool of the market takes the place of the removed one
+                index = market.index(pool)
+                market[index] = market[-1]
+                market.pop()
+                if not market:
+                    del self.markets[pair]
+        self.pools.pop(pool, None)
+
+    def find_pools_for_coins(self, coin_from: str, coin_to: str) -> List[str]:
+        """Pools exchanging two coins, in the order of `find_pool_for_coins`."""
+        return self.markets.get(_pair(coin_from, coin_to), [])
+
+    def neighbours(self, coin: str) -> List[str]:
+        """Coins which `coin` can be exchanged for in a single pool."""
+        coin = coin.lower()
+        return [b if a == coin else a for a, b in self.markets if coin in (a, b)]
+
+    def get_coin_indices(self, pool: str, coin_from: str, coin_to: str) -> Tuple[int, int, bool]:
+        """Indices of two coins in `pool`, and whether they are underlying coins."""
+        pool_coins = self.pools[pool.lower()]
+        coin_from, coin_to = coin_from.lower(), coin_to.lower()
+        for coins, is_underlying in (
+            (pool_coins.coins, False),
+            (pool_coins.underlying_coins, True),
+        ):
+            if coin_from in coins and coin_to in coins:
+                return coins.index(coin_from), coins.index(coin_to), is_underlying
+        raise ValueError(f"No market for {coin_from} and {coin_to} in {pool}")
+
+    def poll(self) -> None:
+        """Apply pools added and removed in the blocks confirmed since the last poll."""
+        head = self._confirmed_block()
+        while self.last_block < head:
+            from_block = self.last_block + 1
+            to_block = min(head, self.last_block + MAX_LOG_RANGE)
+            events = self.registry.events
+            logs = events.PoolAdded.getLogs(fromBlock=from_block, toBlock=to_block)
+            logs += events.PoolRemoved.getLogs(fromBlock=from_block, toBlock=to_block)
+            for log in sorted(logs, key=lambda i: (i["blockNumber"], i["logIndex"])):
+                if log["event"] == "PoolAdded":
+                    self._read_pools([log["args"]["pool"]], log["blockNumber"])
+                else:
+                    self.remove_pool(log["args"]["pool"])
+            self.last_block = to_block
+
+
+class Router:
+    """Best rate and route between two coins, quoted from cached pool states."""
+
+    def __init__(self, index: RegistryIndex, states: Mapping[str, PoolState] = None):
+        """Initialize the router.
+
+        Args:
+            index: Markets of the registry
+            states: State of each pool which can be quoted, by pool address
+        """
+        self.index = index
+        self.states: Dict[str, PoolState] = {}
+        self.update(states or {})
+
+    def update(self, states: Mapping[str, PoolState]) -> None:
+        """Replace the states of the given pools."""
+        self.states.update((k.lower(), v) for k, v in states.items())
+
+    def update_from_mirror(self, mirror: PoolMirror) -> None:
+        """Quote from the latest states of a pool mirror."""
+        self.update({pool.swap: mirror.state(pool.name) for pool in mirror.pools})
+
+    def get_exchange_amount(self, pool: str, coin_from: str, coin_to: str, amount: int) -> int:
+        """Amount of `coin_to` received exchanging `amount` in `pool`, as `Swaps` quotes it."""
+        i, j, is_underlying = self.index.get_coin_indices(pool, coin_from, coin_to)
+        state = self.states[pool.lower()]
+        if is_underlying:
+            return state.get_dy_underlying(i, j, amount)
+        return state.get_dy(i, j, amount)
+
+    def get_best_rate(
+        self, coin_from: str, coin_to: str, amount: int, exclude_pools: Iterable[str] = ()
+    ) -> Tuple[str, int]:
+        """Pool giving the most `coin_to` for `amount` of `coin_from`, as `get_best_rate`.
+
+        Returns:
+            (pool address, amount received), the zero address and 0 if no pool can be
+            quoted
+        """
+        exclude_pools = {i.lower() for i in exclude_pools}
+        best_pool, max_dy = ZERO_ADDRESS, 0
+        for pool in self.index.find_pools_for_coins(coin_from, coin_to):
+            if pool in exclude_pools or pool not in self.states:
+                continue
+            try:
+                dy = self.get_exchange_amount(pool, coin_from, coin_to, amount)
+            except Revert:
+                continue
+            if dy > max_dy:
+                best_pool, max_dy = pool, dy
+        return best_pool, max_dy
+
+    def best_route(self, coin_from: str, coin_to: str, amount: int) -> Optional[Route]:
+        """Best route through one pool, or two pools with any coin in between.
+
+        The two pools of a route must differ, as quoting the second from the state the
+        first leaves is not modelled.
+
+        Returns:
+            The route receiving the most `coin_to`, or None if there is none
+        """
+        coin_from, coin_to = coin_from.lower(), coin_to.lower()
+        best = None
+        pool, dy = self.get_best_rate(coin_from, coin_to, amount)
+        if dy:
+            best = Route((coin_from, coin_to), (pool,), dy)
+
+        for coin in self.index.neighbours(coin_from):
+            if coin == coin_to or not self.index.find_pools_for_coins(coin, coin_to):
+                continue
+            first_pool, first_dy = self.get_best_rate(coin_from, coin, amount)
+            if not first_dy:
+                continue
+            second_pool, second_dy = self.get_best_rate(
+                coin, coin_to, first_dy, exclude_pools=[first_pool]
+            )
+            if second_dy and (best is None or second_dy > best.amount_out):
+                best = Route((coin_from, coin, coin_to), (first_pool, second_pool), second_dy)
+
+        return best
@@ -0,0 +1,234 @@
+"""Batched JSON-RPC requests for pulling large ranges of chain data.
+
+Fetching a checkpoint one block at a time means thousands of serial round trips.
+`BatchRPC` packs many calls into JSON-RPC batch requests, sends the batches from a
+bounded pool of worker threads and returns the results in request order. Sub-requests
+which fail inside a batch are retried individually with exponential backoff, and
+endpoints which reject batch payloads altogether are handled by falling back to
+single requests. A `null` result is treated as a failure, as nodes return it for
+blocks and receipts they do not have yet.
+"""
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Sequence
+
+import requests
+from hexbytes import HexBytes
+from tqdm import tqdm
+
+from scripts.instrumentation import current_phase, record_rpc, within
+
+
+class RPCError(Exception):
+    """Raised when a JSON-RPC request fails after all retries."""
+
+
+class BatchRPC:
+    """Send JSON-RPC calls to an HTTP endpoint in ordered, concurrent batches."""
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        batch_size: int = 100,
+        max_workers: int = 8,
+        retries: int = 3,
+        timeout: int = 30,
+        backoff: float = 0.25,
+        cassette: Callable[[Any, Callable[[Any], Any]], Any] = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            endpoint_uri: HTTP(S) URI of the JSON-RPC endpoint
+            batch_size: Maximum number of calls packed into a single batch request
+            max_workers: Maximum number of batch requests in flight at once
+            retries: Number of attempts made for each individually retried call
+            timeout: Timeout in seconds for each HTTP request
+            backoff: Delay in seconds before the first retry, doubled for each retry after
+            cassette: Optional `Cassette.track` which requests are recorded to or
+                replayed from
+        """
+        self.endpoint_uri = endpoint_uri
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.supports_batch = True
+        self.session = requests.Session()
+        self.cassette = cassette
+
+    def _post(self, payload: Any) -> Any:
+        if self.cassette is not None:
+            return self.cassette(payload, self._send)
+        return self._send(payload)
+
+    def _send(self, payload: Any) -> Any:
+        response = self.session.post(self.endpoint_uri, json=payload, timeout=self.timeout)
+        calls = len(payload) if isinstance(payload, list) else 1
+        record_rpc(calls, len(response.request.body or b""), len(response.content))
+        response.raise_for_status()
+        return response.json()
+
+    def request(self, method: str, params: Sequence, retries: int = None) -> Any:
+        """Make a single JSON-RPC call, retrying on failure or a `null` result."""
+        payload = {"jsonrpc": "2.0", "id": 0, "method": method, "params": list(params)}
+        error = None
+        for attempt in range(retries or self.retries):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self._post(payload)
+            except (requests.RequestException, ValueError) as exc:
+                error = exc
+                continue
+            if "error" in response:
+                error = response["error"]
+            elif response.get("result") is None:
+                error = "null result"
+            else:
+                return response["result"]
+
+        raise RPCError(f"{method}{tuple(params)} failed: {error}")
+
+    def _request_batch(self, method: str, params_list: Sequence[Sequence]) -> List[Any]:
+        results = {}
+        if self.supports_batch:
+            payload = [
+                {"jsonrpc": "2.0", "id": idx, "method": method, "params": list(params)}
+                for idx, params in enumerate(params_list)
+            ]
+            try:
+                response = self._post(payload)
+            except (requests.RequestException, ValueError):
+                response = []
+
+            if isinstance(response, dict):
+                # a single error object in reply to a batch means batching is unsupported
+                self.supports_batch = False
+            else:
+                results = {
+                    item["id"]: item["result"]
+                    for item in response
+                    if "error" not in item and item.get("result") is not None
+                }
+
+        # anything missing from the batch response is retried on its own
+        return [
+            results[idx] if idx in results else self.request(method, params)
+            for idx, params in enumerate(params_list)
+        ]
+
+    def batch_request(
+        self, method: str, params_list: Sequence[Sequence], desc: str = None
+    ) -> List[Any]:
+        """Make many calls to the same method.
+
+        Args:
+            method: JSON-RPC method name, e.g. 'eth_getBlockByNumber'
+            params_list: Parameters for each call
+            desc: Optional progress bar description
+
+        Returns:
+            The result of each call, in the same order as `params_list`
+        """
+        # once an endpoint has rejected a batch, spread single calls across the workers
+        size = self.batch_size if self.supports_batch else 1
+        chunks = [params_list[i : i + size] for i in range(0, len(params_list), size)]
+        phase_name = current_phase()
+
+        def request_chunk(chunk):
+            with within(phase_name):
+                return self._request_batch(method, chunk)
+
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            # `map` yields in submission order, regardless of completion order
+            results = executor.map(request_chunk, chunks)
+            results = tqdm(results, total=len(chunks), desc=desc, unit="batch", disable=not desc)
+            return list(itertools.chain.from_iterable(results))
+
+
+def format_block(block: dict) -> dict:
+    """Convert the fields of a raw JSON-RPC block used in exit proofs."""
+    return {
+        "number": int(block["number"], 16),
+        "timestamp": int(block["timestamp"], 16),
+        "hash": HexBytes(block["hash"]),
+        "transactionsRoot": HexBytes(block["transactionsRoot"]),
+        "receiptsRoot": HexBytes(block["receiptsRoot"]),
+        "transactions": [HexBytes(tx) for tx in block["transactions"]],
+    }
+
+
+def fetch_blocks(rpc: BatchRPC, block_start: int, block_end: int, desc: str = None) -> List[dict]:
+    """Fetch every block in an inclusive range, ordered by block number.
+
+    Args:
+        rpc: Client connected to the chain the blocks are fetched from
+        block_start: First block number in the range
+        block_end: Last block number in the range
+        desc: Optional progress bar description
+    """
+    params_list = [(hex(number), False) for number in range(block_start, block_end + 1)]
+    blocks = rpc.batch_request("eth_getBlockByNumber", params_list, desc=desc)
+    return [format_block(block) for block in blocks]
+
+
+def format_receipt(receipt: dict) -> dict:
+    """Convert the fields of a raw JSON-RPC transaction receipt used in exit proofs."""
+    formatted = {
+        "transactionHash": HexBytes(receipt["transactionHash"]),
+        "transactionIndex": int(receipt["transactionIndex"], 16),
+        "cumulativeGasUsed": int(receipt["cumulativeGasUsed"], 16),
+        "logsBloom": HexBytes(receipt["logsBloom"]),
+        "logs": [
+            {
+                "address": log["address"],
+                "topics": [HexBytes(topic) for topic in log["topics"]],
+                "data": HexBytes(log["data"]),
+            }
+            for log in receipt["logs"]
+        ],
+        "type": int(receipt.get("type", "0x0"), 16),
+    }
+    if receipt.get("root"):
+        formatted["root"] = HexBytes(receipt["root"])
+    else:
+        formatted["status"] = int(receipt["status"], 16)
+    return formatted
+
+
+def fetch_receipts(
+    rpc: BatchRPC, block_number: int, tx_hashes: Sequence[bytes], desc: str = None
+) -> List[dict]:
+    """Fetch the receipts for transactions within a single block.
+
+    `eth_getBlockReceipts` is tried first, as it returns every receipt in one call.
+    If the endpoint does not support it, the receipts are requested individually
+    through batched, concurrent `eth_getTransactionReceipt` calls.
+
+    Args:
+        rpc: Client connected to the chain the block is on
+        block_number: Number of the block containing the transactions
+        tx_hashes: Hashes of the transactions to fetch receipts for
+        desc: Optional progress bar description
+
+    Returns:
+        The receipt of each transaction, in the same order as `tx_hashes`
+    """
+    tx_hashes = [HexBytes(tx_hash) for tx_hash in tx_hashes]
+
+    try:
+        block_receipts = rpc.request("eth_getBlockReceipts", (hex(block_number),), retries=1)
+    except RPCError:
+        block_receipts = None
+
+    if block_receipts:
+        by_hash = {HexBytes(receipt["transactionHash"]): receipt for receipt in block_receipts}
+        if all(tx_hash in by_hash for tx_hash in tx_hashes):
+            return [format_receipt(by_hash[tx_hash]) for tx_hash in tx_hashes]
+
+    params_list = [("0x" + bytes(tx_hash).hex(),) for tx_hash in tx_hashes]
+    receipts = rpc.batch_request("eth_getTransactionReceipt", params_list, desc=desc)
+    return [format_receipt(receipt) for receipt in receipts]
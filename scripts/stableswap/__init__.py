@@ -0,0 +1,30 @@
+"""Off-chain model of the StableSwap pools.
+
+Reproduces the view functions of `StableSwapAave` and `StableSwapREN` exactly, with
+uint256 semantics, from a snapshot of pool state. A snapshot is read once with
+`scripts.stableswap.snapshot.take_pool_snapshot`, after which any number of quotes
+are computed locally:
+
+    state = take_pool_snapshot(polygon, "aave")
+    state.get_dy(0, 1, 10 ** 18)
+    state._replace(timestamp=state.timestamp + 3600).get_virtual_price()
+
+`PoolState` and the invariant functions are pure Python and can be used without a
+connection, e.g. to quote a state built from events. `depth_surface` quotes many
+sizes of every pair from one state at once.
+"""
+from scripts.stableswap.depth import DepthCurve, depth_surface
+from scripts.stableswap.invariant import Revert, dynamic_fee, get_A, get_D, get_y, get_y_D
+from scripts.stableswap.pool import PoolState
+
+__all__ = [
+    "DepthCurve",
+    "PoolState",
+    "Revert",
+    "depth_surface",
+    "dynamic_fee",
+    "get_A",
+    "get_D",
+    "get_y",
+    "get_y_D",
+]
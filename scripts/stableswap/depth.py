@@ -0,0 +1,95 @@
+"""Depth curves: `get_dy` for many input sizes of every pair of coins at once.
+
+`Swaps.get_exchange_amounts` quotes at most 100 sizes per call, and every quote
+recomputes the invariant and solves for `y` from a cold start. Here the normalized
+balances, `A` and `D` of a pool state are computed once and shared by every quote.
+
+By default each quote is still solved from `D`, and equals `PoolState.get_dy`
+exactly. With `warm_start`, sizes of a pair are solved in ascending order, each
+starting from the `y` of the previous size. This takes fewer iterations, but a quote
+can differ from the contract by 1 wei, which is fine for charts but not for
+building transactions.
+
+Balances are uint256, so the arithmetic stays on Python ints: fixed width integer
+arrays would overflow on the intermediate products of the invariant.
+"""
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+from scripts.stableswap.invariant import (
+    FEE_DENOMINATOR,
+    Revert,
+    add,
+    div,
+    dynamic_fee,
+    get_D,
+    get_y_given_D,
+    mul,
+    normalize,
+    sub,
+)
+from scripts.stableswap.pool import PoolState
+
+
+class DepthCurve(NamedTuple):
+    i: int
+    j: int
+    # amounts of coin `i` sent, in ascending order
+    amounts: Tuple[int, ...]
+    # amounts of coin `j` received, None where `get_dy` would revert
+    dy: Tuple[Optional[int], ...]
+
+
+def depth_surface(
+    state: PoolState,
+    amounts: Sequence[Iterable[int]],
+    pairs: Optional[Iterable[Tuple[int, int]]] = None,
+    warm_start: bool = False,
+) -> Dict[Tuple[int, int], DepthCurve]:
+    """Quote `get_dy` for every size of every pair, sharing one invariant.
+
+    Args:
+        state: Pool state to quote
+        amounts: Sizes to quote for each coin sent, in that coin's own units
+        pairs: (i, j) pairs to quote, by default every pair of distinct coins
+        warm_start: Solve each size from the previous one, see the module docstring
+
+    Returns:
+        Depth curve of each pair, keyed by (i, j)
+    """
+    n_coins = state.n_coins
+    if len(amounts) != n_coins:
+        raise ValueError(f"Expected amounts for {n_coins} coins, got {len(amounts)}")
+    if pairs is None:
+        pairs = [(i, j) for i in range(n_coins) for j in range(n_coins) if i != j]
+
+    precisions = state.precision_mul
+    xp = normalize(state.balances, precisions)
+    amp = state.A_precise()
+    D = get_D(xp, amp)
+    sorted_amounts = [tuple(sorted(i)) for i in amounts]
+
+    surface = {}
+    for i, j in pairs:
+        state._check_index(i, j)
+        if i == j:
+            raise Revert("same coin")
+        y = None
+        quotes = []
+        for dx in sorted_amounts[i]:
+            try:
+                x = add(xp[i], mul(dx, precisions[i]))
+                y = get_y_given_D(i, j, x, xp, amp, D, y if warm_start else None)
+                dy = div(sub(xp[j], y), precisions[j])
+                fee = dynamic_fee(
+                    div(add(xp[i], x), 2),
+                    div(add(xp[j], y), 2),
+                    state.fee,
+                    state.offpeg_fee_multiplier,
+                )
+                quotes.append(sub(dy, div(mul(fee, dy), FEE_DENOMINATOR)))
+            except Revert:
+                y = None
+                quotes.append(None)
+        surface[(i, j)] = DepthCurve(i, j, sorted_amounts[i], tuple(quotes))
+
+    return surface
@@ -0,0 +1,163 @@
+"""StableSwap invariant math, as implemented in `StableSwapAave` and `StableSwapREN`.
+
+Every function follows the Vyper source statement by statement. Arithmetic is done
+on Python ints with the checks Vyper 0.2 adds to uint256 operations, so results are
+identical to the contracts and any input which makes them revert raises `Revert`.
+"""
+from typing import List, Optional, Sequence
+
+UINT256_MAX = 2 ** 256 - 1
+
+PRECISION = 10 ** 18
+FEE_DENOMINATOR = 10 ** 10
+A_PRECISION = 100
+
+
+class Revert(Exception):
+    """The contract would revert on the same input."""
+
+
+def add(a: int, b: int) -> int:
+    result = a + b
+    if result > UINT256_MAX:
+        raise Revert("uint256 overflow")
+    return result
+
+
+def sub(a: int, b: int) -> int:
+    if b > a:
+        raise Revert("uint256 underflow")
+    return a - b
+
+
+def mul(a: int, b: int) -> int:
+    result = a * b
+    if result > UINT256_MAX:
+        raise Revert("uint256 overflow")
+    return result
+
+
+def div(a: int, b: int) -> int:
+    if b == 0:
+        raise Revert("division by zero")
+    return a // b
+
+
+def get_A(
+    initial_A: int, future_A: int, initial_A_time: int, future_A_time: int, timestamp: int
+) -> int:
+    """Amplification coefficient, times `A_PRECISION`, at `timestamp` (`_A`)."""
+    t1, A1 = future_A_time, future_A
+    if timestamp < t1:
+        A0, t0 = initial_A, initial_A_time
+        if A1 > A0:
+            return add(A0, div(mul(sub(A1, A0), sub(timestamp, t0)), sub(t1, t0)))
+        else:
+            return sub(A0, div(mul(sub(A0, A1), sub(timestamp, t0)), sub(t1, t0)))
+    return A1
+
+
+def dynamic_fee(xpi: int, xpj: int, fee: int, feemul: int) -> int:
+    """Fee for swapping between balances `xpi` and `xpj`, raised as they move off peg."""
+    if feemul <= FEE_DENOMINATOR:
+        return fee
+    xps2 = add(xpi, xpj)
+    xps2 = mul(xps2, xps2)
+    return div(
+        mul(feemul, fee),
+        add(div(mul(mul(mul(sub(feemul, FEE_DENOMINATOR), 4), xpi), xpj), xps2), FEE_DENOMINATOR),
+    )
+
+
+def get_D(xp: Sequence[int], amp: int) -> int:
+    """Invariant of the normalized balances `xp`."""
+    n_coins = len(xp)
+    S = 0
+    for _x in xp:
+        S = add(S, _x)
+    if S == 0:
+        return 0
+
+    D = S
+    Ann = mul(amp, n_coins)
+    for _i in range(255):
+        D_P = D
+        for _x in xp:
+            D_P = div(mul(D_P, D), add(mul(_x, n_coins), 1))
+        Dprev = D
+        D = div(
+            mul(add(div(mul(Ann, S), A_PRECISION), mul(D_P, n_coins)), D),
+            add(div(mul(sub(Ann, A_PRECISION), D), A_PRECISION), mul(n_coins + 1, D_P)),
+        )
+        if abs(D - Dprev) <= 1:
+            return D
+    raise Revert("get_D did not converge")
+
+
+def _solve_y(c: int, b: int, D: int, y: int) -> int:
+    for _i in range(255):
+        y_prev = y
+        y = div(add(mul(y, y), c), sub(add(mul(2, y), b), D))
+        if abs(y - y_prev) <= 1:
+            return y
+    raise Revert("get_y did not converge")
+
+
+def get_y(i: int, j: int, x: int, xp: Sequence[int], amp: int) -> int:
+    """Balance of coin `j` which keeps the invariant of `xp` when coin `i` is set to `x`."""
+    n_coins = len(xp)
+    if i == j or not 0 <= j < n_coins or not 0 <= i < n_coins:
+        raise Revert("invalid coin index")
+    return get_y_given_D(i, j, x, xp, amp, get_D(xp, amp))
+
+
+def get_y_given_D(
+    i: int, j: int, x: int, xp: Sequence[int], amp: int, D: int, y0: Optional[int] = None
+) -> int:
+    """`get_y` with the invariant `D` of `xp` already computed.
+
+    Newton's method starts from `D`, as in the contract, unless a starting point `y0`
+    is given. Starting closer to the solution takes fewer iterations, but can stop at
+    a value 1 away from the one the contract returns.
+    """
+    n_coins = len(xp)
+    Ann = mul(amp, n_coins)
+    c = D
+    S_ = 0
+    for _i in range(n_coins):
+        if _i == i:
+            _x = x
+        elif _i != j:
+            _x = xp[_i]
+        else:
+            continue
+        S_ = add(S_, _x)
+        c = div(mul(c, D), mul(_x, n_coins))
+    c = div(mul(mul(c, D), A_PRECISION), mul(Ann, n_coins))
+    b = add(S_, div(mul(D, A_PRECISION), Ann))
+    return _solve_y(c, b, D, D if y0 is None else y0)
+
+
+def get_y_D(amp: int, i: int, xp: Sequence[int], D: int) -> int:
+    """Balance of coin `i` which brings the invariant of `xp` to `D`."""
+    n_coins = len(xp)
+    if not 0 <= i < n_coins:
+        raise Revert("invalid coin index")
+
+    Ann = mul(amp, n_coins)
+    c = D
+    S_ = 0
+    for _i in range(n_coins):
+        if _i == i:
+            continue
+        _x = xp[_i]
+        S_ = add(S_, _x)
+        c = div(mul(c, D), mul(_x, n_coins))
+    c = div(mul(mul(c, D), A_PRECISION), mul(Ann, n_coins))
+    b = add(S_, div(mul(D, A_PRECISION), Ann))
+    return _solve_y(c, b, D, D)
+
+
+def normalize(balances: Sequence[int], precision_mul: Sequence[int]) -> List[int]:
+    """Balances scaled to 18 decimals, as `xp` is built from `PRECISION_MUL`."""
+    return [mul(balance, precision) for balance, precision in zip(balances, precision_mul)]
@@ -0,0 +1,184 @@
+"""Quotes from a snapshot of a pool's state, without calling the pool."""
+import json
+from pathlib import Path
+from typing import NamedTuple, Sequence, Tuple
+
+from scripts.stableswap.invariant import (
+    A_PRECISION,
+    FEE_DENOMINATOR,
+    PRECISION,
+    Revert,
+    add,
+    div,
+    dynamic_fee,
+    get_A,
+    get_D,
+    get_y,
+    get_y_D,
+    mul,
+    normalize,
+    sub,
+)
+
+POOLS_DIR = Path(__file__).parents[2].joinpath("contracts/pools")
+
+
+def load_pool_data(pool: str) -> dict:
+    """Load `contracts/pools/<pool>/pooldata.json`."""
+    with POOLS_DIR.joinpath(pool, "pooldata.json").open() as fp:
+        return json.load(fp)
+
+
+def precision_mul(pool_data: dict) -> tuple:
+    """`PRECISION_MUL` of a pool, from the decimals of the coins it holds."""
+    return tuple(
+        10 ** (18 - coin.get("wrapped_decimals", coin.get("decimals")))
+        for coin in pool_data["coins"]
+    )
+
+
+class PoolInfo(NamedTuple):
+    """Where a pool is deployed, and what is needed to read its state."""
+
+    name: str
+    swap: str
+    lp_token: str
+    precision_mul: Tuple[int, ...]
+
+    @property
+    def n_coins(self) -> int:
+        return len(self.precision_mul)
+
+
+def pool_info(pool: str) -> PoolInfo:
+    """Deployment of the pool named `pool` in `contracts/pools`."""
+    pool_data = load_pool_data(pool)
+    return PoolInfo(
+        pool, pool_data["swap_address"], pool_data["lp_token_address"], precision_mul(pool_data)
+    )
+
+
+class PoolState(NamedTuple):
+    """Everything a StableSwap view function reads, as of one block.
+
+    Each method returns exactly what the view function of the same name would
+    return at `timestamp`, or raises `Revert` where it would revert.
+    """
+
+    # `PRECISION_MUL` of the pool, one per coin
+    precision_mul: Tuple[int, ...]
+    # pool balances less accrued admin fees, as returned by `balances`
+    balances: Tuple[int, ...]
+    fee: int
+    offpeg_fee_multiplier: int
+    initial_A: int
+    future_A: int
+    initial_A_time: int
+    future_A_time: int
+    # `totalSupply` of the LP token
+    token_supply: int
+    # `block.timestamp` the pool is quoted at, which `A` is ramped to
+    timestamp: int
+    # not read by any view function, only needed to apply the pool's events
+    admin_fee: int = 0
+
+    @property
+    def n_coins(self) -> int:
+        return len(self.balances)
+
+    def _check_index(self, *indexes: int) -> None:
+        # out of range indexes fail the array bounds check of the contract
+        if any(not 0 <= i < self.n_coins for i in indexes):
+            raise Revert("invalid coin index")
+
+    def _xp(self) -> list:
+        return normalize(self.balances, self.precision_mul)
+
+    def A_precise(self) -> int:
+        return get_A(
+            self.initial_A,
+            self.future_A,
+            self.initial_A_time,
+            self.future_A_time,
+            self.timestamp,
+        )
+
+    def A(self) -> int:
+        return self.A_precise() // A_PRECISION
+
+    def dynamic_fee(self, i: int, j: int) -> int:
+        self._check_index(i, j)
+        xp = self._xp()
+        return dynamic_fee(xp[i], xp[j], self.fee, self.offpeg_fee_multiplier)
+
+    def get_virtual_price(self) -> int:
+        D = get_D(self._xp(), self.A_precise())
+        return div(mul(D, PRECISION), self.token_supply)
+
+    def calc_token_amount(self, amounts: Sequence[int], is_deposit: bool) -> int:
+        if len(amounts) != self.n_coins:
+            raise ValueError(f"Expected {self.n_coins} amounts, got {len(amounts)}")
+        amp = self.A_precise()
+        D0 = get_D(self._xp(), amp)
+        op = add if is_deposit else sub
+        balances = [op(balance, amount) for balance, amount in zip(self.balances, amounts)]
+        D1 = get_D(normalize(balances, self.precision_mul), amp)
+        diff = sub(D1, D0) if is_deposit else sub(D0, D1)
+        return div(mul(diff, self.token_supply), D0)
+
+    def get_dy(self, i: int, j: int, dx: int) -> int:
+        self._check_index(i, j)
+        xp = self._xp()
+        precisions = self.precision_mul
+
+        x = add(xp[i], mul(dx, precisions[i]))
+        y = get_y(i, j, x, xp, self.A_precise())
+        dy = div(sub(xp[j], y), precisions[j])
+        fee = div(
+            mul(
+                dynamic_fee(
+                    div(add(xp[i], x), 2),
+                    div(add(xp[j], y), 2),
+                    self.fee,
+                    self.offpeg_fee_multiplier,
+                ),
+                dy,
+            ),
+            FEE_DENOMINATOR,
+        )
+        return sub(dy, fee)
+
+    def get_dy_underlying(self, i: int, j: int, dx: int) -> int:
+        # aTokens and their underlying are exchanged 1:1
+        return self.get_dy(i, j, dx)
+
+    def calc_withdraw_one_coin(self, token_amount: int, i: int) -> int:
+        self._check_index(i)
+        n_coins = self.n_coins
+        amp = self.A_precise()
+        xp = self._xp()
+
+        D0 = get_D(xp, amp)
+        D1 = sub(D0, div(mul(token_amount, D0), self.token_supply))
+        new_y = get_y_D(amp, i, xp, D1)
+
+        xp_reduced = list(xp)
+        ys = div(add(D0, D1), 2 * n_coins)
+        fee = div(mul(self.fee, n_coins), 4 * (n_coins - 1))
+        for j in range(n_coins):
+            if j == i:
+                dx_expected = sub(div(mul(xp[j], D1), D0), new_y)
+                xavg = div(add(xp[j], new_y), 2)
+            else:
+                dx_expected = sub(xp[j], div(mul(xp[j], D1), D0))
+                xavg = xp[j]
+            xp_reduced[j] = sub(
+                xp_reduced[j],
+                div(
+                    mul(dynamic_fee(xavg, ys, fee, self.offpeg_fee_multiplier), dx_expected),
+                    FEE_DENOMINATOR,
+                ),
+            )
+
+        dy = sub(xp_reduced[i], get_y_D(amp, i, xp_reduced, D1))
+        return div(sub(dy, 1), self.precision_mul[i])
@@ -0,0 +1,63 @@
+"""Read the state of deployed pools in a single `eth_call`, to quote them off-chain."""
+from typing import Dict, Iterable, Union
+
+from scripts.chains import Chain
+from scripts.multicall import MULTICALL3, multicall
+from scripts.stableswap.pool import PoolInfo, PoolState, pool_info
+
+_STATE_GETTERS = (
+    "fee",
+    "offpeg_fee_multiplier",
+    "initial_A",
+    "future_A",
+    "initial_A_time",
+    "future_A_time",
+)
+
+
+def take_pool_snapshots(
+    chain: Chain,
+    pools: Iterable[Union[str, PoolInfo]],
+    block_identifier: Union[int, str] = "latest",
+) -> Dict[str, PoolState]:
+    """Read everything the view functions of each pool depend on, from one block.
+
+    Args:
+        chain: Connection to the chain the pools are deployed on
+        pools: Names of pools in `contracts/pools`, or their deployments
+        block_identifier: Block to read the state at
+
+    Returns:
+        The state of each pool by name, quoted at the timestamp of the block read
+    """
+    pools = [pool_info(i) if isinstance(i, str) else i for i in pools]
+
+    calls = [(chain.contract("Multicall3", MULTICALL3), "getCurrentBlockTimestamp", ())]
+    for pool in pools:
+        swap = chain.contract("StableSwap", pool.swap)
+        calls += [(swap, "balances", (i,)) for i in range(pool.n_coins)]
+        calls += [(swap, name, ()) for name in _STATE_GETTERS + ("admin_fee",)]
+        calls.append((chain.contract("BridgeToken", pool.lp_token), "totalSupply", ()))
+
+    results = iter(
+        multicall(chain, calls, batch_size=len(calls), block_identifier=block_identifier)
+    )
+    timestamp = next(results)
+
+    states = {}
+    for pool in pools:
+        balances = tuple(next(results) for _ in range(pool.n_coins))
+        values = [next(results) for _ in _STATE_GETTERS]
+        admin_fee, token_supply = next(results), next(results)
+        states[pool.name] = PoolState(
+            pool.precision_mul, balances, *values, token_supply, timestamp, admin_fee
+        )
+    return states
+
+
+def take_pool_snapshot(
+    chain: Chain, pool: Union[str, PoolInfo], block_identifier: Union[int, str] = "latest"
+) -> PoolState:
+    """Read the state of a single pool, see `take_pool_snapshots`."""
+    pool_name = pool if isinstance(pool, str) else pool.name
+    return take_pool_snapshots(chain, [pool], block_identifier)[pool_name]
@@ -23,8 +23,8 @@ def _set_fees(chain, swap, fee, admin_fee, offpeg_multiplier=None):
 
 @pytest.fixture(scope="module")
 def set_fees(chain, swap):
-    def _set_fee_fixture_fn(fee, admin_fee, include_meta=False):
-        _set_fees(chain, swap, fee, admin_fee)
+    def _set_fee_fixture_fn(fee, admin_fee, include_meta=False, offpeg_multiplier=None):
+        _set_fees(chain, swap, fee, admin_fee, offpeg_multiplier)
 
     yield _set_fee_fixture_fn
 
@@ -0,0 +1,68 @@
+import itertools
+
+import brownie
+import pytest
+from brownie import web3
+from brownie.test import given, strategy
+
+MAX_QUOTES = 100
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(bob, swap, add_initial_liquidity, mint_bob, approve_bob, wrapped_coins, set_fees):
+    set_fees(4000000, 5000000000, offpeg_multiplier=20000000000)
+    # move the pool off peg, so the offpeg fee multiplier applies
+    swap.exchange(0, 1, wrapped_coins[0].balanceOf(bob) // 3, 0, {"from": bob})
+
+
+@pytest.fixture(scope="module")
+def quoter(project, alice):
+    yield project.StableSwapQuoter.deploy({"from": alice})
+
+
+def _pad(values):
+    return values + [0] * (MAX_QUOTES - len(values))
+
+
+@given(seeds=strategy("uint256[]", min_length=1, max_length=MAX_QUOTES, max_value=16 * 10 ** 4))
+def test_matches_get_dy(quoter, swap, initial_amounts, n_coins, seeds):
+    # each seed is a pair of coin indices and a size of up to 100% of the initial amount
+    quotes = [(k % 4 % n_coins, k // 4 % 4 % n_coins, k // 16 + 1) for k in seeds]
+    quotes = [(a, b, initial_amounts[a] * c // 10 ** 4 or 1) for a, b, c in quotes if a != b]
+    if not quotes:
+        return
+    i, j, dx = (list(x) for x in zip(*quotes))
+
+    # aToken balances accrue every second, so every quote is made at the same block
+    block = web3.eth.block_number
+    result = quoter.get_dy_multiple.call(
+        swap, n_coins, _pad(i), _pad(j), _pad(dx), block_identifier=block
+    )
+    for k in range(len(dx)):
+        assert result[k] == swap.get_dy.call(i[k], j[k], dx[k], block_identifier=block)
+        assert result[k] == swap.get_dy_underlying.call(i[k], j[k], dx[k], block_identifier=block)
+    assert not any(result[len(dx) :])
+
+
+def test_reverts(quoter, swap, n_coins):
+    with brownie.reverts():
+        quoter.get_dy_multiple(swap, n_coins, _pad([0, 1]), _pad([1, 1]), _pad([10 ** 6] * 2))
+
+
+def test_wrong_n_coins_reverts(quoter, swap, n_coins):
+    # too many coins fails to read the extra coin, too few fails the check against get_dy
+    for wrong in (n_coins + 1, n_coins - 1):
+        with brownie.reverts():
+            quoter.get_dy_multiple(swap, wrong, _pad([0]), _pad([1]), _pad([10 ** 6]))
+
+
+def test_gas(quoter, swap, initial_amounts, n_coins):
+    pairs = list(itertools.permutations(range(n_coins), 2))
+    i, j = ([p[k] for p in pairs] * 4 for k in (0, 1))
+    # 1% to 0.001% of the initial amounts
+    dx = [initial_amounts[a] // 10 ** (2 + k // len(pairs)) for k, a in enumerate(i)]
+
+    single = sum(swap.get_dy.estimate_gas(*args) for args in zip(i, j, dx))
+    multiple = quoter.get_dy_multiple.estimate_gas(swap, n_coins, _pad(i), _pad(j), _pad(dx))
+    # each single quote also pays for the call, balances and the invariant
+    assert multiple < single // 2
@@ -0,0 +1,43 @@
+import pytest
+from brownie import ZERO_ADDRESS, interface, web3
+
+ADDRESS_PROVIDER = "0x0000000022D53366457F9d5E68Ec105046FC4383"
+MAX_POOLS = 10
+
+
+@pytest.fixture(scope="module")
+def registry():
+    address_provider = interface.AddressProvider(ADDRESS_PROVIDER)
+    yield interface.Registry(address_provider.get_address(0))
+
+
+@pytest.fixture(scope="module")
+def pool_info(project, alice):
+    yield project.PoolInfo.deploy(ADDRESS_PROVIDER, {"from": alice})
+
+
+def test_matches_registry(registry, pool_info):
+    n_pools = min(registry.pool_count(), MAX_POOLS)
+    pools = [registry.pool_list(i) for i in range(n_pools)]
+    # aToken balances accrue every second, so admin balances are compared at one block
+    block = web3.eth.block_number
+    padded = pools + [ZERO_ADDRESS] * (MAX_POOLS - n_pools)
+    info = pool_info.get_pool_info.call(padded, block_identifier=block)
+
+    for i, pool in enumerate(pools):
+        assert info["n_coins"][i] == registry.get_n_coins(pool)
+        assert info["coins"][i] == registry.get_coins(pool)
+        assert info["underlying_coins"][i] == registry.get_underlying_coins(pool)
+        assert info["decimals"][i] == registry.get_decimals(pool)
+        assert info["rates"][i] == registry.get_rates(pool)
+        assert info["balances"][i] == registry.get_balances(pool)
+        assert info["admin_balances"][i] == registry.get_admin_balances.call(
+            pool, block_identifier=block
+        )
+        assert info["A"][i] == registry.get_A(pool)
+        assert info["fees"][i] == registry.get_fees(pool)
+        assert info["gauges"][i] == registry.get_gauges(pool)[0]
+
+    for i in range(n_pools, MAX_POOLS):
+        assert info["coins"][i] == [ZERO_ADDRESS] * 8
+        assert info["A"][i] == 0
@@ -0,0 +1,68 @@
+import pytest
+from brownie import network, web3
+
+from scripts.chains import Chain
+from scripts.pool_mirror import PoolMirror
+from scripts.stableswap.pool import PoolInfo, precision_mul
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(add_initial_liquidity, mint_bob, approve_bob, set_fees):
+    set_fees(4000000, 5000000000, offpeg_multiplier=20000000000)
+
+
+@pytest.fixture
+def mirror(swap, pool_token, pool_data):
+    polygon = Chain(network.show_active(), web3.provider.endpoint_uri, poa=True)
+    pool = PoolInfo(pool_data["name"], swap.address, pool_token.address, precision_mul(pool_data))
+    yield PoolMirror(polygon, [pool], reconcile_interval=10 ** 6)
+
+
+def _assert_mirrored(mirror, swap, pool_token, pool_data, approx):
+    state = mirror.state(pool_data["name"])
+    assert state.token_supply == pool_token.totalSupply()
+    assert state.fee == swap.fee()
+    assert state.admin_fee == swap.admin_fee()
+    assert state.A_precise() == swap.A_precise()
+    # aToken balances accrue interest between blocks, without any event
+    for i, balance in enumerate(state.balances):
+        assert approx(balance, swap.balances(i), 1e-6)
+
+
+def test_follows_events(
+    alice, bob, swap, pool_token, pool_data, mirror, n_coins, initial_amounts, approx
+):
+    swap.exchange(0, 1, initial_amounts[0] // 100, 0, {"from": bob})
+    swap.add_liquidity([i // 100 for i in initial_amounts], 0, {"from": bob})
+    swap.remove_liquidity_one_coin(10 ** 18, n_coins - 1, 0, {"from": alice})
+    swap.remove_liquidity_imbalance(
+        [i // 1000 for i in initial_amounts], 2 ** 256 - 1, {"from": alice}
+    )
+    swap.remove_liquidity(10 ** 18, [0] * n_coins, {"from": alice})
+
+    assert mirror.poll() == 5
+    _assert_mirrored(mirror, swap, pool_token, pool_data, approx)
+
+
+def test_block_versions(bob, swap, pool_data, mirror, initial_amounts):
+    start = mirror.last_block
+    tx = swap.exchange(0, 1, initial_amounts[0] // 100, 0, {"from": bob})
+    mirror.poll()
+
+    assert mirror.state(pool_data["name"], start) == mirror.state(
+        pool_data["name"], tx.block_number - 1
+    )
+    assert (
+        mirror.state(pool_data["name"], start).balances != mirror.state(pool_data["name"]).balances
+    )
+
+
+def test_rollback(chain, bob, swap, pool_token, pool_data, mirror, initial_amounts, approx):
+    swap.exchange(0, 1, initial_amounts[0] // 100, 0, {"from": bob})
+    mirror.poll()
+
+    # replace the exchange with another one in a block of the same height
+    chain.undo()
+    swap.exchange(1, 0, initial_amounts[1] // 10, 0, {"from": bob})
+    assert mirror.poll() == 1
+    _assert_mirrored(mirror, swap, pool_token, pool_data, approx)
@@ -0,0 +1,94 @@
+import brownie
+import pytest
+from brownie.test import given, strategy
+
+from scripts.stableswap import PoolState, Revert
+from scripts.stableswap.pool import precision_mul
+
+# differential tests of `scripts.stableswap` against the deployed pool contracts
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(add_initial_liquidity, mint_bob, approve_bob, set_fees):
+    set_fees(4000000, 5000000000, offpeg_multiplier=20000000000)
+
+
+@pytest.fixture(scope="module")
+def pool_state(swap, pool_token, pool_data, n_coins):
+    def _pool_state(timestamp=0):
+        return PoolState(
+            precision_mul(pool_data),
+            tuple(swap.balances(i) for i in range(n_coins)),
+            swap.fee(),
+            swap.offpeg_fee_multiplier(),
+            swap.initial_A(),
+            swap.future_A(),
+            swap.initial_A_time(),
+            swap.future_A_time(),
+            pool_token.totalSupply(),
+            timestamp,
+        )
+
+    yield _pool_state
+
+
+def _assert_matches(contract_fn, model_fn, *args):
+    try:
+        expected = model_fn(*args)
+    except Revert:
+        with brownie.reverts():
+            contract_fn.call(*args)
+    else:
+        assert contract_fn.call(*args) == expected
+
+
+@given(
+    i=strategy("uint8", max_value=3),
+    j=strategy("uint8", max_value=3),
+    imbalance=strategy("uint256", max_value=10 ** 4),
+    amount=strategy("uint256", max_value=10 ** 4),
+)
+def test_quotes(bob, swap, pool_state, wrapped_coins, n_coins, i, j, imbalance, amount):
+    # move the pool off peg, so the offpeg fee multiplier applies
+    send = i % n_coins
+    dx = wrapped_coins[send].balanceOf(bob) * imbalance // 10 ** 4
+    if dx:
+        swap.exchange(send, (send + 1) % n_coins, dx, 0, {"from": bob})
+
+    state = pool_state()
+    balances = state.balances
+    dx = balances[i % n_coins] * amount // 10 ** 4
+
+    _assert_matches(swap.get_virtual_price, state.get_virtual_price)
+    _assert_matches(swap.dynamic_fee, state.dynamic_fee, i, j)
+    _assert_matches(swap.get_dy, state.get_dy, i, j, dx)
+    _assert_matches(swap.get_dy_underlying, state.get_dy_underlying, i, j, dx)
+    _assert_matches(
+        swap.calc_withdraw_one_coin,
+        state.calc_withdraw_one_coin,
+        state.token_supply * amount // 10 ** 4,
+        i,
+    )
+
+    amounts = [balance * amount // 10 ** 4 for balance in balances]
+    amounts[j % n_coins] = 0
+    for is_deposit in (True, False):
+        _assert_matches(swap.calc_token_amount, state.calc_token_amount, amounts, is_deposit)
+
+
+@given(
+    future_A=strategy("uint256", min_value=72, max_value=7200),
+    dt=strategy("uint256", max_value=86400 * 3),
+)
+def test_ramp_A(chain, alice, swap, pool_state, initial_amounts, future_A, dt):
+    # A is read in a transaction, so the block timestamp it was ramped to is known
+    chain.sleep(86400)
+    swap.ramp_A(future_A, chain.time() + 86400 * 2, {"from": alice})
+    chain.sleep(dt)
+
+    tx = swap.A_precise.transact({"from": alice})
+    state = pool_state(tx.timestamp)
+    assert tx.return_value == state.A_precise()
+
+    tx = swap.get_dy.transact(0, 1, initial_amounts[0] // 100, {"from": alice})
+    assert tx.return_value == pool_state(tx.timestamp).get_dy(0, 1, initial_amounts[0] // 100)
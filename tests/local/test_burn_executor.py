@@ -0,0 +1,79 @@
+import pytest
+from brownie import web3
+
+from scripts.burn_config import load_burn_config
+from scripts.burn_executor import CONFIRMED, NO_OP, SEND_FAILED, WOULD_REVERT, BurnExecutor, Call
+
+
+@pytest.fixture(scope="module")
+def token(alice, CurveTokenV3):
+    token = CurveTokenV3.deploy("Test Token", "TST", {"from": alice})
+    token.mint(alice, 10 ** 18, {"from": alice})
+    yield token
+
+
+class Unbroadcastable:
+    """Contract method stand-in which simulates fine but is rejected by the node."""
+
+    def call(self, *args):
+        return True
+
+    def __call__(self, *args):
+        raise ValueError("replacement transaction underpriced")
+
+
+def test_executes_in_nonce_order(alice, bob, token):
+    executor = BurnExecutor(alice, gas_limit=200000)
+    nonce = alice.nonce
+    calls = [Call(f"transfer {i}", token.transfer, (bob, 10 ** 17)) for i in range(5)]
+
+    results = executor.execute(calls)
+
+    assert [i.status for i in results] == [CONFIRMED] * 5
+    assert [web3.eth.get_transaction(i.txid)["nonce"] for i in results] == list(
+        range(nonce, nonce + 5)
+    )
+    assert alice.nonce == nonce + 5
+    assert token.balanceOf(bob) == 5 * 10 ** 17
+
+
+def test_failed_send_leaves_no_nonce_gap(alice, bob, token):
+    executor = BurnExecutor(alice, gas_limit=200000)
+    nonce = alice.nonce
+    calls = [
+        Call("transfer 0", token.transfer, (bob, 1)),
+        Call("rejected", Unbroadcastable(), ()),
+        Call("transfer 1", token.transfer, (bob, 1)),
+    ]
+
+    results = executor.execute(calls)
+
+    assert [i.status for i in results] == [CONFIRMED, SEND_FAILED, CONFIRMED]
+    assert "underpriced" in results[1].error
+    assert alice.nonce == nonce + 2
+
+
+def test_drops_noops_and_reverts(alice, bob, token):
+    executor = BurnExecutor(alice, gas_limit=200000)
+    nonce = alice.nonce
+    calls = [
+        Call("noop", token.transfer, (bob, 1), lambda: True),
+        Call("reverts", token.transfer, (bob, 10 ** 19)),
+        Call("transfer", token.transfer, (bob, 1)),
+    ]
+
+    results = executor.execute(calls)
+
+    assert [i.status for i in results] == [NO_OP, WOULD_REVERT, CONFIRMED]
+    assert results[2].txid is not None
+    assert alice.nonce == nonce + 1
+
+
+def test_load_burn_config():
+    config = load_burn_config()
+    burners = {i.name: i for i in config.burners}
+
+    assert len(burners["am3CRV"].coins) == 3
+    assert len(burners["renBTC"].coins) == 2
+    assert burners["am3CRV"].pool in config.pools
+    assert burners["tricrypto"].pool is None
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.burn_scheduler import (
+    BurnEstimate,
+    BurnQuoter,
+    backtest,
+    gas_cost,
+    load_series,
+    plan_burns,
+    record_observation,
+)
+
+GWEI = 10**9
+
+
+def _returns(value):
+    return SimpleNamespace(call=lambda: value)
+
+
+class Feed:
+    """Polygon stand-in with a MATIC / USD price feed answering `answer`."""
+
+    def __init__(self, answer):
+        self.answer = answer
+
+    def contract(self, name, address):
+        assert name == "ChainlinkAggregator"
+        return SimpleNamespace(
+            functions=SimpleNamespace(
+                decimals=lambda: _returns(8),
+                latestRoundData=lambda: _returns((1, self.answer, 0, 0, 1)),
+            )
+        )
+
+
+def _observation(gas_price, value, burnt=False):
+    burns = {"burn a": {"value": value, "gas": 500000, "burnt": burnt}}
+    return {"timestamp": 0, "gas_price": gas_price, "matic_price": 1.0, "burns": burns}
+
+
+def test_gas_cost():
+    # 500k gas at 100 gwei is 0.05 MATIC
+    assert gas_cost(500000, 100 * GWEI, 2.0) == 0.1
+
+
+def test_matic_price():
+    assert BurnQuoter(Feed(87654321)).matic_price() == 0.87654321
+
+
+def test_matic_price_is_never_zero():
+    with pytest.raises(ValueError, match="Invalid MATIC price"):
+        BurnQuoter(Feed(0)).matic_price()
+
+
+def test_plan_burns():
+    estimates = [
+        BurnEstimate("small", 0.05, 500000),
+        BurnEstimate("large", 10.0, 500000),
+        BurnEstimate("unknown", float("inf"), 500000),
+    ]
+    run, deferred = plan_burns(estimates, 100 * GWEI, 1.0, margin=2)
+
+    assert [i.label for i in run] == ["large", "unknown"]
+    assert [i.label for i in deferred] == ["small"]
+
+
+def test_backtest_defers_until_worth_it():
+    # 0.01 USDC of fees accrue per observation, one burn costs 0.05 USDC
+    series = [_observation(100 * GWEI, 0.01 * (i + 1)) for i in range(10)]
+
+    always = backtest(series, 0)
+    assert always.burns == 10
+    assert round(always.net, 6) == round(0.1 - 0.5, 6)
+
+    deferred = backtest(series, 1)
+    assert deferred.burns == 2
+    assert round(deferred.value, 6) == 0.1
+    assert round(deferred.net, 6) == 0.0
+    assert deferred.pending == 0
+
+
+def test_backtest_accrual_after_recorded_burn():
+    series = [
+        _observation(GWEI, 5.0, burnt=True),
+        _observation(GWEI, 1.0),
+        _observation(GWEI, 3.0),
+    ]
+    result = backtest(series, float("inf"))
+
+    assert result.burns == 0
+    assert round(result.pending, 6) == 8.0
+
+
+def test_record_and_load_series(tmp_path):
+    path = tmp_path.joinpath("series.jsonl")
+    estimates = [BurnEstimate("burn a", 1.5, 400000), BurnEstimate("burn b", float("inf"), 1)]
+    record_observation(estimates, ["burn a"], GWEI, 0.8, path)
+    record_observation(estimates, [], GWEI, 0.9, path)
+
+    series = load_series(path)
+    assert len(series) == 2
+    assert series[0]["burns"]["burn a"] == {"value": 1.5, "gas": 400000, "burnt": True}
+    assert series[0]["burns"]["burn b"]["value"] is None
+    assert series[1]["matic_price"] == 0.9
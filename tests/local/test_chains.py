@@ -0,0 +1,52 @@
+import pytest
+
+from scripts import chains
+
+PROJECT_CONFIG = """
+live:
+- name: Polygon
+  networks:
+    - name: Mainnet
+      id: polygon-main
+      host: https://polygon.example/$POLYGON_KEY
+"""
+
+BROWNIE_CONFIG = """
+live:
+- name: Ethereum
+  networks:
+    - name: Mainnet
+      id: mainnet
+      host: https://mainnet.example
+    - name: Polygon
+      id: polygon-main
+      host: https://overridden.example
+development:
+- name: Ganache-CLI
+  id: development
+  host: http://127.0.0.1
+"""
+
+
+@pytest.fixture(autouse=True)
+def network_config(tmp_path, monkeypatch):
+    paths = (tmp_path.joinpath("project.yaml"), tmp_path.joinpath("brownie.yaml"))
+    paths[0].write_text(PROJECT_CONFIG)
+    paths[1].write_text(BROWNIE_CONFIG)
+    monkeypatch.setattr(chains, "NETWORK_CONFIG_PATHS", paths)
+    monkeypatch.setenv("POLYGON_KEY", "abc")
+    monkeypatch.delenv("MAINNET_RPC_URI", raising=False)
+    monkeypatch.delenv("POLYGON_MAIN_RPC_URI", raising=False)
+
+
+def test_reads_network_config():
+    assert chains.get_endpoint_uri("polygon-main") == "https://polygon.example/abc"
+    assert chains.get_endpoint_uri("mainnet") == "https://mainnet.example"
+    assert chains.get_endpoint_uri("development") == "http://127.0.0.1"
+    with pytest.raises(KeyError):
+        chains.get_endpoint_uri("goerli")
+
+
+def test_env_var_takes_precedence(monkeypatch):
+    monkeypatch.setenv("POLYGON_MAIN_RPC_URI", "http://localhost:8545")
+    assert chains.get_endpoint_uri("polygon-main") == "http://localhost:8545"
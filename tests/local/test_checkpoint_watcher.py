@@ -0,0 +1,83 @@
+import pytest
+from brownie import network, web3
+
+from scripts.chains import Chain
+from scripts.checkpoint_watcher import CheckpointWatcher
+
+ROOT = "0x" + "11" * 32
+
+
+@pytest.fixture(scope="module")
+def root_chain(alice, RootChainMock):
+    yield RootChainMock.deploy({"from": alice})
+
+
+@pytest.fixture(scope="module")
+def ethereum():
+    yield Chain(network.show_active(), web3.provider.endpoint_uri)
+
+
+@pytest.fixture
+def checkpointed():
+    yield []
+
+
+@pytest.fixture
+def watcher(ethereum, root_chain, checkpointed):
+    def callback(burn_tx_id, child_block_number):
+        checkpointed.append(burn_tx_id)
+
+    yield CheckpointWatcher(ethereum, None, callback, root_chain.address, confirmations=0)
+
+
+def test_burns_become_provable(alice, root_chain, watcher, checkpointed):
+    watcher.add("0x01", 100)
+    watcher.add("0x02", 300)
+    watcher.add("0x03", 256)
+    assert watcher.poll() == []
+
+    root_chain.submitCheckpoint(ROOT, 0, 255, {"from": alice})
+    assert watcher.poll() == ["0x01"]
+    assert checkpointed == ["0x01"]
+
+    root_chain.submitCheckpoint(ROOT, 256, 511, {"from": alice})
+    assert watcher.poll() == ["0x02", "0x03"]
+    assert checkpointed == ["0x01", "0x02", "0x03"]
+    assert watcher.pending == {}
+
+
+def test_already_checkpointed(alice, ethereum, root_chain, checkpointed):
+    root_chain.submitCheckpoint(ROOT, 0, 255, {"from": alice})
+    watcher = CheckpointWatcher(
+        ethereum, None, lambda *args: checkpointed.append(args), root_chain.address, 0
+    )
+
+    assert watcher.add("0x01", 255) is True
+    assert watcher.add("0x02", 256) is False
+    assert checkpointed == [("0x01", 255)]
+    assert watcher.pending == {"0x02": 256}
+
+
+def test_confirmations(alice, chain, ethereum, root_chain, checkpointed):
+    chain.mine(3)
+    watcher = CheckpointWatcher(
+        ethereum, None, lambda *args: checkpointed.append(args), root_chain.address, 3
+    )
+    watcher.add("0x01", 100)
+
+    root_chain.submitCheckpoint(ROOT, 0, 255, {"from": alice})
+    chain.mine(2)
+    assert watcher.poll() == []
+
+    chain.mine()
+    assert watcher.poll() == ["0x01"]
+
+
+def test_many_checkpoints_between_polls(alice, root_chain, watcher):
+    for i in range(5):
+        watcher.add(f"0x{i:02x}", i * 256 + 128)
+    for i in range(5):
+        root_chain.submitCheckpoint(ROOT, i * 256, i * 256 + 255, {"from": alice})
+
+    assert watcher.poll() == [f"0x{i:02x}" for i in range(5)]
+    assert root_chain.currentHeaderBlock() == 50000
@@ -0,0 +1,82 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from scripts.fetch_deployment_data import DeploymentDataLoader
+
+ETAG = '"v1"'
+
+
+class DeploymentServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DeploymentHandler)
+        self.body = json.dumps({"Main": {"ChainId": 1}}).encode()
+        self.requests = []
+
+    @property
+    def uri(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/{{network}}/{{version}}/index.json"
+
+
+class DeploymentHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = DeploymentServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fresh_cache_makes_no_request(server, tmp_path):
+    loader = DeploymentDataLoader(tmp_path, server.uri)
+    assert loader.load("mainnet", "v1").data == {"Main": {"ChainId": 1}}
+    assert loader.load("mainnet", "v1").data == {"Main": {"ChainId": 1}}
+    assert server.requests == [("/mainnet/v1/index.json", None)]
+
+    # a new process reads the disk cache
+    assert DeploymentDataLoader(tmp_path, server.uri).load("mainnet", "v1").etag == ETAG
+    assert len(server.requests) == 1
+
+
+def test_stale_cache_is_revalidated(server, tmp_path):
+    loader = DeploymentDataLoader(tmp_path, server.uri)
+    fetched_at = loader.load("mainnet", "v1").fetched_at
+    time.sleep(0.01)
+
+    deployment = DeploymentDataLoader(tmp_path, server.uri).load("mainnet", "v1", ttl=0)
+    assert server.requests[-1] == ("/mainnet/v1/index.json", ETAG)
+    assert deployment.fetched_at > fetched_at
+    assert deployment.data == {"Main": {"ChainId": 1}}
+
+
+def test_unreachable_endpoint_uses_stale_cache(server, tmp_path):
+    DeploymentDataLoader(tmp_path, server.uri).load("mainnet", "v1")
+    uri = server.uri
+    server.shutdown()
+    server.server_close()
+
+    assert DeploymentDataLoader(tmp_path, uri).load("mainnet", "v1", ttl=0).etag == ETAG
+    with pytest.raises(requests.ConnectionError):
+        DeploymentDataLoader(tmp_path, uri).load("testnet", "mumbai")
@@ -0,0 +1,57 @@
+import pytest
+
+from scripts.exit_jobs import (
+    BURNED,
+    CALLDATA_READY,
+    CHECKPOINTED,
+    EXIT_SENT,
+    INCLUSION_RESOLVED,
+    PROOFS_BUILT,
+    ExitJobs,
+)
+
+BURN_TX_ID = "0x" + "ab" * 32
+
+
+def test_resumes_from_last_stage(tmp_path):
+    path = tmp_path.joinpath("exit-jobs.sqlite")
+    jobs = ExitJobs(path)
+    jobs.advance(BURN_TX_ID, BURNED, {"number": 100})
+    jobs.advance(BURN_TX_ID, CHECKPOINTED)
+    jobs.advance(BURN_TX_ID, INCLUSION_RESOLVED, (0, 255, 10000))
+
+    jobs = ExitJobs(path)
+    assert jobs.stage(BURN_TX_ID.upper()) == INCLUSION_RESOLVED
+    assert jobs.reached(BURN_TX_ID, CHECKPOINTED)
+    assert not jobs.reached(BURN_TX_ID, CALLDATA_READY)
+    assert jobs.result(BURN_TX_ID, BURNED) == {"number": 100}
+    assert jobs.result(BURN_TX_ID, INCLUSION_RESOLVED) == (0, 255, 10000)
+    assert jobs.result(BURN_TX_ID, CHECKPOINTED) is None
+
+
+def test_stages_can_be_skipped():
+    jobs = ExitJobs()
+    jobs.advance(BURN_TX_ID, CALLDATA_READY, b"\x01")
+    assert jobs.reached(BURN_TX_ID, BURNED)
+    assert jobs.jobs(CALLDATA_READY) == [(BURN_TX_ID, CALLDATA_READY)]
+
+
+def test_stages_never_go_back():
+    jobs = ExitJobs()
+    jobs.advance(BURN_TX_ID, EXIT_SENT, "0x01")
+    with pytest.raises(AssertionError):
+        jobs.advance(BURN_TX_ID, CALLDATA_READY, b"\x01")
+    with pytest.raises(AssertionError):
+        jobs.advance(BURN_TX_ID, EXIT_SENT, "0x02")
+    assert jobs.result(BURN_TX_ID, EXIT_SENT) == "0x01"
+
+
+def test_reset():
+    jobs = ExitJobs()
+    jobs.advance(BURN_TX_ID, BURNED, {"number": 100})
+    jobs.advance(BURN_TX_ID, PROOFS_BUILT, ([b"\x01"], b"\x80", [b"\x02"]))
+    jobs.reset(BURN_TX_ID.upper())
+    assert jobs.stage(BURN_TX_ID) is None
+    assert jobs.result(BURN_TX_ID, PROOFS_BUILT) is None
+    jobs.advance(BURN_TX_ID, BURNED, {"number": 101})
+    assert jobs.result(BURN_TX_ID, BURNED) == {"number": 101}
@@ -0,0 +1,100 @@
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from scripts.benchmarks.synthetic_exits import CASSETTE_PATH, SyntheticExits
+from scripts.cassette import Cassette
+from scripts.chains import Chain, Chains
+from scripts.checkpoint_index import CheckpointIndex
+from scripts.exit import build_calldata, build_calldata_batch, build_calldata_batch_async
+from scripts.exit import test_calldata as check_calldata
+from scripts.exit import test_calldata_async as check_calldata_async
+from scripts.exit import test_calldata_batch as check_calldata_batch
+from scripts.exit_jobs import ExitJobs
+from scripts.exit_payload import InvalidExitPayload
+
+# never contacted, every request is answered by the cassette
+OFFLINE_URI = "http://127.0.0.1:1"
+
+
+@pytest.fixture(scope="module")
+def test_txs():
+    return SyntheticExits().test_txs
+
+
+@pytest.fixture
+def chains(tmp_path):
+    with Cassette(CASSETTE_PATH, record=False) as cassette:
+        yield Chains(
+            Chain("mainnet", OFFLINE_URI, False, tmp_path, cassette),
+            Chain("polygon-main", OFFLINE_URI, True, tmp_path, cassette),
+        )
+
+
+def test_calldata(chains, test_txs):
+    for burn_tx, exit_tx in test_txs:
+        check_calldata(burn_tx, exit_tx, chains)
+
+
+def test_calldata_batch(chains, test_txs):
+    check_calldata_batch(test_txs, chains)
+
+
+def test_calldata_async(chains, test_txs):
+    check_calldata_async(test_txs, chains)
+
+
+def test_async_matches_sync(chains, test_txs, monkeypatch):
+    # start cold, so the async pipeline builds every checkpoint tree concurrently
+    monkeypatch.setattr("scripts.merkle._checkpoint_trees", OrderedDict())
+    burn_txs = [burn_tx for burn_tx, _ in test_txs]
+
+    calldata = asyncio.run(build_calldata_batch_async(burn_txs, chains))
+
+    assert calldata == build_calldata_batch(burn_txs, chains)
+    assert calldata == {i: build_calldata(i, chains) for i in burn_txs}
+
+
+def test_unverified_calldata_is_not_stored(chains, test_txs, monkeypatch):
+    def reject(*args):
+        raise InvalidExitPayload("Bad proof")
+
+    monkeypatch.setattr("scripts.exit.verify_payload", reject)
+    jobs = ExitJobs()
+    burn_tx = test_txs[0][0]
+
+    with pytest.raises(InvalidExitPayload):
+        build_calldata(burn_tx, chains, jobs)
+    assert jobs.stage(burn_tx) is None
+
+    with pytest.raises(InvalidExitPayload):
+        build_calldata_batch([burn_tx], chains, jobs)
+    assert jobs.stage(burn_tx) is None
+
+
+def test_async_calldata_is_verified(chains, test_txs, monkeypatch):
+    def reject(*args):
+        raise InvalidExitPayload("Bad proof")
+
+    monkeypatch.setattr("scripts.exit.verify_payload", reject)
+
+    with pytest.raises(InvalidExitPayload):
+        asyncio.run(build_calldata_batch_async([test_txs[0][0]], chains))
+
+
+def test_checkpoint_index_is_loaded_once(chains, test_txs, monkeypatch):
+    opened = []
+    open_index = CheckpointIndex.__init__
+
+    def spy(self, path):
+        opened.append(path)
+        open_index(self, path)
+
+    monkeypatch.setattr(CheckpointIndex, "__init__", spy)
+    burn_txs = [burn_tx for burn_tx, _ in test_txs]
+
+    build_calldata_batch(burn_txs, chains)
+    build_calldata(burn_txs[0], chains)
+
+    assert len(opened) == 1
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.burn_config import BurnConfig, Burner
+from scripts.fee_snapshot import take_snapshot
+
+POOL = "0x" + "01" * 20
+COINS = ["0x" + "a1" * 20, "0x" + "a2" * 20, "0x" + "a3" * 20]
+BURNER_COINS = ["0x" + "b1" * 20, "0x" + "b2" * 20]
+HOLDER = "0x" + "cc" * 20
+BRIDGE = "0x" + "dd" * 20
+BRIDGE_COIN = "0x" + "ee" * 20
+
+CONFIG = BurnConfig(
+    "0x" + "ad" * 20,
+    [
+        Burner("pool burner", "0x" + "f1" * 20, COINS, POOL),
+        Burner("coin burner", "0x" + "f2" * 20, BURNER_COINS, None),
+    ],
+    BRIDGE,
+    BRIDGE_COIN,
+)
+
+
+class Polygon:
+    def contract(self, name, address):
+        return SimpleNamespace(name=name, address=address)
+
+
+def _balance(coin, account):
+    # distinct for every (coin, account) pair, so a balance decoded out of order is noticed
+    return int(coin[-2:], 16) * 10 ** 6 + int(account[-2:], 16) * 10 ** 3
+
+
+def _result(contract, fn_name, args):
+    if fn_name == "getBlockNumber":
+        return 12345
+    if fn_name == "coins":
+        return COINS[args[0]]
+    if fn_name == "admin_balances":
+        return 10 ** 30 + args[0]
+    return _balance(contract.address, args[0])
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def multicall(chain, batch, batch_size):
+        assert batch_size == len(batch)
+        calls.extend(batch)
+        return [_result(*i) for i in batch]
+
+    monkeypatch.setattr("scripts.fee_snapshot.multicall", multicall)
+    return calls
+
+
+@pytest.mark.parametrize("holder", [None, HOLDER])
+def test_take_snapshot(calls, holder):
+    snapshot = take_snapshot(Polygon(), holder, CONFIG)
+
+    assert snapshot.block_number == 12345
+    assert snapshot.bridge_balance == _balance(BRIDGE_COIN, BRIDGE)
+    assert (
+        len(calls)
+        == 1 + 2 * len(COINS) + (len(COINS) + len(BURNER_COINS)) * (2 if holder else 1) + 1
+    )
+
+    for burner in CONFIG.burners:
+        result = snapshot.burner(burner.name)
+        assert result.coins == tuple(burner.coins)
+        assert result.burner_balances == tuple(_balance(i, burner.address) for i in burner.coins)
+        if holder is None:
+            assert result.holder_balances == ()
+        else:
+            assert result.holder_balances == tuple(_balance(i, holder) for i in burner.coins)
+        assert result.to_burn(1) == result.burner_balances[1] + (
+            result.holder_balances[1] if holder else 0
+        )
+
+    assert snapshot.burner("pool burner").admin_balances == (10 ** 30, 10 ** 30 + 1, 10 ** 30 + 2)
+    assert snapshot.burner("coin burner").admin_balances == ()
+
+
+def test_mismatched_pool_coins(calls):
+    config = CONFIG._replace(burners=[CONFIG.burners[0]._replace(coins=COINS[::-1])])
+    with pytest.raises(AssertionError, match="do not match"):
+        take_snapshot(Polygon(), None, config)
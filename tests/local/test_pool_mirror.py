@@ -0,0 +1,72 @@
+import pytest
+
+from scripts.pool_mirror import _exchange, apply_event
+from scripts.stableswap import PoolState
+
+
+@pytest.fixture
+def state():
+    return PoolState(
+        precision_mul=(1, 10 ** 12, 10 ** 12),
+        balances=(10 ** 24, 2 * 10 ** 12, 10 ** 12),
+        fee=4000000,
+        offpeg_fee_multiplier=20000000000,
+        initial_A=20000,
+        future_A=20000,
+        initial_A_time=0,
+        future_A_time=0,
+        token_supply=4 * 10 ** 24,
+        timestamp=0,
+        admin_fee=5000000000,
+    )
+
+
+def test_exchange(state):
+    dy, admin_fee = _exchange(state, 0, 1, 10 ** 21)
+    assert admin_fee > 0
+
+    args = {"sold_id": 0, "tokens_sold": 10 ** 21, "bought_id": 1, "tokens_bought": dy}
+    new_state, exact = apply_event(state, "TokenExchange", args)
+    assert exact
+    assert new_state.balances == (10 ** 24 + 10 ** 21, 2 * 10 ** 12 - dy - admin_fee, 10 ** 12)
+
+    _, exact = apply_event(state, "TokenExchange", dict(args, tokens_bought=dy + 1))
+    assert not exact
+
+
+def test_liquidity(state):
+    args = {"token_amounts": [10 ** 18, 0, 10 ** 6], "fees": [0, 10, 20], "token_supply": 10 ** 25}
+    new_state, exact = apply_event(state, "AddLiquidity", args)
+    assert exact
+    assert new_state.balances == (10 ** 24 + 10 ** 18, 2 * 10 ** 12 - 5, 10 ** 12 + 10 ** 6 - 10)
+    assert new_state.token_supply == 10 ** 25
+
+    new_state, exact = apply_event(state, "RemoveLiquidityImbalance", args)
+    assert new_state.balances == (10 ** 24 - 10 ** 18, 2 * 10 ** 12 - 5, 10 ** 12 - 10 ** 6 - 10)
+
+
+def test_remove_liquidity_one(state):
+    coin_amount = state.calc_withdraw_one_coin(10 ** 18, 2)
+    args = {"token_amount": 10 ** 18, "coin_amount": coin_amount}
+    new_state, exact = apply_event(state, "RemoveLiquidityOne", args)
+
+    assert exact
+    assert new_state.balances == (10 ** 24, 2 * 10 ** 12, 10 ** 12 - coin_amount)
+    assert new_state.token_supply == 4 * 10 ** 24 - 10 ** 18
+
+    _, exact = apply_event(state, "RemoveLiquidityOne", dict(args, coin_amount=coin_amount - 1))
+    assert not exact
+
+
+def test_parameters(state):
+    args = {"old_A": 20000, "new_A": 40000, "initial_time": 100, "future_time": 300}
+    new_state, _ = apply_event(state, "RampA", args)
+    assert new_state._replace(timestamp=200).A_precise() == 30000
+
+    new_state, _ = apply_event(new_state, "StopRampA", {"A": 25000, "t": 150})
+    assert new_state._replace(timestamp=200).A_precise() == 25000
+
+    args = {"fee": 1, "admin_fee": 2, "offpeg_fee_multiplier": 3}
+    new_state, exact = apply_event(state, "NewFee", args)
+    assert exact
+    assert (new_state.fee, new_state.admin_fee, new_state.offpeg_fee_multiplier) == (1, 2, 3)
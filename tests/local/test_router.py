@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.router import ZERO_ADDRESS, RegistryIndex, Router
+from scripts.stableswap import PoolState
+
+DAI, USDC, USDT = "0xdai", "0xusdc", "0xusdt"
+ADAI, AUSDC, AUSDT = "0xadai", "0xausdc", "0xausdt"
+WBTC, RENBTC = "0xwbtc", "0xrenbtc"
+
+
+def _state(precision_mul, balances):
+    return PoolState(
+        precision_mul=precision_mul,
+        balances=balances,
+        fee=4000000,
+        offpeg_fee_multiplier=20000000000,
+        initial_A=20000,
+        future_A=20000,
+        initial_A_time=0,
+        future_A_time=0,
+        token_supply=sum(a * b for a, b in zip(precision_mul, balances)),
+        timestamp=0,
+    )
+
+
+@pytest.fixture
+def router():
+    index = RegistryIndex()
+    index.add_pool("0xaave", [ADAI, AUSDC, AUSDT, ZERO_ADDRESS], [DAI, USDC, USDT, ZERO_ADDRESS])
+    index.add_pool("0xshallow", [DAI, USDC], [])
+    index.add_pool("0xbtc", [USDC, WBTC], [])
+    index.add_pool("0xren", [WBTC, RENBTC], [])
+    states = {
+        "0xaave": _state((1, 10**12, 10**12), (10**24, 10**12, 10**12)),
+        "0xshallow": _state((1, 10**12), (10**20, 10**8)),
+        "0xren": _state((10**10, 10**10), (10**10, 10**10)),
+    }
+    return Router(index, states)
+
+
+def test_index(router):
+    index = router.index
+    assert index.find_pools_for_coins(USDC, DAI) == ["0xaave", "0xshallow"]
+    assert index.get_coin_indices("0xaave", USDT, DAI) == (2, 0, True)
+    assert index.get_coin_indices("0xaave", ADAI, AUSDC) == (0, 1, False)
+    assert sorted(index.neighbours(WBTC)) == sorted([USDC, RENBTC])
+
+    index.add_pool("0xother", [DAI, USDC], [])
+    index.remove_pool("0xaave")
+    assert index.find_pools_for_coins(DAI, USDC) == ["0xother", "0xshallow"]
+    assert index.find_pools_for_coins(ADAI, AUSDC) == []
+
+
+def test_get_best_rate(router):
+    pool, dy = router.get_best_rate(DAI, USDC, 10**21)
+    assert pool == "0xaave"
+    assert dy == router.states["0xaave"].get_dy_underlying(0, 1, 10**21)
+
+    pool, dy = router.get_best_rate(DAI, USDC, 10**21, exclude_pools=["0xAAVE"])
+    assert pool == "0xshallow"
+    assert 0 < dy < router.get_best_rate(DAI, USDC, 10**21)[1]
+
+    # pools without a state are not quoted
+    assert router.get_best_rate(USDC, WBTC, 10**6) == (ZERO_ADDRESS, 0)
+
+
+def test_best_route(router):
+    route = router.best_route(DAI, USDC, 10**18)
+    assert route.pools == ("0xaave",)
+
+    router.update({"0xbtc": _state((10**12, 10**10), (10**12, 10**8))})
+    route = router.best_route(USDC, RENBTC, 10**6)
+    assert route.coins == (USDC, WBTC, RENBTC)
+    assert route.pools == ("0xbtc", "0xren")
+    assert route.amount_out == router.get_exchange_amount(
+        "0xren", WBTC, RENBTC, router.get_exchange_amount("0xbtc", USDC, WBTC, 10**6)
+    )
+    assert router.best_route(DAI, RENBTC, 10**18) is None
+
+
+class Registry:
+    """Registry stand-in which removes `0xshallow` in block 150."""
+
+    def __init__(self):
+        self.ranges = []
+        self.events = SimpleNamespace(
+            PoolAdded=SimpleNamespace(getLogs=self.get_logs("PoolAdded", [])),
+            PoolRemoved=SimpleNamespace(getLogs=self.get_logs("PoolRemoved", [150])),
+        )
+
+    def get_logs(self, event, blocks):
+        def _get_logs(fromBlock, toBlock):
+            self.ranges.append((event, fromBlock, toBlock))
+            return [
+                {"event": event, "blockNumber": i, "logIndex": 0, "args": {"pool": "0xshallow"}}
+                for i in blocks
+                if fromBlock <= i <= toBlock
+            ]
+
+        return _get_logs
+
+
+def test_poll_only_reads_confirmed_blocks(router):
+    index = router.index
+    index.polygon = SimpleNamespace(w3=SimpleNamespace(eth=SimpleNamespace(block_number=None)))
+    index.registry = Registry()
+    index.last_block = 100
+
+    # the removal is in the latest block, but not confirmed yet
+    index.polygon.w3.eth.block_number = 150
+    index.poll()
+    assert index.last_block == 100
+    index.polygon.w3.eth.block_number = 149 + index.confirmations
+    index.poll()
+    assert index.last_block == 149
+    assert "0xshallow" in index.find_pools_for_coins(DAI, USDC)
+
+    index.polygon.w3.eth.block_number = 150 + index.confirmations
+    index.poll()
+    assert index.last_block == 150
+    assert index.find_pools_for_coins(DAI, USDC) == ["0xaave"]
+    assert max(to_block for _, _, to_block in index.registry.ranges) == 150
@@ -0,0 +1,57 @@
+import pytest
+
+from scripts.rpc_batch import BatchRPC, RPCError, fetch_blocks
+
+
+def _block(number):
+    word = "0x" + f"{number:064x}"
+    return {
+        "number": hex(number),
+        "timestamp": hex(1600000000 + number),
+        "hash": word,
+        "transactionsRoot": word,
+        "receiptsRoot": word,
+        "transactions": [],
+    }
+
+
+class LaggingNode:
+    """Returns `null` for each block until it has been requested `lag` times."""
+
+    def __init__(self, lag):
+        self.lag = lag
+        self.requests = {}
+
+    def __call__(self, payload, send):
+        if isinstance(payload, list):
+            return [self.respond(i) for i in payload]
+        return self.respond(payload)
+
+    def respond(self, call):
+        number = int(call["params"][0], 16)
+        self.requests[number] = self.requests.get(number, 0) + 1
+        block = _block(number) if self.requests[number] > self.lag else None
+        return {"jsonrpc": "2.0", "id": call["id"], "result": block}
+
+
+def test_null_results_are_retried(monkeypatch):
+    delays = []
+    monkeypatch.setattr("scripts.rpc_batch.time.sleep", delays.append)
+    node = LaggingNode(lag=2)
+    rpc = BatchRPC("http://stand-in", batch_size=2, max_workers=1, retries=3, cassette=node)
+
+    blocks = fetch_blocks(rpc, 10, 13)
+    assert [i["number"] for i in blocks] == [10, 11, 12, 13]
+    # null in the batch and in the first single request, then found after one backoff
+    assert node.requests == {i: 3 for i in range(10, 14)}
+    assert delays == [0.25] * 4
+
+
+def test_retries_exhausted(monkeypatch):
+    delays = []
+    monkeypatch.setattr("scripts.rpc_batch.time.sleep", delays.append)
+    rpc = BatchRPC("http://stand-in", retries=4, backoff=1, cassette=LaggingNode(lag=10))
+
+    with pytest.raises(RPCError, match="null result"):
+        rpc.request("eth_getBlockByNumber", ("0x1", False))
+    assert delays == [1, 2, 4]
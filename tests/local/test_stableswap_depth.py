@@ -0,0 +1,46 @@
+import pytest
+
+from scripts.stableswap import PoolState, Revert, depth_surface
+
+
+@pytest.fixture
+def state():
+    return PoolState(
+        precision_mul=(10 ** 10, 10 ** 10),
+        balances=(300 * 10 ** 8, 200 * 10 ** 8),
+        fee=4000000,
+        offpeg_fee_multiplier=20000000000,
+        initial_A=20000,
+        future_A=20000,
+        initial_A_time=0,
+        future_A_time=0,
+        token_supply=500 * 10 ** 18,
+        timestamp=0,
+    )
+
+
+def test_matches_get_dy(state):
+    sizes = [10 ** 8 * k // 7 for k in range(2000, 0, -1)]
+    surface = depth_surface(state, [sizes, sizes])
+
+    assert sorted(surface) == [(0, 1), (1, 0)]
+    for (i, j), curve in surface.items():
+        assert curve.amounts == tuple(sorted(sizes))
+        assert list(curve.dy) == [state.get_dy(i, j, dx) for dx in curve.amounts]
+
+
+def test_warm_start(state):
+    sizes = [10 ** 6 * k for k in range(1, 1000)]
+    exact = depth_surface(state, [sizes, sizes], pairs=[(1, 0)])[(1, 0)]
+    warm = depth_surface(state, [sizes, sizes], pairs=[(1, 0)], warm_start=True)[(1, 0)]
+
+    assert all(abs(a - b) <= 1 for a, b in zip(exact.dy, warm.dy))
+
+
+def test_reverting_sizes(state):
+    curve = depth_surface(state, [[1, 2 ** 255, 10 ** 8], [1]], pairs=[(0, 1)])[(0, 1)]
+    assert curve.dy[0] is not None and curve.dy[1] is not None
+    assert curve.dy[2] is None
+
+    with pytest.raises(Revert):
+        depth_surface(state, [[1], [1]], pairs=[(0, 0)])
@@ -0,0 +1,80 @@
+import pytest
+
+from scripts.stableswap import PoolState, Revert, get_D
+from scripts.stableswap.pool import load_pool_data, precision_mul
+
+DAY = 86400
+
+
+@pytest.fixture
+def state():
+    # three coin pool with 18, 6 and 6 decimals, as the aave pool
+    return PoolState(
+        precision_mul=(1, 10 ** 12, 10 ** 12),
+        balances=(10 ** 24, 10 ** 12, 10 ** 12),
+        fee=4000000,
+        offpeg_fee_multiplier=20000000000,
+        initial_A=20000,
+        future_A=20000,
+        initial_A_time=0,
+        future_A_time=0,
+        token_supply=3 * 10 ** 24,
+        timestamp=DAY,
+    )
+
+
+def test_precision_mul():
+    assert precision_mul(load_pool_data("aave")) == (1, 10 ** 12, 10 ** 12)
+    assert precision_mul(load_pool_data("ren")) == (10 ** 10, 10 ** 10)
+
+
+def test_balanced_pool(state):
+    assert get_D(state._xp(), state.A_precise()) == 3 * 10 ** 24
+    assert state.get_virtual_price() == 10 ** 18
+    assert state.dynamic_fee(0, 1) == state.fee
+
+    dy = state.get_dy(0, 1, 10 ** 18)
+    assert 0.999 * 10 ** 6 < dy < 10 ** 6
+    assert state.get_dy_underlying(0, 1, 10 ** 18) == dy
+
+
+def test_offpeg_fee(state):
+    imbalanced = state._replace(balances=(3 * 10 ** 24, 10 ** 11, 10 ** 12))
+    assert imbalanced.dynamic_fee(0, 1) > state.fee
+    assert imbalanced.dynamic_fee(0, 2) < imbalanced.dynamic_fee(0, 1)
+    assert state._replace(offpeg_fee_multiplier=0).dynamic_fee(0, 1) == state.fee
+
+
+def test_ramp_A(state):
+    ramping = state._replace(future_A=40000, initial_A_time=DAY, future_A_time=3 * DAY)
+    assert ramping.A() == 200
+    assert ramping._replace(timestamp=2 * DAY).A_precise() == 30000
+    # rounds towards the initial A
+    assert ramping._replace(timestamp=2 * DAY - 1).A_precise() == 29999
+    assert ramping._replace(timestamp=3 * DAY).A() == 400
+
+    down = ramping._replace(initial_A=40000, future_A=20000)
+    assert down._replace(timestamp=2 * DAY - 1).A_precise() == 30001
+
+
+def test_liquidity(state):
+    minted = state.calc_token_amount([10 ** 18, 10 ** 6, 10 ** 6], True)
+    burned = state.calc_token_amount([10 ** 18, 10 ** 6, 10 ** 6], False)
+    assert minted == burned == 3 * 10 ** 18
+
+    one_coin = state.calc_withdraw_one_coin(10 ** 18, 1)
+    assert 0.999 * 10 ** 6 < one_coin < 10 ** 6
+
+
+def test_reverts(state):
+    for args in [(0, 0, 1), (-1, 1, 1), (0, 3, 1)]:
+        with pytest.raises(Revert):
+            state.get_dy(*args)
+    with pytest.raises(Revert):
+        state.calc_withdraw_one_coin(10 ** 18, 3)
+    with pytest.raises(Revert):
+        state.calc_token_amount([10 ** 25, 0, 0], False)
+    with pytest.raises(Revert):
+        state.get_dy(0, 1, 2 ** 255)
+    with pytest.raises(Revert):
+        state._replace(token_supply=0).get_virtual_price()